@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Alcance Multi-salto P2P por Frame
+Calcula, para cada embarcación y cada instante de la traza, el número mínimo
+de saltos P2P hasta una embarcación con enlace directo a un gateway.
+
+Por frame se arma el grafo embarcación-embarcación (pares a menos de
+--alcance-p2p, 3 km como OnTransmissionFailedCallback o 5 km como
+UpdateNeighborTables) y se hace un BFS multi-origen desde las embarcaciones
+con gateway dentro de LORA_MAX_RANGE, limitado por el TTL de P2PPacket.
+Varios frames se resuelven juntos: se desplazan en x para que no se toquen y
+se procesan con un solo árbol KD y una sola búsqueda en el grafo disperso.
+
+Uso:
+    python3 alcance_p2p.py positions_salinas_movil_3gw.csv --alcance-p2p 3000 --ttl 3
+"""
+
+import argparse
+import time
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+from scipy.spatial import cKDTree
+
+from radio_lora import LORA_MAX_RANGE, P2P_RELAY_RANGE
+from trazas import cargar_trazas
+
+TTL = 3
+SIN_ALCANCE = -1            # embarcación sin ruta (o ausente del frame)
+
+
+def saltos_por_frame(boats_xy, gws_xy, alcance_gw=LORA_MAX_RANGE, alcance_p2p=P2P_RELAY_RANGE,
+                     ttl=TTL, frames_por_lote=64):
+    """
+    Saltos mínimos (F, N) hasta la infraestructura: 0 = enlace directo,
+    k = k saltos P2P, SIN_ALCANCE = sin ruta dentro del TTL o ausente.
+
+    boats_xy: (F, N, 2) con NaN para ausentes; gws_xy: (F, G, 2).
+    """
+    F, N = boats_xy.shape[:2]
+    saltos = np.full((F, N), SIN_ALCANCE, dtype=np.int16)
+    # Separación entre frames del lote: ningún par puede cruzar de un frame a otro
+    extension = np.nanmax(np.abs(boats_xy)) if np.isfinite(boats_xy).any() else 0.0
+    separacion = 2 * extension + 2 * alcance_p2p + 1
+    # El .cc usa distancia estrictamente menor que el alcance P2P
+    radio = np.nextafter(alcance_p2p, 0)
+
+    for f0 in range(0, F, frames_por_lote):
+        f1 = min(f0 + frames_por_lote, F)
+        presentes = ~np.isnan(boats_xy[f0:f1, :, 0])           # (L, N)
+        frame_de, nodo_de = np.nonzero(presentes)
+        if len(frame_de) == 0:
+            continue
+        pts = boats_xy[f0:f1][presentes]                        # (M, 2)
+
+        # Pocos gateways por frame: distancia directa (M, G); NaN nunca queda en alcance
+        gws = gws_xy[f0 + frame_de]
+        d_gw = np.sqrt(((pts[:, None, :] - gws) ** 2).sum(axis=2))
+        semillas = (d_gw <= alcance_gw).any(axis=1)
+        if not semillas.any():
+            continue
+
+        desplazados = pts.copy()
+        desplazados[:, 0] += frame_de * separacion
+        pares = cKDTree(desplazados).query_pairs(radio, output_type='ndarray')
+        M = len(pts)
+        grafo = coo_matrix((np.ones(len(pares), dtype=np.int8), (pares[:, 0], pares[:, 1])),
+                           shape=(M, M)).tocsr()
+        dist = dijkstra(grafo, directed=False, indices=np.flatnonzero(semillas),
+                        unweighted=True, limit=ttl + 0.5, min_only=True)
+        alcanzados = np.isfinite(dist)
+        saltos[f0 + frame_de[alcanzados], nodo_de[alcanzados]] = dist[alcanzados].astype(np.int16)
+    return saltos
+
+
+def resumen_saltos(saltos, presentes, ttl=TTL):
+    """Conteo por frame: columnas directos, 1..ttl saltos, sin alcance"""
+    columnas = [(saltos == h).sum(axis=1) for h in range(ttl + 1)]
+    columnas.append(((saltos == SIN_ALCANCE) & presentes).sum(axis=1))
+    return np.column_stack(columnas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alcance multi-salto P2P por frame")
+    parser.add_argument('posiciones', help='CSV de LogPositions (time,node_id,x,y,type)')
+    parser.add_argument('--alcance', type=float, default=LORA_MAX_RANGE)
+    parser.add_argument('--alcance-p2p', type=float, default=P2P_RELAY_RANGE)
+    parser.add_argument('--ttl', type=int, default=TTL)
+    parser.add_argument('--salida', default='alcance_p2p.csv', help='CSV de resumen por frame')
+    parser.add_argument('--por-nodo', help='CSV opcional time,node_id,saltos')
+    args = parser.parse_args()
+
+    trazas = cargar_trazas(args.posiciones)
+    boats = trazas.seleccionar('boat')
+    gws = trazas.seleccionar('gateway')
+    print(f"✓ {len(trazas)} frames, {len(boats.ids)} embarcaciones, {len(gws.ids)} gateways")
+
+    inicio = time.perf_counter()
+    saltos = saltos_por_frame(boats.xy, gws.xy, args.alcance, args.alcance_p2p, args.ttl)
+    print(f"✓ Saltos calculados en {time.perf_counter() - inicio:.2f} s")
+
+    presentes = ~np.isnan(boats.xy[:, :, 0])
+    conteo = resumen_saltos(saltos, presentes, args.ttl)
+    encabezado = ['time', 'directos'] + [f'saltos_{h}' for h in range(1, args.ttl + 1)] + ['sin_alcance']
+    np.savetxt(args.salida, np.column_stack([trazas.tiempos, conteo]), delimiter=',',
+               header=','.join(encabezado), comments='', fmt=['%g'] + ['%d'] * conteo.shape[1])
+    print(f"✓ Resumen guardado: {args.salida}")
+
+    if args.por_nodo:
+        f, n = np.nonzero(saltos != SIN_ALCANCE)
+        np.savetxt(args.por_nodo, np.column_stack([trazas.tiempos[f], boats.ids[n], saltos[f, n]]),
+                   delimiter=',', header='time,node_id,saltos', comments='', fmt=['%g', '%d', '%d'])
+        print(f"✓ Saltos por embarcación: {args.por_nodo}")
+
+    total = max(int(presentes.sum()), 1)
+    print(f"\nAlcance P2P ({args.alcance_p2p:.0f} m, TTL {args.ttl}):")
+    print(f"  Directo:      {100 * conteo[:, 0].sum() / total:.2f}%")
+    for h in range(1, args.ttl + 1):
+        print(f"  {h} salto(s):   {100 * conteo[:, h].sum() / total:.2f}%")
+    print(f"  Sin alcance:  {100 * conteo[:, -1].sum() / total:.2f}%")
+
+
+if __name__ == '__main__':
+    main()
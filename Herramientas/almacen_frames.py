@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Almacén de Frames en Memoria Compartida (np.memmap)
+Precalcula una vez, a partir del CSV de posiciones, los arreglos por frame
+que usan animaciones, comparaciones y mapas de calor, y los guarda como
+archivos .npy con un índice pequeño (indice.json):
+
+    tiempos      (F,)        s
+    boats_xy     (F, B, 2)   posiciones de embarcaciones (NaN si no está)
+    gws_xy       (F, G, 2)   posiciones de gateways
+    servidor_xy  (F, S, 2)
+    gw_servidor  (F, B)      índice del gateway más cercano en alcance, -1 si ninguno
+    distancia_gw (F, B)      distancia a ese gateway (m)
+    enlace       (F, B)      0 sin cobertura, 1 directo, 2 vía relay P2P
+
+Los procesos trabajadores abren el almacén con mmap de solo lectura: todos
+comparten las mismas páginas del caché del sistema, así que N trabajadores
+ocupan cerca de una sola copia de la traza y ninguno vuelve a parsear el CSV.
+En Linux, un directorio bajo /dev/shm deja el almacén directamente en RAM.
+
+Uso:
+    python3 almacen_frames.py construir positions_mobile.csv almacen_movil/
+    python3 almacen_frames.py info almacen_movil/
+    python3 almacen_frames.py cobertura almacen_movil/ --procesos 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from radio_lora import LORA_MAX_RANGE, P2P_RANGE
+from trazas import cargar_trazas
+
+VERSION = 1
+SIN_COBERTURA, DIRECTO, RELAY = 0, 1, 2
+
+
+def _hash_archivo(ruta):
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def estado_enlaces(boats, gws, alcance_gw=LORA_MAX_RANGE, alcance_p2p=P2P_RANGE):
+    """
+    Para un bloque de frames: (gw_servidor, distancia_gw, enlace) con
+    boats (K, B, 2) y gws (K, G, 2). Un barco sin gateway en alcance queda en
+    RELAY si tiene a menos de alcance_p2p un barco conectado directamente.
+    """
+    k, b = boats.shape[:2]
+    gw_servidor = np.full((k, b), -1, dtype=np.int16)
+    distancia = np.full((k, b), np.nan, dtype=np.float32)
+    enlace = np.zeros((k, b), dtype=np.int8)
+    if gws.shape[1] == 0 or b == 0:
+        return gw_servidor, distancia, enlace
+
+    d = np.sqrt(((boats[:, :, None, :] - gws[:, None, :, :]) ** 2).sum(axis=3))
+    d_llena = np.where(np.isnan(d), np.inf, d)
+    cercano = d_llena.argmin(axis=2)
+    d_min = np.take_along_axis(d_llena, cercano[..., None], axis=2)[..., 0]
+    directo = d_min <= alcance_gw
+    gw_servidor[directo] = cercano[directo]
+    distancia[np.isfinite(d_min)] = d_min[np.isfinite(d_min)]
+    enlace[directo] = DIRECTO
+
+    # Relay: vecino conectado a menos de alcance_p2p (matriz B×B por frame)
+    pendientes = ~directo & ~np.isnan(boats[..., 0])
+    if pendientes.any():
+        for f in np.flatnonzero(pendientes.any(axis=1)):
+            origen = boats[f, pendientes[f]]
+            relays = boats[f, directo[f]]
+            if len(relays) == 0:
+                continue
+            dd = ((origen[:, None, :] - relays[None, :, :]) ** 2).sum(axis=2)
+            con_relay = (dd < alcance_p2p ** 2).any(axis=1)
+            enlace[f, np.flatnonzero(pendientes[f])[con_relay]] = RELAY
+    return gw_servidor, distancia, enlace
+
+
+def construir_almacen(ruta_csv, directorio, alcance_gw=LORA_MAX_RANGE, alcance_p2p=P2P_RANGE,
+                      frames_por_bloque=512, dtype=np.float64):
+    """Parsea el CSV una vez y escribe los arreglos por frame en `directorio`"""
+    os.makedirs(directorio, exist_ok=True)
+    trazas = cargar_trazas(ruta_csv)
+    partes = {tipo: trazas.seleccionar(tipo) for tipo in ('boat', 'gateway', 'server')}
+    n_frames = len(trazas)
+    formas = {
+        'tiempos': ((n_frames,), np.float64),
+        'boats_xy': ((n_frames, len(partes['boat'].ids), 2), dtype),
+        'gws_xy': ((n_frames, len(partes['gateway'].ids), 2), dtype),
+        'servidor_xy': ((n_frames, len(partes['server'].ids), 2), dtype),
+        'gw_servidor': ((n_frames, len(partes['boat'].ids)), np.int16),
+        'distancia_gw': ((n_frames, len(partes['boat'].ids)), np.float32),
+        'enlace': ((n_frames, len(partes['boat'].ids)), np.int8),
+    }
+    arreglos = {nombre: np.lib.format.open_memmap(os.path.join(directorio, f'{nombre}.npy'),
+                                                  mode='w+', dtype=tipo, shape=forma)
+                for nombre, (forma, tipo) in formas.items()}
+    arreglos['tiempos'][:] = trazas.tiempos
+    arreglos['boats_xy'][:] = partes['boat'].xy
+    arreglos['gws_xy'][:] = partes['gateway'].xy
+    arreglos['servidor_xy'][:] = partes['server'].xy
+    for i in range(0, n_frames, frames_por_bloque):
+        j = min(i + frames_por_bloque, n_frames)
+        gw, dist, enl = estado_enlaces(partes['boat'].xy[i:j], partes['gateway'].xy[i:j],
+                                       alcance_gw, alcance_p2p)
+        arreglos['gw_servidor'][i:j] = gw
+        arreglos['distancia_gw'][i:j] = dist
+        arreglos['enlace'][i:j] = enl
+    for a in arreglos.values():
+        a.flush()
+
+    indice = {
+        'version': VERSION,
+        'fuente': os.path.abspath(ruta_csv),
+        'sha256_fuente': _hash_archivo(ruta_csv),
+        'alcance_gw': alcance_gw,
+        'alcance_p2p': alcance_p2p,
+        'dtype': np.dtype(dtype).str,
+        'ids': {tipo: p.ids.tolist() for tipo, p in partes.items()},
+        'arreglos': {nombre: {'archivo': f'{nombre}.npy', 'dtype': np.dtype(tipo).str,
+                              'forma': list(forma)}
+                     for nombre, (forma, tipo) in formas.items()},
+    }
+    with open(os.path.join(directorio, 'indice.json'), 'w') as f:
+        json.dump(indice, f, indent=1)
+    return AlmacenFrames(directorio)
+
+
+def obtener_almacen(ruta_csv, directorio, **opciones):
+    """Abre el almacén si corresponde al CSV actual (mismo hash y alcances); si no, lo construye"""
+    # Las opciones omitidas valen lo mismo que en construir_almacen y también se comparan
+    esperado = {'alcance_gw': LORA_MAX_RANGE, 'alcance_p2p': P2P_RANGE, 'dtype': np.float64}
+    esperado.update((k, v) for k, v in opciones.items() if k in esperado)
+    try:
+        with open(os.path.join(directorio, 'indice.json')) as f:
+            indice = json.load(f)
+        vigente = (indice.get('version') == VERSION
+                   and indice['sha256_fuente'] == _hash_archivo(ruta_csv)
+                   and all(indice[k] == (np.dtype(v).str if k == 'dtype' else v)
+                           for k, v in esperado.items()))
+    except (OSError, ValueError, KeyError):
+        vigente = False
+    if vigente:
+        return AlmacenFrames(directorio)
+    return construir_almacen(ruta_csv, directorio, **opciones)
+
+
+class AlmacenFrames:
+    """Vista de solo lectura (mmap) de un almacén; barata de abrir en cada proceso"""
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+        with open(os.path.join(directorio, 'indice.json')) as f:
+            self.indice = json.load(f)
+        self.ids = {tipo: np.asarray(v) for tipo, v in self.indice['ids'].items()}
+        for nombre, meta in self.indice['arreglos'].items():
+            ruta = os.path.join(directorio, meta['archivo'])
+            if np.prod(meta['forma']) == 0:
+                arreglo = np.empty(meta['forma'], dtype=meta['dtype'])
+            else:
+                arreglo = np.load(ruta, mmap_mode='r')
+            setattr(self, nombre, arreglo)
+
+    def __len__(self):
+        return len(self.tiempos)
+
+    def indice_frame(self, t):
+        """Frame más cercano a t (búsqueda binaria)"""
+        der = int(np.clip(np.searchsorted(self.tiempos, t), 0, len(self.tiempos) - 1))
+        izq = max(der - 1, 0)
+        return izq if t - self.tiempos[izq] <= self.tiempos[der] - t else der
+
+    def frame(self, k):
+        """Diccionario con los arreglos del frame k (vistas sin copia)"""
+        return {nombre: getattr(self, nombre)[k] for nombre in self.indice['arreglos']}
+
+
+# ===== TRABAJADORES =====
+
+_almacen = None
+
+
+def _abrir_en_trabajador(directorio):
+    global _almacen
+    _almacen = AlmacenFrames(directorio)
+
+
+def _contar_enlaces(rango):
+    """Conteo por frame de barcos presentes, directos y vía relay"""
+    i, j = rango
+    enlace = np.asarray(_almacen.enlace[i:j])
+    presentes = ~np.isnan(_almacen.boats_xy[i:j, :, 0])
+    return i, presentes.sum(axis=1), (enlace == DIRECTO).sum(axis=1), (enlace == RELAY).sum(axis=1)
+
+
+def cobertura_paralela(directorio, procesos=None, frames_por_tarea=256):
+    """Ejemplo de consumo: cobertura por frame calculada por N procesos adjuntos al almacén"""
+    almacen = AlmacenFrames(directorio)
+    n = len(almacen)
+    rangos = [(i, min(i + frames_por_tarea, n)) for i in range(0, n, frames_por_tarea)]
+    presentes = np.zeros(n, dtype=np.int64)
+    directos = np.zeros(n, dtype=np.int64)
+    relays = np.zeros(n, dtype=np.int64)
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_abrir_en_trabajador,
+                             initargs=(directorio,)) as pool:
+        for i, p, d, r in pool.map(_contar_enlaces, rangos):
+            presentes[i:i + len(p)] = p
+            directos[i:i + len(d)] = d
+            relays[i:i + len(r)] = r
+    return almacen.tiempos, presentes, directos, relays
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Almacén de frames compartido (np.memmap)")
+    sub = parser.add_subparsers(dest='comando', required=True)
+    p_con = sub.add_parser('construir', help='Parsear el CSV y escribir el almacén')
+    p_con.add_argument('posiciones')
+    p_con.add_argument('directorio')
+    p_con.add_argument('--alcance-gw', type=float, default=LORA_MAX_RANGE)
+    p_con.add_argument('--alcance-p2p', type=float, default=P2P_RANGE)
+    p_con.add_argument('--float32', action='store_true', help='Posiciones en float32 (mitad de memoria)')
+    p_inf = sub.add_parser('info', help='Mostrar el índice del almacén')
+    p_inf.add_argument('directorio')
+    p_cob = sub.add_parser('cobertura', help='Cobertura por frame con procesos en paralelo')
+    p_cob.add_argument('directorio')
+    p_cob.add_argument('--procesos', type=int)
+    p_cob.add_argument('--salida', help='CSV time,presentes,directos,relay')
+    args = parser.parse_args()
+
+    if args.comando == 'construir':
+        inicio = time.perf_counter()
+        almacen = obtener_almacen(args.posiciones, args.directorio, alcance_gw=args.alcance_gw,
+                                  alcance_p2p=args.alcance_p2p,
+                                  dtype=np.float32 if args.float32 else np.float64)
+        total = sum(os.path.getsize(os.path.join(args.directorio, m['archivo']))
+                    for m in almacen.indice['arreglos'].values())
+        print(f"✓ Almacén listo en {args.directorio}/ ({len(almacen)} frames, "
+              f"{total / 1e6:.1f} MB) en {time.perf_counter() - inicio:.2f} s")
+    elif args.comando == 'info':
+        almacen = AlmacenFrames(args.directorio)
+        print(f"Fuente: {almacen.indice['fuente']}")
+        print(f"Frames: {len(almacen)} ({almacen.tiempos[0]:g}s - {almacen.tiempos[-1]:g}s)")
+        for tipo, ids in almacen.ids.items():
+            print(f"  {tipo:<8} {len(ids)} nodos")
+        for nombre, meta in almacen.indice['arreglos'].items():
+            print(f"  {nombre:<13} {meta['dtype']:<5} {tuple(meta['forma'])}")
+    else:
+        inicio = time.perf_counter()
+        tiempos, presentes, directos, relays = cobertura_paralela(args.directorio, args.procesos)
+        cobertura = 100.0 * (directos + relays) / np.maximum(presentes, 1)
+        print(f"✓ {len(tiempos)} frames en {time.perf_counter() - inicio:.2f} s")
+        print(f"  Cobertura media: {cobertura.mean():.1f}% "
+              f"(directa {100.0 * directos.sum() / max(presentes.sum(), 1):.1f}%, "
+              f"relay {100.0 * relays.sum() / max(presentes.sum(), 1):.1f}%)")
+        if args.salida:
+            import pandas as pd
+            pd.DataFrame({'time': tiempos, 'presentes': presentes, 'directos': directos,
+                          'relay': relays}).to_csv(args.salida, index=False)
+            print(f"✓ Guardado: {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asignación de SF por Distancia (tipo ADR)
+El Objetivo 2 barre un solo --sf para toda la flota (7, 9, 12). Aquí cada
+embarcación usa, en cada frame de la traza, el SF más bajo cuyo margen sobre
+la sensibilidad del gateway cubre la pérdida hacia su gateway más cercano:
+
+    RSSI = txPower - (7.7 + weatherLoss + 10·n·log10(d))
+    SF   = mín { sf : RSSI - sensibilidad(sf) >= margen }
+
+Todo el arreglo embarcaciones × frames se resuelve de una vez (por bloques
+de frames): distancia mínima a los gateways, RSSI y la comparación contra
+las 6 sensibilidades. Con la distribución de SF resultante se suman tiempo en
+aire y energía (1 tx por periodo) y se comparan contra cada SF fijo.
+
+El exponente n por defecto es el del .cc de la arquitectura (EXPONENTES:
+2.2 tradicional, 2.0 móvil), deducida de la traza: gateways fijos =
+tradicional. Con esos exponentes, a las distancias de Salinas todo enlace
+cierra en SF7 y el adaptativo coincide con SF7 fijo; en ese caso se avisa
+(use --exponente mayor, p. ej. 3.3 sobre agua, para una comparación útil).
+
+Uso:
+    python3 asignacion_sf.py positions_salinas_movil_3gw.csv
+    python3 asignacion_sf.py posiciones_tradicional_3gw.csv --exponente 3.76 --weather-loss 10 --grafica sf.png
+    python3 asignacion_sf.py positions_mobile.csv --arquitectura tradicional
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from capacidad_aloha import PERIODO
+from radio_lora import (CABECERA_MAC, EXPONENTES, PAYLOAD_APP, SPREADING_FACTORS, TX_POWER_DBM,
+                        energia_transmision, rssi, sensibilidad, tiempo_en_aire)
+from trazas import cargar_trazas
+
+MARGEN_DB = 10.0            # margen de instalación (m_deviceMargin del AdrComponent de ns-3)
+SIN_ENLACE = 0              # ningún SF cierra el enlace (o embarcación ausente)
+SF_FIJOS = [7, 9, 12]       # barrido del Objetivo 2
+
+
+def arquitectura_traza(gws_xy):
+    """'movil' si algún gateway (F, G, 2) se mueve, 'tradicional' si están fijos"""
+    if gws_xy.size == 0:
+        return 'tradicional'
+    # fmax/fmin ignoran frames ausentes; un gateway siempre ausente queda en NaN (fijo)
+    se_mueve = np.fmax.reduce(gws_xy, axis=0) > np.fmin.reduce(gws_xy, axis=0)
+    return 'movil' if se_mueve.any() else 'tradicional'
+
+
+def asignar_sf(boats_xy, gws_xy, tx_power=TX_POWER_DBM, exponente=None, weather_loss=0.0,
+               margen=MARGEN_DB, bloque=256):
+    """
+    SF mínimo por (frame, embarcación), SIN_ENLACE si ninguno alcanza, y la
+    distancia al gateway más cercano. boats_xy: (F, B, 2); gws_xy: (F, G, 2).
+    Sin exponente se usa el del .cc de la arquitectura de los gateways.
+    """
+    if exponente is None:
+        exponente = EXPONENTES[arquitectura_traza(gws_xy)]
+    frames, n_boats = boats_xy.shape[:2]
+    sf = np.full((frames, n_boats), SIN_ENLACE, dtype=np.int8)
+    distancia = np.full((frames, n_boats), np.nan)
+    umbral = sensibilidad(SPREADING_FACTORS) + margen                  # (6,)
+    for i in range(0, frames, bloque):
+        b = boats_xy[i:i + bloque, :, None, :]
+        g = gws_xy[i:i + bloque, None, :, :]
+        d = np.hypot(b[..., 0] - g[..., 0], b[..., 1] - g[..., 1])    # (f, B, G)
+        # fmin ignora gateways ausentes; todo NaN -> NaN (y ningún SF)
+        with np.errstate(invalid='ignore'):
+            d = np.fmin.reduce(d, axis=2) if d.shape[2] else np.full(d.shape[:2], np.nan)
+        p = rssi(d, tx_power, exponente, weather_loss)
+        cierra = p[..., None] >= umbral                                  # (f, B, 6)
+        sf[i:i + bloque] = np.where(cierra.any(axis=2), SPREADING_FACTORS[cierra.argmax(axis=2)],
+                                    SIN_ENLACE)
+        distancia[i:i + bloque] = d
+    return sf, distancia
+
+
+def distribucion_por_frame(tiempos, sf, presentes):
+    """DataFrame time, sf7..sf12, sin_enlace (embarcaciones por SF en cada frame)"""
+    df = pd.DataFrame({'time': tiempos})
+    for s in SPREADING_FACTORS:
+        df[f'sf{s}'] = (sf == s).sum(axis=1)
+    df['sin_enlace'] = ((sf == SIN_ENLACE) & presentes).sum(axis=1)
+    return df
+
+
+def costo_asignacion(sf, paso, periodo=PERIODO, tx_power=TX_POWER_DBM, payload=PAYLOAD_APP):
+    """
+    Tiempo en aire (s) y energía (J) totales de la traza con 1 transmisión por
+    periodo: cada (frame, embarcación) con SF asignado aporta paso/periodo envíos.
+    """
+    cuenta = np.array([(sf == s).sum() for s in SPREADING_FACTORS], dtype=float)
+    envios = cuenta * paso / periodo
+    toa = tiempo_en_aire(SPREADING_FACTORS, payload + CABECERA_MAC)
+    energia = energia_transmision(SPREADING_FACTORS, tx_power, payload)
+    return float((envios * toa).sum()), float((envios * energia).sum())
+
+
+def comparar_fijos(sf, presentes, paso, sf_fijos=SF_FIJOS, **kwargs):
+    """Costo del SF adaptativo frente a cada SF fijo para toda la flota"""
+    con_enlace = sf != SIN_ENLACE
+    # Sin enlace la embarcación igual transmite, con el SF más alto
+    airtime, energia = costo_asignacion(np.where(presentes & ~con_enlace, SPREADING_FACTORS[-1], sf),
+                                        paso, **kwargs)
+    filas = [{'esquema': 'adaptativo', 'airtime_s': airtime, 'energia_j': energia,
+              'sin_enlace_pct': 100.0 * (presentes & ~con_enlace).sum() / max(presentes.sum(), 1),
+              'ahorro_energia_pct': 0.0}]
+    for s in sf_fijos:
+        # Con SF fijo transmiten todas las presentes; cierran enlace las que admiten SF <= s
+        fijo = np.where(presentes, s, SIN_ENLACE)
+        a, e = costo_asignacion(fijo, paso, **kwargs)
+        cierra = con_enlace & (sf <= s)
+        filas.append({'esquema': f'SF{s} fijo', 'airtime_s': a, 'energia_j': e,
+                      'sin_enlace_pct': 100.0 * (presentes & ~cierra).sum() / max(presentes.sum(), 1),
+                      'ahorro_energia_pct': 100.0 * (1.0 - energia / e) if e else 0.0})
+    return pd.DataFrame(filas)
+
+
+def graficar(distribucion, ruta):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    columnas = [f'sf{s}' for s in SPREADING_FACTORS] + ['sin_enlace']
+    colores = plt.cm.viridis(np.linspace(0.1, 0.9, len(SPREADING_FACTORS))).tolist() + ['#E74C3C']
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.stackplot(distribucion['time'] / 60.0, *[distribucion[c] for c in columnas],
+                 labels=[c.upper().replace('_', ' ') for c in columnas], colors=colores, alpha=0.85)
+    ax.set_xlabel('Tiempo (minutos)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Embarcaciones', fontsize=12, fontweight='bold')
+    ax.set_title('SF Asignado por Distancia al Gateway más Cercano', fontsize=14, fontweight='bold')
+    ax.legend(loc='upper left', bbox_to_anchor=(1.01, 1.0))
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(ruta, dpi=300, bbox_inches='tight')
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SF mínimo por embarcación y frame (tipo ADR)")
+    parser.add_argument('posiciones', help='CSV de LogPositions (time,node_id,x,y,type)')
+    parser.add_argument('--tx-power', type=float, default=TX_POWER_DBM)
+    parser.add_argument('--arquitectura', choices=sorted(EXPONENTES),
+                        help='Arquitectura del .cc (por defecto se deduce de los gateways)')
+    parser.add_argument('--exponente', type=float,
+                        help='Exponente log-distancia (por defecto el del .cc de la arquitectura)')
+    parser.add_argument('--weather-loss', type=float, default=0.0, help='Pérdidas climáticas (dB)')
+    parser.add_argument('--margen', type=float, default=MARGEN_DB, help='Margen sobre la sensibilidad (dB)')
+    parser.add_argument('--payload', type=int, default=PAYLOAD_APP)
+    parser.add_argument('--sf-fijos', type=int, nargs='+', default=SF_FIJOS)
+    parser.add_argument('--salida', default='asignacion_sf.csv', help='Distribución de SF por frame')
+    parser.add_argument('--embarcaciones', help='CSV node_id,sf_modal,sf_max,energia_media_mj')
+    parser.add_argument('--grafica', help='PNG con la distribución de SF en el tiempo')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("ASIGNACIÓN DE SF POR DISTANCIA (TIPO ADR)")
+    print("=" * 80)
+    try:
+        trazas = cargar_trazas(args.posiciones)
+    except FileNotFoundError:
+        print(f"❌ No se encontró {args.posiciones}")
+        return
+    boats = trazas.seleccionar('boat')
+    gws = trazas.seleccionar('gateway')
+    arquitectura = args.arquitectura or arquitectura_traza(gws.xy)
+    exponente = EXPONENTES[arquitectura] if args.exponente is None else args.exponente
+    print(f"Arquitectura {arquitectura} | exponente {exponente:g} | weatherLoss {args.weather_loss:g} dB | "
+          f"margen {args.margen:g} dB | {args.tx_power:g} dBm | "
+          f"{len(boats.ids)} embarcaciones × {len(boats)} frames, {len(gws.ids)} gateways")
+
+    inicio = time.perf_counter()
+    sf, distancia = asignar_sf(boats.xy, gws.xy, args.tx_power, exponente, args.weather_loss,
+                               args.margen)
+    presentes = ~np.isnan(boats.xy[:, :, 0])
+    distribucion = distribucion_por_frame(boats.tiempos, sf, presentes)
+    comparacion = comparar_fijos(sf, presentes, boats.paso_tipico() or PERIODO, args.sf_fijos,
+                                 tx_power=args.tx_power, payload=args.payload)
+    duracion = time.perf_counter() - inicio
+    print(f"✓ {presentes.sum():,} asignaciones en {duracion * 1000:.1f} ms")
+
+    total = max(presentes.sum(), 1)
+    print("\nDistribución de SF (embarcación-frames):")
+    for s in SPREADING_FACTORS:
+        n = (sf == s).sum()
+        print(f"  {f'SF{s}':<10} {n:>10} ({100.0 * n / total:5.1f}%)")
+    sin = (presentes & (sf == SIN_ENLACE)).sum()
+    print(f"  {'Sin enlace':<10} {sin:>10} ({100.0 * sin / total:5.1f}%)")
+    if presentes.any() and (sf[presentes] == SPREADING_FACTORS[0]).all():
+        print(f"⚠️  Todos los enlaces cierran en SF7 con n = {exponente:g}: el adaptativo coincide "
+              f"con SF7 fijo y la comparación de energía no aporta (revise --exponente)")
+
+    print(f"\n{'Esquema':<12} {'Airtime (s)':>12} {'Energía (J)':>12} {'Sin enlace':>11} {'Ahorro':>8}")
+    for fila in comparacion.itertuples():
+        print(f"{fila.esquema:<12} {fila.airtime_s:>12.2f} {fila.energia_j:>12.3f} "
+              f"{fila.sin_enlace_pct:>10.1f}% {fila.ahorro_energia_pct:>7.1f}%")
+
+    distribucion.to_csv(args.salida, index=False)
+    print(f"\n✓ Distribución guardada: {args.salida}")
+    if args.embarcaciones:
+        con_enlace = sf != SIN_ENLACE
+        energia = np.where(con_enlace, energia_transmision(np.maximum(sf, 7), args.tx_power,
+                                                           args.payload), 0.0)
+        frames_con_enlace = con_enlace.sum(axis=0)
+        modal = [np.bincount(col[col != SIN_ENLACE], minlength=13).argmax() if n else SIN_ENLACE
+                 for col, n in zip(sf.T, frames_con_enlace)]
+        media = np.divide(energia.sum(axis=0), frames_con_enlace,
+                          out=np.full(len(boats.ids), np.nan), where=frames_con_enlace > 0)
+        pd.DataFrame({
+            'node_id': boats.ids,
+            'sf_modal': modal,
+            'sf_max': sf.max(axis=0),
+            'energia_media_mj': np.round(media * 1000.0, 4),
+        }).to_csv(args.embarcaciones, index=False)
+        print(f"✓ SF por embarcación guardado: {args.embarcaciones}")
+    if args.grafica:
+        graficar(distribucion, args.grafica)
+        print(f"✓ Gráfica guardada: {args.grafica}")
+
+
+if __name__ == '__main__':
+    main()
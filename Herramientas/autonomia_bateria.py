@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Proyección de Autonomía de Batería por Embarcación
+El .cc imprime una sola "Autonomía estimada (1 tx/min)" a partir del promedio
+de g_energyConsumptions. Aquí cada embarcación tiene su propio consumo:
+
+  - transmisiones propias: el calendario del PeriodicSender (60 s, primer
+    envío al azar) o, con --columnas, los envíos reales de parser_log_ns3;
+  - tráfico P2P (--decisiones de replay_p2p): un envío por cada intento del
+    origen y un reenvío por cada relay exitoso en la embarcación relay (en
+    el modo periódico, que no registra relay, la más cercana a menos de 3 km);
+  - energía por envío con la tabla de corriente del SX1276 de
+    CalculateTransmissionEnergy según su SF y potencia, más una corriente de
+    reposo opcional (el .cc no la cuenta).
+
+El consumo de la ventana simulada se toma como perfil que se repite, así la
+batería de todas las embarcaciones en todos los instantes es una operación
+sobre un arreglo (embarcaciones × tiempo): ventanas completas más el
+acumulado dentro de la ventana. Batería de 2600 mAh a 3.7 V (34632 J).
+
+Uso:
+    python3 autonomia_bateria.py positions_salinas_movil_3gw.csv --decisiones decisiones_p2p.csv
+    python3 autonomia_bateria.py positions_mobile.csv --columnas salinas_debug_columnas --dias 60 --serie bateria.csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from capacidad_aloha import PERIODO, calendario_envios
+from radio_lora import P2P_RELAY_RANGE, PAYLOAD_APP, TX_POWER_DBM, energia_transmision
+from trazas import cargar_trazas
+
+CAPACIDAD_MAH = 2600.0
+VOLTAJE_BATERIA = 3.7
+VOLTAJE_RADIO = 3.3
+PASO_PERFIL = 60.0          # resolución del perfil de consumo dentro de la ventana (s)
+
+
+def capacidad_julios(mah=CAPACIDAD_MAH, voltaje=VOLTAJE_BATERIA):
+    """2600 mAh a 3.7 V = 34632 J, como batteryCapacity del .cc"""
+    return mah / 1000.0 * voltaje * 3600.0
+
+
+# ===== CONSUMO EN LA VENTANA =====
+
+def transmisiones_periodicas(ids, ventana, periodo=PERIODO, semilla=0):
+    """(tiempo, node_id) de los envíos del PeriodicSender de cada embarcación"""
+    dispositivo, inicio = calendario_envios(len(ids), ventana, periodo, np.random.default_rng(semilla))
+    return inicio, np.asarray(ids)[dispositivo]
+
+
+def transmisiones_log(columnas):
+    """(tiempo, node_id, energía J) de los registros de envío de parser_log_ns3"""
+    from parser_log_ns3 import ENVIO
+    envio = np.asarray(columnas['tipo']) == ENVIO
+    return (np.asarray(columnas['tiempo'])[envio], np.asarray(columnas['nodo'])[envio],
+            np.asarray(columnas['energia_mj'])[envio] / 1000.0)
+
+
+def atribuir_relays(decisiones, boats, alcance=P2P_RELAY_RANGE):
+    """
+    Relay de cada éxito sin relay registrado (modo periódico de replay_p2p):
+    la embarcación más cercana al origen a menos del alcance en el frame de la
+    decisión, con un árbol KD por frame como replay_p2p. -1 si no hay ninguna.
+    """
+    relay = decisiones['relay'].to_numpy().astype(np.int64)
+    pendientes = np.flatnonzero(decisiones['exito'].astype(bool).to_numpy() & (relay < 0))
+    if len(pendientes) == 0 or len(boats) == 0:
+        return relay
+    frames = np.array([boats.indice(t) for t in decisiones['time'].to_numpy(float)[pendientes]])
+    fila = np.searchsorted(boats.ids, decisiones['node_id'].to_numpy()[pendientes])
+    fila = np.clip(fila, 0, len(boats.ids) - 1)
+    conocidos = boats.ids[fila] == decisiones['node_id'].to_numpy()[pendientes]
+    for f in np.unique(frames):
+        sel = np.flatnonzero((frames == f) & conocidos)
+        validos = np.flatnonzero(~np.isnan(boats.xy[f, :, 0]))
+        origenes = boats.xy[f, fila[sel]]
+        sel = sel[~np.isnan(origenes[:, 0])]
+        if len(sel) == 0 or len(validos) < 2:
+            continue
+        # El vecino más cercano del origen es él mismo: se piden dos
+        d, k = cKDTree(boats.xy[f, validos]).query(boats.xy[f, fila[sel]], k=2,
+                                                   distance_upper_bound=np.nextafter(alcance, 0))
+        con_vecino = np.isfinite(d[:, 1])
+        k = np.where(validos[np.minimum(k[:, 1], len(validos) - 1)] == fila[sel], k[:, 0], k[:, 1])
+        relay[pendientes[sel[con_vecino]]] = boats.ids[validos[k[con_vecino]]]
+    return relay
+
+
+def transmisiones_p2p(decisiones, boats=None, alcance=P2P_RELAY_RANGE):
+    """(tiempo, node_id): intento de cada origen + reenvío de cada relay exitoso"""
+    relay = decisiones['relay'].to_numpy()
+    if boats is not None:
+        relay = atribuir_relays(decisiones, boats, alcance)
+    exito = decisiones['exito'].astype(bool).to_numpy()
+    sin_relay = int((exito & (relay < 0)).sum())
+    if sin_relay:
+        print(f"⚠️  {sin_relay} relays exitosos sin embarcación relay: su reenvío no se cobra")
+    exito = exito & (relay >= 0)
+    tiempos = np.concatenate([decisiones['time'].to_numpy(float), decisiones['time'].to_numpy(float)[exito]])
+    nodos = np.concatenate([decisiones['node_id'].to_numpy(), relay[exito]])
+    return tiempos, nodos
+
+
+def perfil_consumo(ids, tiempos, nodos, energias, ventana, paso=PASO_PERFIL):
+    """
+    Energía (J) por embarcación y por intervalo de `paso` dentro de la
+    ventana: matriz (embarcaciones, intervalos). Eventos de nodos que no son
+    embarcaciones de la traza (gateways, servidor) se descartan.
+    """
+    ids = np.asarray(ids)
+    intervalos = int(np.ceil(ventana / paso))
+    orden = np.argsort(ids)
+    pos = np.searchsorted(ids[orden], nodos)
+    pos = np.minimum(pos, len(ids) - 1)
+    valido = (ids[orden][pos] == nodos) & (tiempos >= 0) & (tiempos < ventana)
+    b = orden[pos[valido]]
+    k = (tiempos[valido] // paso).astype(int)
+    energia = np.broadcast_to(energias, nodos.shape)[valido]
+    return np.bincount(b * intervalos + k, weights=energia,
+                       minlength=len(ids) * intervalos).reshape(len(ids), intervalos)
+
+
+# ===== PROYECCIÓN =====
+
+class Proyeccion:
+    """Batería de cada embarcación en cualquier instante a partir del perfil de una ventana"""
+
+    def __init__(self, ids, perfil, paso, capacidad, reposo_w=0.0):
+        self.ids = np.asarray(ids)
+        self.paso = paso
+        self.ventana = perfil.shape[1] * paso
+        self.capacidad = capacidad
+        self.perfil = perfil + reposo_w * paso
+        self.acumulado = np.cumsum(self.perfil, axis=1)
+        self.por_ventana = self.acumulado[:, -1]
+
+    def energia(self, t):
+        """Energía consumida (J) por embarcación en los tiempos t: (embarcaciones, len(t))"""
+        t = np.asarray(t, dtype=float)
+        completas = np.floor(t / self.ventana)
+        k = np.floor((t - completas * self.ventana) / self.paso).astype(int)
+        # Acumulado hasta el final del intervalo previo, el del intervalo actual es parcial
+        previo = np.concatenate([np.zeros((len(self.ids), 1)), self.acumulado], axis=1)[:, k]
+        fraccion = (t - completas * self.ventana - k * self.paso) / self.paso
+        parcial = self.perfil[:, np.minimum(k, self.perfil.shape[1] - 1)] * fraccion
+        return completas * self.por_ventana[:, None] + previo + parcial
+
+    def bateria(self, t):
+        """Batería restante (%) por embarcación y tiempo"""
+        return np.clip(100.0 * (1.0 - self.energia(t) / self.capacidad), 0.0, 100.0)
+
+    def autonomia(self):
+        """Segundos hasta agotar la batería por embarcación (inf si no consume)"""
+        con_consumo = self.por_ventana > 0
+        completas = np.zeros(len(self.ids))
+        completas[con_consumo] = np.floor(self.capacidad / self.por_ventana[con_consumo])
+        resto = self.capacidad - completas * self.por_ventana
+        # Primer intervalo de la ventana en que el acumulado alcanza el resto (interpolado)
+        k = np.minimum((self.acumulado < resto[:, None]).sum(axis=1), self.perfil.shape[1] - 1)
+        previo = np.where(k > 0, self.acumulado[np.arange(len(self.ids)), k - 1], 0.0)
+        en_intervalo = self.perfil[np.arange(len(self.ids)), k]
+        fraccion = np.divide(resto - previo, en_intervalo, out=np.zeros(len(self.ids)),
+                             where=en_intervalo > 0)
+        segundos = completas * self.ventana + (k + np.clip(fraccion, 0.0, 1.0)) * self.paso
+        return np.where(con_consumo, segundos, np.inf)
+
+
+def proyectar(trazas, ventana=None, sf=7, tx_power=TX_POWER_DBM, payload=PAYLOAD_APP,
+              decisiones=None, columnas=None, capacidad=None, reposo_ma=0.0,
+              paso=PASO_PERFIL, semilla=0):
+    """Proyeccion y resumen por embarcación (DataFrame) de una traza"""
+    boats = trazas.seleccionar('boat')
+    ids = boats.ids
+    if ventana is None:
+        ventana = boats.tiempos[-1] + boats.paso_tipico() if len(boats) else 0.0
+    capacidad = capacidad_julios() if capacidad is None else capacidad
+    # SF y potencia pueden ser uno por embarcación
+    e_tx = np.broadcast_to(energia_transmision(sf, tx_power, payload), ids.shape).astype(float)
+    indice = {n: i for i, n in enumerate(ids)}
+
+    if columnas is not None:
+        tiempos, nodos, energias = transmisiones_log(columnas)
+        modelo = np.array([e_tx[indice[n]] if n in indice else 0.0 for n in nodos])
+        energias = np.where(np.isfinite(energias), energias, modelo)
+    else:
+        tiempos, nodos = transmisiones_periodicas(ids, ventana, semilla=semilla)
+        energias = e_tx[np.searchsorted(ids, nodos)]
+    propias = perfil_consumo(ids, tiempos, nodos, energias, ventana, paso)
+    n_tx = perfil_consumo(ids, tiempos, nodos, 1.0, ventana, paso).sum(axis=1)
+
+    relays = np.zeros(len(ids))
+    p2p = np.zeros_like(propias)
+    if decisiones is not None and len(decisiones):
+        t_p2p, n_p2p = transmisiones_p2p(decisiones, boats)
+        energias_p2p = np.array([e_tx[indice[n]] if n in indice else 0.0 for n in n_p2p])
+        p2p = perfil_consumo(ids, t_p2p, n_p2p, energias_p2p, ventana, paso)
+        relays = perfil_consumo(ids, t_p2p, n_p2p, 1.0, ventana, paso).sum(axis=1)
+
+    proyeccion = Proyeccion(ids, propias + p2p, paso, capacidad, VOLTAJE_RADIO * reposo_ma / 1000.0)
+    autonomia = proyeccion.autonomia()
+    resumen = pd.DataFrame({
+        'node_id': ids,
+        'transmisiones': n_tx.astype(int),
+        'envios_p2p': relays.astype(int),
+        'energia_ventana_j': np.round(proyeccion.por_ventana, 6),
+        'autonomia_h': np.round(autonomia / 3600.0, 2),
+    })
+    resumen['orden'] = resumen['autonomia_h'].rank(method='first').astype(int)
+    return proyeccion, resumen
+
+
+def serie_bateria(proyeccion, horizonte, paso):
+    """Serie larga time,node_id,bateria_pct cada `paso` segundos hasta `horizonte`"""
+    t = np.arange(0.0, horizonte + paso / 2, paso)
+    bateria = proyeccion.bateria(t)
+    return pd.DataFrame({
+        'time': np.tile(t, len(proyeccion.ids)),
+        'node_id': np.repeat(proyeccion.ids, len(t)),
+        'bateria_pct': np.round(bateria.ravel(), 3),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Autonomía de batería por embarcación")
+    parser.add_argument('posiciones', help='CSV de LogPositions (embarcaciones de la flota)')
+    parser.add_argument('--decisiones', help='CSV de replay_p2p --salida (tráfico P2P)')
+    parser.add_argument('--columnas', help='Directorio de parser_log_ns3 (envíos reales)')
+    parser.add_argument('--sim-time', type=float, help='Ventana simulada (s); por defecto la de la traza')
+    parser.add_argument('--sf', type=int, default=7, choices=range(7, 13))
+    parser.add_argument('--tx-power', type=float, default=TX_POWER_DBM)
+    parser.add_argument('--payload', type=int, default=PAYLOAD_APP)
+    parser.add_argument('--capacidad-mah', type=float, default=CAPACIDAD_MAH)
+    parser.add_argument('--reposo-ma', type=float, default=0.0, help='Corriente de reposo (mA)')
+    parser.add_argument('--dias', type=float, default=30.0, help='Horizonte de la serie')
+    parser.add_argument('--paso-serie', type=float, default=3600.0, help='Paso de la serie (s)')
+    parser.add_argument('--primeras', type=int, default=5, help='Embarcaciones a listar')
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', default='autonomia_embarcaciones.csv')
+    parser.add_argument('--serie', help='CSV time,node_id,bateria_pct')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("PROYECCIÓN DE AUTONOMÍA DE BATERÍA POR EMBARCACIÓN")
+    print("=" * 80)
+    try:
+        trazas = cargar_trazas(args.posiciones)
+    except FileNotFoundError:
+        print(f"❌ No se encontró {args.posiciones}")
+        return
+    decisiones = pd.read_csv(args.decisiones) if args.decisiones else None
+    columnas = None
+    if args.columnas:
+        from parser_log_ns3 import cargar_columnas
+        columnas = cargar_columnas(args.columnas)
+
+    capacidad = capacidad_julios(args.capacidad_mah)
+    inicio = time.perf_counter()
+    proyeccion, resumen = proyectar(trazas, args.sim_time, args.sf, args.tx_power, args.payload,
+                                    decisiones, columnas, capacidad, args.reposo_ma,
+                                    semilla=args.semilla)
+    serie = serie_bateria(proyeccion, args.dias * 86400.0, args.paso_serie) if args.serie else None
+    duracion = time.perf_counter() - inicio
+
+    e_tx = float(energia_transmision(args.sf, args.tx_power, args.payload))
+    autonomia_cc = capacidad / e_tx * PERIODO / 3600.0
+    print(f"Batería: {args.capacidad_mah:g} mAh ({capacidad:.0f} J) | SF{args.sf} {args.tx_power:g} dBm "
+          f"| {e_tx * 1000:.3f} mJ/tx | reposo {args.reposo_ma:g} mA")
+    print(f"✓ {len(resumen)} embarcaciones, ventana {proyeccion.ventana:g} s, en {duracion * 1000:.1f} ms")
+    print(f"  Autonomía estimada del .cc (1 tx/min): {autonomia_cc:.1f} horas")
+    horas = resumen['autonomia_h'].replace(np.inf, np.nan)
+    if horas.notna().any():
+        print(f"  Por embarcación: mín {horas.min():.1f} h | mediana {horas.median():.1f} h | "
+              f"máx {horas.max():.1f} h")
+    if resumen['envios_p2p'].sum():
+        print(f"  Envíos P2P (intentos + relays): {resumen['envios_p2p'].sum()}")
+
+    primeras = resumen.sort_values('orden').head(args.primeras)
+    print(f"\n⚠️  Primeras {len(primeras)} embarcaciones en agotar la batería:")
+    for fila in primeras.itertuples():
+        print(f"  Nodo {fila.node_id:>4}: {fila.autonomia_h:>10.1f} h ({fila.autonomia_h / 24:.1f} días) | "
+              f"{fila.transmisiones} tx + {fila.envios_p2p} P2P en la ventana")
+
+    resumen.to_csv(args.salida, index=False)
+    print(f"\n✓ Resumen guardado: {args.salida}")
+    if serie is not None:
+        serie.to_csv(args.serie, index=False)
+        print(f"✓ Serie de batería guardada: {args.serie} ({len(serie):,} filas)")
+
+
+if __name__ == '__main__':
+    main()
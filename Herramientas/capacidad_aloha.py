@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Capacidad LoRa (ALOHA) por Densidad de Nodos
+Estima el PDR de cada arquitectura en función del número de embarcaciones
+sin correr ns-3 una vez por densidad (Escenario 2 de Ob3).
+
+  1. Calendario de envíos del PeriodicSenderHelper de main(): periodo 60 s,
+     primer envío uniforme en [0, 60) por dispositivo, canal al azar entre
+     los 3 de EU868 en cada transmisión.
+  2. Posición de cada dispositivo en cada envío desde la traza (frame más
+     cercano). Por encima de las embarcaciones de la traza, el dispositivo k
+     sigue la trayectoria de la embarcación k mod N desfasada en el tiempo.
+  3. Recepción en cada gateway si el RSSI log-distancia supera la
+     sensibilidad del SF (opcionalmente también un corte duro --alcance).
+     El exponente es el del .cc de cada arquitectura (2.2 tradicional,
+     2.0 móvil) salvo que se fije --exponente.
+  4. Colisiones por gateway, canal y SF con un barrido sobre intervalos
+     ordenados: cada paquete se compara con los siguientes mientras su inicio
+     caiga antes de su fin, y se queda con el interferente más fuerte.
+     Sobrevive si lo supera en --captura dB (6 dB, aislamiento co-SF de
+     ns-3); --aloha-puro descarta cualquier solapamiento.
+  5. Entregado = recibido sin colisión por al menos un gateway.
+
+Simplificaciones: SF ortogonales entre sí, captura contra el interferente
+más fuerte (no la suma), sin límite de caminos de recepción del gateway.
+
+Uso:
+    python3 capacidad_aloha.py --tradicional positions_fixed.csv --movil positions_mobile.csv
+    python3 capacidad_aloha.py --movil positions_mobile.csv --nodos 100 1000 10000 --sf 9 --grafica pdr.png
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from radio_lora import (CABECERA_MAC, EXPONENTE, EXPONENTES, PAYLOAD_APP, TX_POWER_DBM, rssi,
+                        sensibilidad, tiempo_en_aire)
+from trazas import cargar_trazas
+
+PERIODO = 60.0              # PeriodicSenderHelper::SetPeriod
+SIM_TIME = 3600.0           # Escenario 2 (TIME=3600)
+CANALES = 3                 # 868.1 / 868.3 / 868.5 MHz
+CAPTURA_DB = 6.0
+NODOS = [50, 75, 100, 250, 500, 1000, 2500, 5000, 10000, 20000]
+
+
+# ===== CALENDARIO =====
+
+def calendario_envios(n_dispositivos, sim_time=SIM_TIME, periodo=PERIODO, rng=None):
+    """(dispositivo, inicio) de todos los envíos periódicos antes de sim_time"""
+    rng = np.random.default_rng() if rng is None else rng
+    primero = rng.uniform(0.0, periodo, n_dispositivos)
+    k = np.arange(int(np.ceil(sim_time / periodo)))
+    inicio = primero[:, None] + k[None, :] * periodo
+    dispositivo, _ = np.nonzero(inicio < sim_time)
+    return dispositivo, inicio[inicio < sim_time]
+
+
+def posiciones_envio(boats, dispositivo, inicio, rng):
+    """Posición (paquetes, 2) de cada dispositivo al transmitir y frame de la traza"""
+    n_boats = len(boats.ids)
+    frames = len(boats)
+    f = boats.indices_cercanos(inicio)
+    copia = dispositivo // n_boats
+    desfase = rng.integers(0, frames, copia.max() + 1) if len(copia) else np.zeros(1, dtype=int)
+    desfase[0] = 0                       # las embarcaciones reales van en su tiempo
+    fb = (f + desfase[copia]) % frames
+    return boats.xy[fb, dispositivo % n_boats], f
+
+
+# ===== RECEPCIÓN Y COLISIONES =====
+
+def recepciones(xy, frame, gws_xy, sf, tx_power=TX_POWER_DBM, exponente=EXPONENTE,
+                weather_loss=0.0, alcance=None, bloque=200000):
+    """
+    Pares (paquete, gateway, rssi) con el paquete por encima de la
+    sensibilidad del gateway. Por bloques para acotar paquetes × gateways.
+    """
+    paquetes, gateways, potencias = [], [], []
+    umbral = sensibilidad(sf)
+    for i in range(0, len(xy), bloque):
+        g = gws_xy[frame[i:i + bloque]]                              # (bloque, G, 2)
+        d = np.hypot(g[:, :, 0] - xy[i:i + bloque, None, 0], g[:, :, 1] - xy[i:i + bloque, None, 1])
+        p = rssi(d, tx_power, exponente, weather_loss)
+        ok = p >= umbral[i:i + bloque, None]                         # False con NaN
+        if alcance is not None:
+            ok &= d <= alcance
+        paq, gw = np.nonzero(ok)
+        paquetes.append(paq + i)
+        gateways.append(gw)
+        potencias.append(p[paq, gw])
+    return np.concatenate(paquetes), np.concatenate(gateways), np.concatenate(potencias)
+
+
+def sin_colision(grupo, inicio, duracion, potencia, captura=CAPTURA_DB):
+    """
+    True para cada recepción que sobrevive a las demás de su grupo
+    (gateway, canal, SF). Tras ordenar por (grupo, inicio), los solapes de
+    cada recepción con las posteriores forman una racha contigua, así que
+    basta comparar con el desplazamiento k = 1, 2, ... hasta que ninguna
+    siga solapada.
+    """
+    orden = np.lexsort((inicio, grupo))
+    g, s, p = grupo[orden], inicio[orden], potencia[orden]
+    fin = s + duracion[orden]
+    interferente = np.full(len(g), -np.inf)
+    k = 1
+    while k < len(g):
+        solapa = (g[k:] == g[:-k]) & (s[k:] < fin[:-k])
+        i = np.nonzero(solapa)[0]
+        if len(i) == 0:
+            break
+        j = i + k
+        interferente[i] = np.maximum(interferente[i], p[j])
+        interferente[j] = np.maximum(interferente[j], p[i])
+        k += 1
+    ok = np.empty(len(g), dtype=bool)
+    ok[orden] = p - interferente >= captura        # -inf (sin solape) siempre pasa
+    return ok
+
+
+def simular(trazas, n_dispositivos, sim_time=SIM_TIME, sf=7, payload=PAYLOAD_APP,
+            tx_power=TX_POWER_DBM, exponente=EXPONENTE, weather_loss=0.0, alcance=None,
+            captura=CAPTURA_DB, periodo=PERIODO, canales=CANALES, semilla=0):
+    """
+    Envía, recibe y resuelve colisiones para una densidad; devuelve contadores.
+    `exponente` por defecto es el de la móvil: la tradicional usa EXPONENTES['tradicional'].
+    """
+    rng = np.random.default_rng(semilla)
+    boats = trazas.seleccionar('boat')
+    gws = trazas.seleccionar('gateway')
+
+    dispositivo, inicio = calendario_envios(n_dispositivos, sim_time, periodo, rng)
+    sf_paquete = np.broadcast_to(np.asarray(sf), (n_dispositivos,))[dispositivo]
+    canal = rng.integers(0, canales, len(inicio))
+    xy, frame = posiciones_envio(boats, dispositivo, inicio, rng)
+
+    paq, gw, potencia = recepciones(xy, frame, gws.xy, sf_paquete, tx_power, exponente,
+                                    weather_loss, alcance)
+    grupo = (gw * canales + canal[paq]) * 6 + (sf_paquete[paq] - 7)
+    duracion = tiempo_en_aire(sf_paquete[paq], payload + CABECERA_MAC)
+    ok = sin_colision(grupo, inicio[paq], duracion, potencia, captura)
+
+    oido = np.zeros(len(inicio), dtype=bool)
+    oido[paq] = True
+    entregado = np.zeros(len(inicio), dtype=bool)
+    entregado[paq[ok]] = True
+    enviados = len(inicio)
+    return {
+        'nodos': n_dispositivos,
+        'enviados': enviados,
+        'sin_cobertura': int((~oido).sum()),
+        'colisionados': int((oido & ~entregado).sum()),
+        'entregados': int(entregado.sum()),
+        'pdr': round(100.0 * entregado.sum() / enviados, 3) if enviados else 0.0,
+    }
+
+
+def curva_capacidad(trazas, nodos=NODOS, **kwargs):
+    """DataFrame con una fila por densidad"""
+    return pd.DataFrame([simular(trazas, n, **kwargs) for n in nodos])
+
+
+def graficar(resultados, ruta, umbral):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    colores = {'tradicional': '#E74C3C', 'movil': '#27AE60'}
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for arquitectura, df in resultados.groupby('arquitectura', sort=False):
+        ax.plot(df['nodos'], df['pdr'], 'o-', color=colores.get(arquitectura), linewidth=2,
+                label=arquitectura.capitalize())
+    ax.axhline(umbral, color='gray', linestyle='--', linewidth=1, label=f'Umbral {umbral:g}%')
+    ax.set_xscale('log')
+    ax.set_xlabel('Número de embarcaciones', fontsize=12, fontweight='bold')
+    ax.set_ylabel('PDR estimado (%)', fontsize=12, fontweight='bold')
+    ax.set_title('Capacidad LoRa (ALOHA) por Densidad', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(ruta, dpi=300, bbox_inches='tight')
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDR estimado vs número de nodos (colisiones ALOHA)")
+    parser.add_argument('--tradicional', help='CSV de posiciones de la arquitectura tradicional')
+    parser.add_argument('--movil', help='CSV de posiciones de la arquitectura móvil')
+    parser.add_argument('--nodos', type=int, nargs='+', default=NODOS)
+    parser.add_argument('--sim-time', type=float, default=SIM_TIME)
+    parser.add_argument('--sf', type=int, default=7, choices=range(7, 13))
+    parser.add_argument('--payload', type=int, default=PAYLOAD_APP, help='Bytes de aplicación')
+    parser.add_argument('--tx-power', type=float, default=TX_POWER_DBM)
+    parser.add_argument('--exponente', type=float,
+                        help='Exponente de pérdida (por defecto el del .cc de cada arquitectura)')
+    parser.add_argument('--weather-loss', type=float, default=0.0, help='Pérdidas climáticas (dB)')
+    parser.add_argument('--alcance', type=float, help='Corte duro de distancia (m), p. ej. 15000')
+    parser.add_argument('--captura', type=float, default=CAPTURA_DB, help='Umbral de captura (dB)')
+    parser.add_argument('--aloha-puro', action='store_true', help='Todo solapamiento es colisión')
+    parser.add_argument('--umbral', type=float, default=95.0, help='PDR mínimo aceptable (%%)')
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', default='capacidad_aloha.csv')
+    parser.add_argument('--grafica', help='PNG con la curva PDR vs nodos')
+    args = parser.parse_args()
+
+    rutas = {'tradicional': args.tradicional, 'movil': args.movil}
+    rutas = {k: v for k, v in rutas.items() if v}
+    if not rutas:
+        parser.error('indique --tradicional y/o --movil')
+
+    print("=" * 80)
+    print("CAPACIDAD LORA (ALOHA) POR DENSIDAD DE NODOS")
+    print("=" * 80)
+    print(f"SF{args.sf} | ToA {float(tiempo_en_aire(args.sf, args.payload + CABECERA_MAC)) * 1000:.1f} ms | "
+          f"periodo {PERIODO:g} s | {CANALES} canales | sim {args.sim_time:g} s | "
+          f"captura {'no' if args.aloha_puro else f'{args.captura:g} dB'}")
+
+    tablas = []
+    for arquitectura, ruta in rutas.items():
+        try:
+            trazas = cargar_trazas(ruta)
+        except FileNotFoundError:
+            print(f"❌ No se encontró {ruta}")
+            continue
+        exponente = EXPONENTES[arquitectura] if args.exponente is None else args.exponente
+        inicio = time.perf_counter()
+        tabla = curva_capacidad(
+            trazas, args.nodos, sim_time=args.sim_time, sf=args.sf, payload=args.payload,
+            tx_power=args.tx_power, exponente=exponente, weather_loss=args.weather_loss,
+            alcance=args.alcance, captura=np.inf if args.aloha_puro else args.captura,
+            semilla=args.semilla)
+        duracion = time.perf_counter() - inicio
+        tabla.insert(0, 'arquitectura', arquitectura)
+        tablas.append(tabla)
+
+        print(f"\n✓ {arquitectura.upper()} ({ruta}, exponente {exponente:g}): "
+              f"{tabla['enviados'].sum():,} paquetes en {duracion:.2f} s")
+        print(f"{'Nodos':>8} {'Enviados':>10} {'Sin cob.':>10} {'Colisión':>10} {'PDR (%)':>9}")
+        for fila in tabla.itertuples():
+            print(f"{fila.nodos:>8} {fila.enviados:>10} {fila.sin_cobertura:>10} "
+                  f"{fila.colisionados:>10} {fila.pdr:>9.2f}")
+        bajo = tabla[tabla['pdr'] < args.umbral]
+        if len(bajo):
+            print(f"⚠️  PDR bajo {args.umbral:g}% desde {bajo['nodos'].iloc[0]} nodos")
+        else:
+            print(f"✓ PDR ≥ {args.umbral:g}% en todas las densidades")
+
+    if not tablas:
+        return
+    resultados = pd.concat(tablas, ignore_index=True)
+    resultados.to_csv(args.salida, index=False)
+    print(f"\n✓ Resultados guardados: {args.salida}")
+    if args.grafica:
+        graficar(resultados, args.grafica, args.umbral)
+        print(f"✓ Gráfica guardada: {args.grafica}")
+
+
+if __name__ == '__main__':
+    main()
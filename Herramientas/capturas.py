@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Capturas de la Red en Tiempos Arbitrarios
+Renderiza una o dos arquitecturas (lado a lado) en los instantes t1...tn
+pedidos, sin construir ninguna animación. Cada tiempo se resuelve por
+búsqueda binaria sobre el índice de tiempos de la traza (frame más cercano)
+y la figura se arma una sola vez: por cada captura solo se actualizan las
+posiciones, los enlaces y los textos antes de guardar.
+
+Con trazas comprimidas (.trz) solo se descomprimen las ventanas alrededor
+de los tiempos pedidos, así que una traza completa no se carga entera.
+
+Uso:
+    python3 capturas.py --tradicional positions_fixed.csv --movil positions_mobile.csv \\
+        --tiempos 300 1800 3590
+    python3 capturas.py --movil positions_mobile.trz --tiempos 120 240 --dpi 150
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+from radio_lora import LORA_MAX_RANGE
+from trazas import Trazas, cargar_trazas
+from discos_cobertura import DiscosCobertura
+
+AREA = (25000, 15000)
+
+ARQUITECTURAS = {
+    'tradicional': {
+        'titulo': '⚓ ARQUITECTURA TRADICIONAL',
+        'fondo': '#E3F2FD', 'color': '#E74C3C', 'borde': '#C0392B', 'enlace': '#95A5A6',
+        'marcador_gw': 's', 'etiqueta_gw': 'GW Fijos', 'topologia': 'Estrella', 'p2p': 'No',
+    },
+    'movil': {
+        'titulo': '🚢 ARQUITECTURA PROPUESTA',
+        'fondo': '#E8F5E9', 'color': '#27AE60', 'borde': '#1E8449', 'enlace': '#52BE80',
+        'marcador_gw': '^', 'etiqueta_gw': 'GW Móviles', 'topologia': 'Híbrida', 'p2p': 'Sí',
+    },
+}
+
+
+# ===== CARGA =====
+
+def cargar_ventanas(ruta, tiempos, margen=60.0):
+    """
+    Trazas con los frames necesarios para `tiempos`. Un .trz se lee solo en
+    [t - margen, t + margen] por tiempo pedido; un CSV se lee completo.
+    """
+    if not str(ruta).endswith('.trz'):
+        return cargar_trazas(ruta)
+    from traza_comprimida import TrazaComprimida
+    traza = TrazaComprimida(ruta)
+    # Un tiempo fuera de la traza se resuelve en su extremo, como con el CSV completo
+    pedidos = np.clip(np.asarray(tiempos, dtype=float), *traza.rango_tiempo())
+    ventanas = []
+    for t in np.sort(pedidos):
+        if ventanas and t - margen <= ventanas[-1][1]:
+            ventanas[-1][1] = t + margen
+        else:
+            ventanas.append([t - margen, t + margen])
+    df = pd.concat([traza.leer(t0, t1) for t0, t1 in ventanas], ignore_index=True)
+    trazas = Trazas.desde_dataframe(df.drop_duplicates(['time', 'node_id']))
+    # Si algún tiempo no tiene un frame en su ventana (hueco en la traza), el
+    # más cercano podría estar fuera de lo leído: se lee la traza completa
+    if (len(trazas) == 0
+            or np.any(np.abs(trazas.tiempos[trazas.indices_cercanos(pedidos)] - pedidos) > margen)):
+        trazas = Trazas.desde_dataframe(traza.leer())
+    return trazas
+
+
+# ===== PANELES =====
+
+class PanelArquitectura:
+    """Artistas de un panel creados una vez y actualizados por captura"""
+
+    def __init__(self, ax, trazas, estilo, alcance=LORA_MAX_RANGE):
+        self.ax = ax
+        self.estilo = estilo
+        self.alcance = alcance
+        self.boats = trazas.seleccionar('boat')
+        self.gws = trazas.seleccionar('gateway')
+        self.servidor = trazas.seleccionar('server')
+
+        ax.set_facecolor(estilo['fondo'])
+        ax.fill_between([0, AREA[0]], -1000, 0, color='#D7CCC8', alpha=0.8)
+        self.coberturas = DiscosCobertura(ax, alcance, estilo['color'], alpha=0.10)
+        self.enlaces = LineCollection([], colors=estilo['enlace'], linewidths=0.8, alpha=0.5)
+        self.enlaces_srv = LineCollection([], colors='#F39C12', linewidths=2, alpha=0.7,
+                                          linestyles=':')
+        ax.add_collection(self.enlaces)
+        ax.add_collection(self.enlaces_srv)
+        vacio = np.empty((0, 2))
+        self.pts_boats = ax.scatter(vacio[:, 0], vacio[:, 1], c='#3498DB', s=120, marker='o',
+                                    alpha=0.8, edgecolors='#2874A6', linewidths=2, zorder=5)
+        self.pts_gws = ax.scatter(vacio[:, 0], vacio[:, 1], c=estilo['color'], s=500,
+                                  marker=estilo['marcador_gw'], alpha=0.9,
+                                  edgecolors=estilo['borde'], linewidths=3, zorder=6)
+        self.pts_srv = ax.scatter(vacio[:, 0], vacio[:, 1], c='#F39C12', s=600, marker='D',
+                                  label='Network Server', alpha=0.95, edgecolors='#D68910',
+                                  linewidths=3, zorder=7)
+        self.texto = ax.text(0.02, 0.98, '', transform=ax.transAxes, fontsize=11,
+                             verticalalignment='top', fontweight='bold', color=estilo['color'],
+                             bbox=dict(boxstyle='round', facecolor='white', alpha=0.9,
+                                       edgecolor=estilo['color'], linewidth=3))
+
+        ax.set_xlim(-500, AREA[0] + 500)
+        ax.set_ylim(-1000, AREA[1] + 500)
+        ax.set_xlabel('Distancia Este (metros)', fontweight='bold', fontsize=12)
+        ax.set_ylabel('Distancia Norte (metros)', fontweight='bold', fontsize=12)
+        ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
+
+    def actualizar(self, t):
+        """Muestra el frame más cercano a t; devuelve (tiempo real, conectadas, total)"""
+        f = int(self.boats.indices_cercanos(t))
+        tiempo = self.boats.tiempos[f]
+        _, boats = self.boats.frame(f)
+        _, gws = self.gws.frame(self.gws.indices_cercanos(tiempo))
+        _, srv = self.servidor.frame(self.servidor.indices_cercanos(tiempo)) \
+            if len(self.servidor.ids) else (None, np.empty((0, 2)))
+
+        self.coberturas.actualizar(gws)
+
+        conectadas = 0
+        segmentos = np.empty((0, 2, 2))
+        if len(boats) and len(gws):
+            d = np.sqrt(((boats[:, None, :] - gws[None, :, :]) ** 2).sum(axis=2))
+            cercano = d.argmin(axis=1)
+            en_rango = d[np.arange(len(boats)), cercano] <= self.alcance
+            conectadas = int(en_rango.sum())
+            segmentos = np.stack([boats[en_rango], gws[cercano[en_rango]]], axis=1)
+        self.enlaces.set_segments(segmentos)
+        self.enlaces_srv.set_segments(
+            np.stack([gws, np.broadcast_to(srv[0], gws.shape)], axis=1) if len(srv) else [])
+
+        self.pts_boats.set_offsets(boats)
+        self.pts_gws.set_offsets(gws)
+        self.pts_srv.set_offsets(srv[:1])
+        self.pts_boats.set_label(f'Embarcaciones ({len(boats)})')
+        self.pts_gws.set_label(f"{self.estilo['etiqueta_gw']} ({len(gws)})")
+        self.ax.legend(loc='upper right', fontsize=10, framealpha=0.95,
+                       edgecolor=self.estilo['color'], fancybox=True)
+        self.ax.set_title(f"{self.estilo['titulo']}\nTiempo: {tiempo:.0f}s",
+                          fontweight='bold', fontsize=14, pad=15, color=self.estilo['color'])
+
+        cobertura = 100.0 * conectadas / len(boats) if len(boats) else 0.0
+        self.texto.set_text(f'Cobertura: {cobertura:.0f}%\n'
+                            f'Conectadas: {conectadas}/{len(boats)}\n'
+                            f"Topología: {self.estilo['topologia']}\n"
+                            f"P2P: {self.estilo['p2p']}")
+        return tiempo, conectadas, len(boats)
+
+
+# ===== RENDER =====
+
+def renderizar_capturas(trazas, tiempos, prefijo='Captura', dpi=300, alcance=LORA_MAX_RANGE):
+    """
+    trazas: dict arquitectura -> Trazas (1 o 2 entradas, en orden de panel).
+    Guarda una imagen por tiempo y devuelve [(ruta, {arquitectura: (t, conectadas, total)})].
+    """
+    fig, axes = plt.subplots(1, len(trazas), figsize=(9 * len(trazas), 9), squeeze=False)
+    paneles = [PanelArquitectura(ax, tr, ARQUITECTURAS[nombre], alcance)
+               for ax, (nombre, tr) in zip(axes[0], trazas.items())]
+    fig.suptitle('Comparación Geográfica de Arquitecturas LoRaWAN\n'
+                 'Comunicaciones de Emergencia Marítima - cantón Salinas, Ecuador',
+                 fontsize=16, fontweight='bold', y=0.98, color='#2C3E50')
+
+    resultados = []
+    for k, t in enumerate(tiempos):
+        estado = {nombre: panel.actualizar(t) for nombre, panel in zip(trazas, paneles)}
+        if k == 0:
+            plt.tight_layout(rect=[0, 0.03, 1, 0.96])
+        ruta = f'{prefijo}_t{t:g}s.png'
+        fig.savefig(ruta, dpi=dpi, bbox_inches='tight', facecolor='white')
+        resultados.append((ruta, estado))
+    plt.close(fig)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capturas de la red en tiempos arbitrarios")
+    parser.add_argument('--tradicional', help='Posiciones de la arquitectura tradicional (.csv o .trz)')
+    parser.add_argument('--movil', help='Posiciones de la arquitectura móvil (.csv o .trz)')
+    parser.add_argument('--tiempos', type=float, nargs='+', required=True, help='Tiempos (s)')
+    parser.add_argument('--prefijo', default='Captura', help='Prefijo de los archivos PNG')
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--alcance', type=float, default=LORA_MAX_RANGE)
+    args = parser.parse_args()
+
+    rutas = {'tradicional': args.tradicional, 'movil': args.movil}
+    rutas = {nombre: r for nombre, r in rutas.items() if r}
+    if not rutas:
+        parser.error('se necesita --tradicional y/o --movil')
+
+    inicio = time.perf_counter()
+    trazas = {nombre: cargar_ventanas(r, args.tiempos) for nombre, r in rutas.items()}
+    carga = time.perf_counter() - inicio
+    resultados = renderizar_capturas(trazas, args.tiempos, args.prefijo, args.dpi, args.alcance)
+
+    for ruta, estado in resultados:
+        resumen = ' | '.join(f'{nombre}: t={t:g}s {c}/{n}' for nombre, (t, c, n) in estado.items())
+        print(f"✓ {ruta}  ({resumen})")
+    print(f"✓ {len(resultados)} capturas en {time.perf_counter() - inicio:.1f} s "
+          f"(carga {carga:.2f} s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cobertura de Área por Frame (Unión de Discos)
+CalculateCoverage mide la fracción de embarcaciones en rango; aquí se mide
+qué parte de los 375 km² de mar (25 × 15 km) queda dentro del alcance de al
+menos un gateway, en cada frame de la traza de posiciones.
+
+El área de la unión de discos recortada al rectángulo se integra por franjas
+horizontales: en cada franja cada disco cubre un intervalo en x y la unión
+de intervalos se mide exactamente (orden por inicio + máximo acumulado de
+los finales). Todo va vectorizado sobre frames × franjas × gateways, por
+bloques de frames para acotar la memoria.
+
+El resultado se escribe junto al CSV de cobertura existente:
+    posiciones_tradicional_3gw.csv -> cobertura_area_tradicional_3gw.csv
+
+Uso:
+    python3 cobertura_area.py posiciones_tradicional_3gw.csv positions_salinas_movil_3gw.csv
+    python3 cobertura_area.py positions_mobile.csv --alcance 15000 --franjas 1200
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from radio_lora import LORA_MAX_RANGE
+from trazas import cargar_trazas
+
+AREA = (25000.0, 15000.0)
+
+
+# ===== UNIÓN DE DISCOS =====
+
+def area_cubierta(centros, alcance=LORA_MAX_RANGE, area=AREA, franjas=600, bloque=128):
+    """
+    Área (m²) de la unión de discos de radio `alcance` dentro de
+    [0, ancho] × [0, alto], por frame. centros: (frames, gateways, 2) con NaN
+    para gateways ausentes. Exacta en x; en y regla del punto medio con
+    `franjas` franjas.
+    """
+    centros = np.asarray(centros, dtype=float)
+    ancho, alto = area
+    dy = alto / franjas
+    y = (np.arange(franjas) + 0.5) * dy
+    resultado = np.zeros(len(centros))
+
+    for i in range(0, len(centros), bloque):
+        c = centros[i:i + bloque]
+        cx = c[:, None, :, 0]
+        cy = c[:, None, :, 1]
+        h2 = alcance ** 2 - (y[None, :, None] - cy) ** 2           # (frames, franjas, gateways)
+        corta = h2 > 0                                             # False también para NaN
+        media = np.sqrt(np.where(corta, h2, 0.0))
+        inicio = np.where(corta, np.clip(cx - media, 0.0, ancho), 0.0)
+        fin = np.where(corta, np.clip(cx + media, 0.0, ancho), 0.0)
+
+        orden = np.argsort(inicio, axis=2)
+        inicio = np.take_along_axis(inicio, orden, axis=2)
+        fin = np.take_along_axis(fin, orden, axis=2)
+        # Parte nueva de cada intervalo = lo que excede al máximo final de los anteriores
+        previo = np.maximum.accumulate(fin, axis=2)
+        previo = np.concatenate([np.zeros_like(previo[:, :, :1]), previo[:, :, :-1]], axis=2)
+        nuevo = np.clip(fin - np.maximum(inicio, previo), 0.0, None)
+        resultado[i:i + bloque] = nuevo.sum(axis=(1, 2)) * dy
+
+    return resultado
+
+
+def serie_cobertura_area(trazas, alcance=LORA_MAX_RANGE, area=AREA, franjas=600):
+    """DataFrame time, gateways, area_km2, area_percent para los gateways de unas Trazas"""
+    gws = trazas.seleccionar('gateway')
+    cubierta = area_cubierta(gws.xy, alcance, area, franjas)
+    total = area[0] * area[1]
+    return pd.DataFrame({
+        'time': gws.tiempos,
+        'gateways': (~np.isnan(gws.xy[:, :, 0])).sum(axis=1),
+        'area_km2': np.round(cubierta / 1e6, 4),
+        'area_percent': np.round(100.0 * cubierta / total, 3),
+    })
+
+
+def ruta_salida(ruta_posiciones):
+    """positions_X.csv / posiciones_X.csv -> cobertura_area_X.csv en la misma carpeta"""
+    ruta = Path(ruta_posiciones)
+    nombre = ruta.stem
+    for prefijo in ('positions_', 'posiciones_'):
+        if nombre.startswith(prefijo):
+            nombre = nombre[len(prefijo):]
+            break
+    return ruta.with_name(f'cobertura_area_{nombre}.csv')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cobertura de área por frame (unión de discos)")
+    parser.add_argument('posiciones', nargs='+', help='CSV de LogPositions (uno por arquitectura)')
+    parser.add_argument('--alcance', type=float, default=LORA_MAX_RANGE, help='Radio de cobertura (m)')
+    parser.add_argument('--franjas', type=int, default=600,
+                        help='Franjas horizontales de integración (600 = 25 m)')
+    parser.add_argument('--salida', help='CSV de salida (solo con un archivo de posiciones)')
+    args = parser.parse_args()
+    if args.salida and len(args.posiciones) > 1:
+        parser.error('--salida solo se admite con un archivo de posiciones')
+
+    print("=" * 80)
+    print("COBERTURA DE ÁREA - UNIÓN DE DISCOS DE GATEWAYS")
+    print("=" * 80)
+    print(f"Área de estudio: {AREA[0] / 1000:g} × {AREA[1] / 1000:g} km "
+          f"({AREA[0] * AREA[1] / 1e6:g} km²) | Alcance: {args.alcance / 1000:g} km")
+
+    for ruta in args.posiciones:
+        try:
+            trazas = cargar_trazas(ruta)
+        except FileNotFoundError:
+            print(f"❌ No se encontró {ruta}")
+            continue
+        inicio = time.perf_counter()
+        serie = serie_cobertura_area(trazas, args.alcance, AREA, args.franjas)
+        duracion = time.perf_counter() - inicio
+        destino = Path(args.salida) if args.salida else ruta_salida(ruta)
+        serie.to_csv(destino, index=False)
+
+        print(f"\n✓ {ruta}: {len(serie)} frames en {duracion:.2f} s")
+        if len(serie):
+            pct = serie['area_percent']
+            print(f"  Área cubierta: media {pct.mean():.1f}% | mín {pct.min():.1f}% | "
+                  f"máx {pct.max():.1f}% | 100% en {(pct >= 99.999).mean() * 100:.0f}% del tiempo")
+        print(f"✓ Serie guardada: {destino}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cobertura Probabilística con Sombreado Log-normal (Monte Carlo)
+CalculateCoverage y las animaciones cortan en dist <= 15000 m, así que las
+pérdidas climáticas del Escenario 1 (0/5/10 dB) no cambian la cobertura. Aquí
+el enlace embarcación-gateway se decide por potencia:
+
+    RSSI = txPower - (7.7 + weatherLoss + 10·n·log10(d)) + X,   X ~ N(0, σ)
+    enlace si RSSI >= sensibilidad(SF) + margen en algún gateway
+
+Cada realización sortea X para todos los pares embarcación × gateway de cada
+frame. Las realizaciones se procesan juntas en arreglos
+(frames, realizaciones, embarcaciones, gateways) por bloques de frames que
+caben en --memoria MB. Resultado: probabilidad de enlace por embarcación y
+cobertura esperada por frame con su banda P5-P95 entre realizaciones, junto
+a la cobertura con corte de 15 km y la analítica 1 - Π(1 - p_g) como control.
+
+El sombreado es independiente entre frames, gateways y embarcaciones.
+
+Exponente: por defecto n = 3.3 (EXPONENTE_AGUA), no el 2.0 del .cc móvil.
+Con n = 2 el RSSI a 15 km queda unos 53 dB sobre la sensibilidad de SF7
+(~6.6σ con σ = 8 dB): todo enlace cierra en toda realización, incluso más
+allá de 15 km, y la cobertura es 100% sea cual sea el corte. --exponente 2
+reproduce el .cc; si todas las holguras superan 5σ se avisa.
+
+Uso:
+    python3 cobertura_probabilistica.py posiciones_tradicional_3gw.csv --sigma 8
+    python3 cobertura_probabilistica.py positions_mobile.csv --weather-loss 0 5 10 --realizaciones 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+from radio_lora import LORA_MAX_RANGE, TX_POWER_DBM, rssi, sensibilidad
+from trazas import cargar_trazas
+
+SIGMA_DB = 8.0
+EXPONENTE_AGUA = 3.3        # exponente log-distancia por defecto (ver arriba)
+HOLGURA_SIGMAS = 5.0        # holgura mínima (en σ) desde la que el sombreado no influye
+REALIZACIONES = 200
+MEMORIA_MB = 128
+
+
+def rssi_medio(boats_xy, gws_xy, tx_power=TX_POWER_DBM, exponente=EXPONENTE_AGUA, weather_loss=0.0):
+    """RSSI sin sombreado por (frame, embarcación, gateway) y la distancia"""
+    d = np.hypot(boats_xy[:, :, None, 0] - gws_xy[:, None, :, 0],
+                 boats_xy[:, :, None, 1] - gws_xy[:, None, :, 1])
+    return rssi(d, tx_power, exponente, weather_loss), d
+
+
+def monte_carlo(boats_xy, gws_xy, realizaciones=REALIZACIONES, sigma=SIGMA_DB, sf=7, margen=0.0,
+                tx_power=TX_POWER_DBM, exponente=EXPONENTE_AGUA, weather_loss=0.0, semilla=0,
+                memoria_mb=MEMORIA_MB):
+    """
+    Enlaces por realización. Devuelve:
+      prob_enlace (frames, embarcaciones): fracción de realizaciones con enlace
+      cobertura (frames, realizaciones): % de embarcaciones presentes con enlace
+    """
+    rng = np.random.default_rng(semilla)
+    frames, n_boats = boats_xy.shape[:2]
+    n_gws = gws_xy.shape[1]
+    umbral = float(sensibilidad(sf)) + margen
+    presentes = ~np.isnan(boats_xy[:, :, 0])
+    n_presentes = np.maximum(presentes.sum(axis=1), 1)
+
+    prob_enlace = np.zeros((frames, n_boats))
+    cobertura = np.zeros((frames, realizaciones))
+    por_frame = realizaciones * n_boats * max(n_gws, 1) * 5          # float32 + bool de la comparación
+    bloque = max(1, int(memoria_mb * 2 ** 20 // por_frame))
+    for i in range(0, frames, bloque):
+        medio, _ = rssi_medio(boats_xy[i:i + bloque], gws_xy[i:i + bloque], tx_power, exponente,
+                              weather_loss)
+        # Margen sin sombreado; NaN (nodo ausente) nunca enlaza
+        holgura = np.nan_to_num((medio - umbral).astype(np.float32), nan=-np.inf)
+        f = len(holgura)
+        sombra = rng.standard_normal((f, realizaciones, n_boats, n_gws), dtype=np.float32)
+        sombra *= sigma
+        sombra += holgura[:, None]                                       # en sitio: sin otro temporal
+        enlace = (sombra >= 0).any(axis=3)                               # (f, R, B)
+        prob_enlace[i:i + f] = enlace.mean(axis=1)
+        cobertura[i:i + f] = 100.0 * enlace.sum(axis=2) / n_presentes[i:i + f, None]
+    return prob_enlace, cobertura
+
+
+def cobertura_analitica(boats_xy, gws_xy, sigma=SIGMA_DB, sf=7, margen=0.0, tx_power=TX_POWER_DBM,
+                        exponente=EXPONENTE_AGUA, weather_loss=0.0):
+    """Probabilidad exacta de enlace por (frame, embarcación): 1 - Π_g (1 - p_g)"""
+    medio, _ = rssi_medio(boats_xy, gws_xy, tx_power, exponente, weather_loss)
+    holgura = medio - (float(sensibilidad(sf)) + margen)
+    p = np.where(np.isnan(holgura), 0.0, ndtr(np.nan_to_num(holgura) / sigma))
+    return 1.0 - np.prod(1.0 - p, axis=2)
+
+
+def holgura_minima(boats_xy, gws_xy, sf=7, margen=0.0, tx_power=TX_POWER_DBM,
+                   exponente=EXPONENTE_AGUA, weather_loss=0.0):
+    """Menor holgura sin sombreado (dB) al mejor gateway entre embarcaciones presentes"""
+    medio, _ = rssi_medio(boats_xy, gws_xy, tx_power, exponente, weather_loss)
+    mejor = np.max(medio, axis=2, initial=-np.inf) - (float(sensibilidad(sf)) + margen)
+    mejor = mejor[~np.isnan(boats_xy[:, :, 0])]
+    return float(mejor.min()) if mejor.size else np.inf
+
+
+def cobertura_corte(boats_xy, gws_xy, alcance=LORA_MAX_RANGE):
+    """% de embarcaciones con algún gateway a <= alcance (criterio de CalculateCoverage)"""
+    _, d = rssi_medio(boats_xy, gws_xy)
+    presentes = ~np.isnan(boats_xy[:, :, 0])
+    en_rango = (d <= alcance).any(axis=2)
+    return 100.0 * en_rango.sum(axis=1) / np.maximum(presentes.sum(axis=1), 1)
+
+
+def serie_cobertura(trazas, weather_loss=0.0, **kwargs):
+    """DataFrame por frame y probabilidad de enlace por embarcación"""
+    boats = trazas.seleccionar('boat')
+    gws = trazas.seleccionar('gateway')
+    prob, cobertura = monte_carlo(boats.xy, gws.xy, weather_loss=weather_loss, **kwargs)
+    analitica_kw = {k: kwargs[k] for k in ('sigma', 'sf', 'margen', 'tx_power', 'exponente')
+                    if k in kwargs}
+    exacta = cobertura_analitica(boats.xy, gws.xy, weather_loss=weather_loss, **analitica_kw)
+    presentes = ~np.isnan(boats.xy[:, :, 0])
+    n_presentes = np.maximum(presentes.sum(axis=1), 1)
+    serie = pd.DataFrame({
+        'time': boats.tiempos,
+        'weather_loss': weather_loss,
+        'cobertura_esperada': np.round(cobertura.mean(axis=1), 3),
+        'cobertura_p5': np.round(np.percentile(cobertura, 5, axis=1), 3),
+        'cobertura_p95': np.round(np.percentile(cobertura, 95, axis=1), 3),
+        'cobertura_analitica': np.round(100.0 * (exacta * presentes).sum(axis=1) / n_presentes, 3),
+        'cobertura_15km': np.round(cobertura_corte(boats.xy, gws.xy), 3),
+    })
+    with np.errstate(invalid='ignore'):
+        media = np.where(presentes, prob, 0.0).sum(axis=0) / presentes.sum(axis=0)
+    embarcaciones = pd.DataFrame({'node_id': boats.ids, 'weather_loss': weather_loss,
+                                  'prob_enlace': np.round(media, 4)})
+    return serie, embarcaciones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cobertura con sombreado log-normal (Monte Carlo)")
+    parser.add_argument('posiciones', help='CSV de LogPositions (time,node_id,x,y,type)')
+    parser.add_argument('--realizaciones', type=int, default=REALIZACIONES)
+    parser.add_argument('--sigma', type=float, default=SIGMA_DB, help='Desvío del sombreado (dB)')
+    parser.add_argument('--sf', type=int, default=7, choices=range(7, 13))
+    parser.add_argument('--margen', type=float, default=0.0, help='Margen sobre la sensibilidad (dB)')
+    parser.add_argument('--tx-power', type=float, default=TX_POWER_DBM)
+    parser.add_argument('--exponente', type=float, default=EXPONENTE_AGUA,
+                        help='Exponente log-distancia (3.3 por defecto; el .cc móvil usa 2.0)')
+    parser.add_argument('--weather-loss', type=float, nargs='+', default=[0.0],
+                        help='Pérdidas climáticas (dB); varias = barrido del Escenario 1')
+    parser.add_argument('--memoria', type=float, default=MEMORIA_MB, help='MB por bloque de frames')
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', default='cobertura_probabilistica.csv')
+    parser.add_argument('--embarcaciones', help='CSV node_id,weather_loss,prob_enlace')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("COBERTURA PROBABILÍSTICA - SOMBREADO LOG-NORMAL (MONTE CARLO)")
+    print("=" * 80)
+    try:
+        trazas = cargar_trazas(args.posiciones)
+    except FileNotFoundError:
+        print(f"❌ No se encontró {args.posiciones}")
+        return
+    boats = trazas.seleccionar('boat')
+    print(f"σ = {args.sigma:g} dB | n = {args.exponente:g} | SF{args.sf} "
+          f"(sensibilidad {float(sensibilidad(args.sf)):g} dBm, margen {args.margen:g} dB) | "
+          f"{args.realizaciones} realizaciones × {len(boats)} frames × {len(boats.ids)} embarcaciones")
+    if args.exponente <= 2.0:
+        a_15km = float(rssi(LORA_MAX_RANGE, args.tx_power, args.exponente)) - float(sensibilidad(args.sf))
+        print(f"⚠️  Con n = {args.exponente:g} (el del .cc) la holgura a 15 km es {a_15km:.1f} dB: "
+              f"todo enlace cierra, incluso más allá de 15 km, y la cobertura es 100% "
+              f"sea cual sea el corte")
+    gws = trazas.seleccionar('gateway')
+
+    series, probabilidades = [], []
+    for i, weather_loss in enumerate(args.weather_loss):
+        inicio = time.perf_counter()
+        serie, embarcaciones = serie_cobertura(
+            trazas, weather_loss, realizaciones=args.realizaciones, sigma=args.sigma, sf=args.sf,
+            margen=args.margen, tx_power=args.tx_power, exponente=args.exponente,
+            semilla=args.semilla + i, memoria_mb=args.memoria)
+        duracion = time.perf_counter() - inicio
+        series.append(serie)
+        probabilidades.append(embarcaciones)
+
+        print(f"\n✓ weatherLoss {weather_loss:g} dB en {duracion:.2f} s")
+        print(f"  Cobertura esperada: {serie['cobertura_esperada'].mean():.2f}% "
+              f"(P5 {serie['cobertura_p5'].mean():.2f}% - P95 {serie['cobertura_p95'].mean():.2f}%)")
+        print(f"  Analítica:          {serie['cobertura_analitica'].mean():.2f}%")
+        print(f"  Corte 15 km:        {serie['cobertura_15km'].mean():.2f}%")
+        holgura = holgura_minima(boats.xy, gws.xy, args.sf, args.margen, args.tx_power,
+                                 args.exponente, weather_loss)
+        if holgura > HOLGURA_SIGMAS * args.sigma:
+            print(f"  ⚠️  Holgura mínima {holgura:.1f} dB > {HOLGURA_SIGMAS:g}σ: todos los enlaces "
+                  f"cierran y el sombreado no cambia la cobertura (revise --exponente)")
+        peores = embarcaciones.nsmallest(3, 'prob_enlace')
+        print("  Menor probabilidad de enlace: " + ", ".join(
+            f"nodo {f.node_id} ({100 * f.prob_enlace:.1f}%)" for f in peores.itertuples()))
+
+    pd.concat(series, ignore_index=True).to_csv(args.salida, index=False)
+    print(f"\n✓ Serie guardada: {args.salida}")
+    if args.embarcaciones:
+        pd.concat(probabilidades, ignore_index=True).to_csv(args.embarcaciones, index=False)
+        print(f"✓ Probabilidad por embarcación guardada: {args.embarcaciones}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Discos de Cobertura como una sola Colección
+Los círculos de alcance de los gateways se dibujan con una EllipseCollection
+creada una vez por eje: en cada frame solo se actualizan los centros desde
+el arreglo de posiciones, en lugar de crear un Circle por gateway y frame.
+El trazo es el mismo que el de los Circle (mismo círculo unitario, relleno,
+borde discontinuo y transparencia).
+
+Uso:
+    discos = DiscosCobertura(ax, **COBERTURA['movil'], alpha=0.10)
+    ...
+    discos.actualizar(gateways[['x', 'y']].to_numpy())
+"""
+
+import numpy as np
+from matplotlib.collections import EllipseCollection
+
+from radio_lora import LORA_MAX_RANGE
+
+# Alcance (m) y color de cobertura por arquitectura
+COBERTURA = {
+    'tradicional': {'alcance': LORA_MAX_RANGE, 'color': '#E74C3C'},
+    'movil': {'alcance': LORA_MAX_RANGE, 'color': '#27AE60'},
+}
+
+
+class DiscosCobertura:
+    """Discos de radio `alcance` centrados en los gateways de un eje"""
+
+    def __init__(self, ax, alcance=LORA_MAX_RANGE, color='#27AE60', alpha=0.10, relleno=True,
+                 linewidth=2, linestyle='--', zorder=1):
+        self.ax = ax
+        self.alcance = alcance
+        self.coleccion = EllipseCollection(
+            2 * alcance, 2 * alcance, 0, units='xy',
+            offsets=np.empty((0, 2)), offset_transform=ax.transData,
+            facecolors=color if relleno else 'none', edgecolors=color, alpha=alpha,
+            linewidths=linewidth, linestyles=linestyle, zorder=zorder)
+        ax.add_collection(self.coleccion, autolim=False)
+
+    def actualizar(self, centros):
+        """Mueve los discos a `centros` (N, 2); N puede cambiar entre frames"""
+        centros = np.asarray(centros, dtype=float).reshape(-1, 2)
+        self.coleccion.set_offsets(centros)
+        return self.coleccion
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estelas de Trayectoria con Buffer Circular
+Guarda las últimas posiciones de cada nodo y las dibuja como una sola colección
+"""
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+
+class EstelaTrayectorias:
+    """
+    Buffer circular (longitud × nodos × 2) con las posiciones recientes.
+
+    actualizar() cuesta O(nodos) por frame y dibujar() genera una única
+    LineCollection con todos los segmentos, con alfa creciente hacia la
+    posición más reciente si `desvanecer` está activo.
+    """
+
+    def __init__(self, ids_nodos, longitud=6, color='#27AE60', alpha=0.3,
+                 alpha_min=0.05, desvanecer=True, linewidth=1.5, linestyle=':',
+                 zorder=3):
+        if longitud < 2:
+            raise ValueError("La estela necesita al menos 2 posiciones")
+        self.ids = np.unique(np.asarray(ids_nodos))
+        self.longitud = longitud
+        self.color = color
+        self.alpha = alpha
+        self.alpha_min = alpha_min if desvanecer else alpha
+        self.linewidth = linewidth
+        self.linestyle = linestyle
+        self.zorder = zorder
+
+        self._buffer = np.full((longitud, len(self.ids), 2), np.nan)
+        self._cabeza = 0   # próxima ranura a escribir
+        self._llenos = 0
+
+    def reiniciar(self):
+        """Vacía el buffer (p. ej. antes de saltar a un frame no consecutivo)"""
+        self._buffer.fill(np.nan)
+        self._cabeza = 0
+        self._llenos = 0
+
+    def actualizar(self, ids, xy):
+        """Agrega las posiciones de un frame; los nodos ausentes quedan como hueco"""
+        ids = np.asarray(ids)
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        filas = np.searchsorted(self.ids, ids)
+        filas = np.clip(filas, 0, len(self.ids) - 1)
+        conocidos = self.ids[filas] == ids
+
+        ranura = self._buffer[self._cabeza]
+        ranura.fill(np.nan)
+        ranura[filas[conocidos]] = xy[conocidos]
+
+        self._cabeza = (self._cabeza + 1) % self.longitud
+        self._llenos = min(self._llenos + 1, self.longitud)
+
+    def posiciones(self):
+        """Posiciones almacenadas ordenadas de la más antigua a la más reciente"""
+        orden = (self._cabeza - self._llenos + np.arange(self._llenos)) % self.longitud
+        return self._buffer[orden]
+
+    def segmentos(self):
+        """Segmentos (S, 2, 2) de todas las estelas y la antigüedad de cada uno"""
+        pts = self.posiciones()
+        if len(pts) < 2:
+            return np.empty((0, 2, 2)), np.empty(0, dtype=int)
+        # (llenos-1, nodos, 2 extremos, 2 coordenadas)
+        segs = np.stack([pts[:-1], pts[1:]], axis=2)
+        edad = np.broadcast_to(np.arange(len(pts) - 1)[:, None], segs.shape[:2])
+        validos = ~np.isnan(segs).any(axis=(2, 3))
+        return segs[validos], edad[validos]
+
+    def coleccion(self):
+        """LineCollection con el desvanecimiento aplicado por segmento"""
+        segs, edad = self.segmentos()
+        n_tramos = max(self._llenos - 1, 1)
+        alphas = self.alpha_min + (self.alpha - self.alpha_min) * (edad + 1) / n_tramos
+        colores = np.tile(to_rgba(self.color), (len(segs), 1))
+        colores[:, 3] = alphas
+        return LineCollection(segs, colors=colores, linewidths=self.linewidth,
+                              linestyles=self.linestyle, zorder=self.zorder)
+
+    def dibujar(self, ax):
+        """Agrega la estela al eje como una sola colección"""
+        return ax.add_collection(self.coleccion(), autolim=False)
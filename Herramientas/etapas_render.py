@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Animación por Etapas Solapadas (cálculo → render → codificación)
+guardar_animacion hace, por frame y en un solo núcleo, el cálculo de la
+geometría, el dibujo de matplotlib y la entrega a ffmpeg uno detrás de otro.
+Aquí cada etapa corre por separado, unidas por colas acotadas:
+
+    cálculo (hilo) --cola--> render (principal o pool por fork) --en orden--> codificación (hilo + ffmpeg)
+
+- calcular(i) (topología, relays, interpolación) se adelanta hasta
+  `tam_cola` frames en un hilo; dibujar_frame(i, datos) recibe su resultado.
+- Con procesos > 1 el render se reparte en procesos creados por fork después
+  de dibujar el primer frame: heredan la figura, el fondo ya rasterizado y
+  los datos cargados (sesion_visual), y devuelven el frame RGBA.
+- Los frames llegan al codificador en orden. Hay como mucho 2 × procesos
+  frames en vuelo y `tam_cola` en la cola de ffmpeg: si una etapa se atrasa
+  las anteriores se bloquean (contrapresión) y la memoria no crece con el
+  número de frames.
+
+La carga de las trazas queda antes, una sola vez (sesion_visual). Al terminar
+se informa el tiempo ocupado y la utilización de cada etapa, y cuánto esperó
+el render por datos (cálculo lento) o por el codificador (ffmpeg lento).
+
+Uso:
+    def calcular(i):
+        return topologia.frame(i)
+    def animate(i, red=None):
+        ...
+    animar_por_etapas(fig, animate, n, 'anim.gif', calcular=calcular, procesos=4,
+                      capturar=fondo.capturar)
+"""
+
+import multiprocessing
+import queue
+import resource
+import sys
+import threading
+import time
+from collections import deque
+
+from salida_video import (CodificadorStream, capturar_frame, formato_desde_ruta,
+                          guardar_animacion, ruta_ffmpeg)
+
+# Figura y funciones de dibujo que heredan los procesos de render por fork
+_trabajo = None
+
+
+class EtapaCalculo:
+    """Hilo que calcula los datos de cada frame por adelantado en una cola acotada"""
+
+    def __init__(self, calcular, indices, tam_cola=8):
+        self.calcular = calcular
+        self.cola = queue.Queue(maxsize=tam_cola)
+        self.ocupado = 0.0
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._correr, args=(indices,), daemon=True)
+
+    def iniciar(self):
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+
+    def _poner(self, item):
+        while not self._detener.is_set():
+            try:
+                self.cola.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _correr(self, indices):
+        try:
+            for i in indices:
+                inicio = time.perf_counter()
+                datos = self.calcular(i) if self.calcular is not None else None
+                self.ocupado += time.perf_counter() - inicio
+                if not self._poner((i, datos)):
+                    return
+        except Exception as e:
+            self._poner((None, e))
+            return
+        self._poner((None, None))
+
+    def siguiente(self):
+        """(i, datos) del próximo frame, o None al terminar (re-lanza errores del hilo)"""
+        i, datos = self.cola.get()
+        if i is None:
+            if datos is not None:
+                raise datos
+            return None
+        return i, datos
+
+
+def _renderizar(i, datos):
+    """Dibuja y captura un frame; devuelve (bytes RGBA, segundos)"""
+    fig, dibujar, capturar, con_datos = _trabajo
+    inicio = time.perf_counter()
+    if con_datos:
+        dibujar(i, datos)
+    else:
+        dibujar(i)
+    frame = capturar(fig)
+    return frame, time.perf_counter() - inicio
+
+
+def informe(metricas):
+    """Tabla de utilización por etapa y la etapa que limita"""
+    pared = max(metricas['pared'], 1e-9)
+    procesos = metricas['procesos']
+    etapas = [('cálculo', metricas['calculo'], 1),
+              (f'render (×{procesos})', metricas['render'], procesos),
+              ('codificación', metricas['codificacion'], 1)]
+    print(f"\n  {'Etapa':<14} {'Ocupado':>9} {'Utilización':>12}")
+    for nombre, ocupado, trabajadores in etapas:
+        print(f"  {nombre:<14} {ocupado:>8.2f}s {100 * ocupado / (pared * trabajadores):>11.1f}%")
+    if metricas['paleta'] > 0:
+        print(f"  {'paleta GIF':<14} {metricas['paleta']:>8.2f}s   (tras el último frame)")
+    print(f"  Frames en {pared:.2f} s | espera por datos {metricas['espera_datos']:.2f} s | "
+          f"espera por el codificador {metricas['espera_codificador']:.2f} s | "
+          f"en vuelo máx. {metricas['en_vuelo_max']}")
+    print(f"  RSS pico: principal {metricas['rss_mb']:.0f} MB | mayor proceso hijo "
+          f"{metricas['rss_hijos_mb']:.0f} MB (render por fork y ffmpeg)")
+    cuello = max(etapas, key=lambda e: e[1] / e[2])[0]
+    print(f"  Cuello de botella: {cuello}")
+
+
+def animar_por_etapas(fig, dibujar_frame, n_frames, ruta_salida, fps=5, dpi=100, calcular=None,
+                      procesos=1, tam_cola=8, capturar=capturar_frame, mostrar_informe=True):
+    """
+    Como guardar_animacion, con las etapas solapadas. Si se da `calcular`, el
+    render llama a dibujar_frame(i, calcular(i)). Devuelve las métricas por
+    etapa (None si no hubo frames o si se usó el writer 'pillow').
+    """
+    global _trabajo
+    formato = formato_desde_ruta(ruta_salida)
+    if ruta_ffmpeg() is None or n_frames <= 0:
+        # Sin ffmpeg no hay tubería a la que solapar: camino secuencial de siempre
+        if n_frames > 0:
+            print(f"⚠️  Sin ffmpeg las etapas no se solapan: se ignora procesos={procesos} "
+                  "y no hay informe por etapa")
+        dibujar = dibujar_frame if calcular is None else (lambda i: dibujar_frame(i, calcular(i)))
+        guardar_animacion(fig, dibujar, n_frames, ruta_salida, fps=fps, dpi=dpi,
+                          tam_cola=tam_cola, capturar=capturar)
+        return None
+
+    fig.set_dpi(dpi)
+    procesos = max(1, min(procesos, n_frames - 1)) if n_frames > 1 else 1
+    metricas = {'procesos': procesos, 'calculo': 0.0, 'render': 0.0, 'codificacion': 0.0,
+                'paleta': 0.0, 'espera_datos': 0.0, 'espera_codificador': 0.0, 'en_vuelo_max': 1}
+    inicio = time.perf_counter()
+
+    # Primer frame en el proceso principal: fija el tamaño del video y rasteriza
+    # el fondo antes del fork, así los procesos de render lo heredan hecho
+    t = time.perf_counter()
+    datos = calcular(0) if calcular is not None else None
+    metricas['calculo'] += time.perf_counter() - t
+    _trabajo = (fig, dibujar_frame, capturar, calcular is not None)
+    frame, segundos = _renderizar(0, datos)
+    metricas['render'] += segundos
+    ancho, alto = fig.canvas.get_width_height(physical=True)
+
+    # El fork va antes de crear hilos y el proceso de ffmpeg
+    pool = multiprocessing.get_context('fork').Pool(procesos) if procesos > 1 else None
+    calculo = EtapaCalculo(calcular, range(1, n_frames), tam_cola)
+    codificador = None
+    en_vuelo = deque()
+    entregados = 0
+
+    def entregar(frame):
+        nonlocal entregados
+        t = time.perf_counter()
+        codificador.agregar_frame(frame)   # bloquea con la cola de ffmpeg llena
+        metricas['espera_codificador'] += time.perf_counter() - t
+        entregados += 1
+        if entregados % 50 == 0 or entregados == n_frames:
+            print(f"  Frames codificados: {entregados}/{n_frames}")
+
+    def recibir():
+        frame, segundos = en_vuelo.popleft().get()
+        metricas['render'] += segundos
+        entregar(frame)
+
+    try:
+        codificador = CodificadorStream(ruta_salida, ancho, alto, fps=fps, formato=formato,
+                                        tam_cola=tam_cola)
+        calculo.iniciar()
+        entregar(frame)
+        while True:
+            t = time.perf_counter()
+            siguiente = calculo.siguiente()
+            metricas['espera_datos'] += time.perf_counter() - t
+            if siguiente is None:
+                break
+            if pool is None:
+                frame, segundos = _renderizar(*siguiente)
+                metricas['render'] += segundos
+                entregar(frame)
+                continue
+            en_vuelo.append(pool.apply_async(_renderizar, siguiente))
+            metricas['en_vuelo_max'] = max(metricas['en_vuelo_max'], len(en_vuelo))
+            if len(en_vuelo) >= 2 * procesos:
+                recibir()
+        while en_vuelo:
+            recibir()
+    except BaseException:
+        calculo.detener()
+        if pool is not None:
+            pool.terminate()
+        if codificador is not None:
+            codificador.__exit__(*sys.exc_info())
+        raise
+    finally:
+        _trabajo = None
+
+    if pool is not None:
+        pool.close()
+        pool.join()
+    metricas['calculo'] += calculo.ocupado
+    t = time.perf_counter()
+    codificador.cerrar()
+    metricas['paleta'] = time.perf_counter() - t if formato == 'gif' else 0.0
+    metricas['pared'] = time.perf_counter() - inicio - metricas['paleta']
+    metricas['codificacion'] = codificador.tiempo_escritura
+    metricas['rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    # ru_maxrss de RUSAGE_CHILDREN es el del mayor hijo ya esperado, no la suma
+    metricas['rss_hijos_mb'] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024.0
+    if mostrar_informe:
+        informe(metricas)
+    return metricas
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Capa de Fondo Estática para Animaciones y Capturas
+El color del mar, la costa, la grilla, los ejes, sus rótulos y el banner
+informativo no cambian entre frames. FondoEstatico los rasteriza una sola
+vez por tamaño de figura / DPI / posición de ejes y en cada frame restaura
+ese buffer y dibuja encima solo los artistas dinámicos (círculos, enlaces,
+nodos, título con el tiempo, leyenda y estadísticas).
+
+El raster se guarda también en disco (.cache_fondos/), indexado por la
+clave del script, las dimensiones y los rcParams, así que una nueva
+corrida -o un lote de capturas a 300 dpi- no vuelve a dibujar el decorado.
+
+Uso:
+    fondo = FondoEstatico(fig, clave=Path(__file__).read_bytes())
+    ...dibujar el decorado fijo...
+    fondo.fijar(persistentes=[banner])     # todo lo anterior pasa a ser fondo
+    def animate(i):
+        fondo.limpiar()                    # quita los artistas del frame previo
+        ...dibujar el frame...
+    guardar_animacion(fig, animate, n, ruta, capturar=fondo.capturar)
+    fondo.guardar('captura.png', dpi=300)  # equivalente a bbox_inches='tight'
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+import matplotlib.image as mpimg
+from matplotlib.axes import Axes
+from matplotlib.text import Text
+
+DIRECTORIO_CACHE = '.cache_fondos'
+
+# Axes.draw ubica los títulos con un método interno; si una versión de
+# matplotlib no lo tiene, componer() vuelve a dibujar el fondo en cada frame
+UBICAR_TITULOS = callable(getattr(Axes, '_update_title_position', None))
+
+
+def titulos(ax):
+    """Títulos de `ax` (centro, izquierda, derecha): los Text hijos que no están en ax.texts"""
+    return [a for a in ax.get_children() if isinstance(a, Text) and a not in ax.texts]
+
+
+class FondoEstatico:
+    """Decorado fijo de una figura rasterizado una vez y restaurado en cada frame"""
+
+    def __init__(self, fig, clave=b'', directorio=DIRECTORIO_CACHE):
+        self.fig = fig
+        self.clave = clave if isinstance(clave, bytes) else str(clave).encode()
+        self.directorio = directorio
+        self.persistentes = []
+        self._fondo = None
+        self._raster = None
+        self._firma = None
+        self.rasterizados = 0  # veces que se dibujó el decorado (0 si vino de disco)
+        self._avisado = False
+
+    # ===== ARTISTAS =====
+
+    def fijar(self, persistentes=()):
+        """
+        Todo lo dibujado hasta ahora en la figura pasa a ser fondo. Los
+        `persistentes` (un banner sobre el mapa, los discos de cobertura) se
+        mantienen entre frames pero se redibujan con los dinámicos, por zorder.
+        """
+        self.persistentes = list(persistentes)
+        self._fondo = {ax: set(ax.get_children()) - self._sobre_fondo(ax) for ax in self.fig.axes}
+        self._raster = None
+
+    def _sobre_fondo(self, ax):
+        """Artistas que sobreviven entre frames pero se dibujan sobre el fondo"""
+        # Los bordes (zorder 2.5) tapan a círculos y enlaces, así que van por encima
+        return {*titulos(ax), *ax.spines.values(), *self.persistentes}
+
+    def dinamicos(self, ax):
+        """Artistas de `ax` fuera del fondo, en el orden de dibujo de matplotlib"""
+        fondo = self._fondo.get(ax, set())
+        artistas = [a for a in ax.get_children() if a not in fondo and a is not ax.patch]
+        return sorted(artistas, key=lambda a: a.get_zorder())
+
+    def limpiar(self):
+        """Quita los artistas dinámicos del frame anterior (reemplaza a ax.clear())"""
+        for ax in self.fig.axes:
+            quedan = self._sobre_fondo(ax)
+            for artista in self.dinamicos(ax):
+                if artista not in quedan:
+                    artista.remove()
+
+    # ===== RASTER =====
+
+    def _firma_actual(self):
+        ancho, alto = self.fig.canvas.get_width_height(physical=True)
+        posiciones = tuple(tuple(np.round(ax.get_position().bounds, 6)) for ax in self.fig.axes)
+        return (ancho, alto, float(self.fig.dpi), posiciones)
+
+    def _ruta_cache(self, firma):
+        h = hashlib.sha256(self.clave)
+        h.update(repr(firma).encode())
+        # Qué artistas forman el fondo (y cómo los separa este módulo)
+        h.update(Path(__file__).read_bytes())
+        for ax in self.fig.axes:
+            h.update(repr(sorted((type(a).__name__, a.get_zorder(), str(a.get_label()))
+                                 for a in self._fondo[ax])).encode())
+        h.update(matplotlib.__version__.encode())
+        h.update(repr(sorted((k, str(v)) for k, v in matplotlib.rcParams.items())).encode())
+        return Path(self.directorio) / f'{h.hexdigest()[:24]}.npy'
+
+    def _rasterizar(self, firma):
+        """Raster del fondo: desde disco si existe, si no dibujando solo el decorado"""
+        ancho, alto = firma[:2]
+        ruta = self._ruta_cache(firma) if self.directorio else None
+        if ruta is not None and ruta.exists():
+            try:
+                raster = np.load(ruta)
+                if raster.shape == (alto, ancho, 4):
+                    self._raster = raster
+                    # El renderer debe existir (y con este tamaño) antes de escribir en él
+                    self.fig.canvas.get_renderer()
+                    return
+            except (OSError, ValueError):
+                pass
+
+        self._dibujar_fondo()
+        self._raster = np.array(self.fig.canvas.buffer_rgba())
+        self.rasterizados += 1
+
+        if ruta is not None:
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            temporal = ruta.with_name(f'{ruta.stem}.{os.getpid()}.tmp.npy')
+            np.save(temporal, self._raster)
+            os.replace(temporal, ruta)
+
+    def _dibujar_fondo(self):
+        """
+        Dibujo completo sin los artistas dinámicos. Los títulos no se ocultan
+        sino que quedan transparentes: así Axes.draw los ubica (un título
+        oculto no tiene extensión y se desplaza) sin dejarlos en el fondo.
+        """
+        textos = {t for ax in self.fig.axes for t in titulos(ax)}
+        ocultos = [a for ax in self.fig.axes for a in self.dinamicos(ax)
+                   if a.get_visible() and a not in textos]
+        alfas = [(t, t.get_alpha()) for t in textos]
+        for a in ocultos:
+            a.set_visible(False)
+        for t, _ in alfas:
+            t.set_alpha(0)
+        try:
+            self.fig.canvas.draw()
+        finally:
+            for a in ocultos:
+                a.set_visible(True)
+            for t, alfa in alfas:
+                t.set_alpha(alfa)
+
+    def componer(self):
+        """Restaura el fondo en el canvas y dibuja encima los artistas dinámicos"""
+        if self._fondo is None:
+            self.fijar()
+        canvas = self.fig.canvas
+        if UBICAR_TITULOS:
+            firma = self._firma_actual()
+            if self._raster is None or firma != self._firma:
+                self._rasterizar(firma)
+                self._firma = firma
+            np.copyto(np.asarray(canvas.buffer_rgba()), self._raster)
+        else:
+            if not self._avisado:
+                print(f"⚠️  matplotlib {matplotlib.__version__}: el fondo se redibuja en cada frame "
+                      f"(sin Axes._update_title_position)")
+                self._avisado = True
+            self._dibujar_fondo()
+        renderer = canvas.get_renderer()
+        for ax in self.fig.axes:
+            if UBICAR_TITULOS:
+                # Axes.draw ubica el título; aquí no se llama, así que se hace a mano
+                ax._update_title_position(renderer)
+            for artista in self.dinamicos(ax):
+                if artista.get_visible():
+                    ax.draw_artist(artista)
+        return canvas
+
+    def capturar(self, fig=None):
+        """Frame RGBA como bytes (reemplazo de salida_video.capturar_frame)"""
+        return bytes(self.componer().buffer_rgba())
+
+    def guardar(self, ruta, dpi=None, pad=0.1):
+        """PNG recortado como savefig(bbox_inches='tight', pad_inches=pad)"""
+        if dpi is not None and dpi != self.fig.dpi:
+            self.fig.set_dpi(dpi)
+        canvas = self.componer()
+        imagen = np.asarray(canvas.buffer_rgba())
+        caja = self.fig.get_tightbbox(canvas.get_renderer()).padded(pad)
+        escala = self.fig.dpi
+        alto = imagen.shape[0]
+        x0 = max(int(round(caja.x0 * escala)), 0)
+        x1 = min(int(round(caja.x1 * escala)), imagen.shape[1])
+        y0 = max(int(round(alto - caja.y1 * escala)), 0)
+        y1 = min(int(round(alto - caja.y0 * escala)), alto)
+        mpimg.imsave(ruta, imagen[y0:y1, x0:x1], dpi=self.fig.dpi)
+        return ruta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Caché en disco de los fondos de animación")
+    parser.add_argument('--directorio', default=DIRECTORIO_CACHE)
+    parser.add_argument('--limpiar', action='store_true', help='Borrar la caché')
+    args = parser.parse_args()
+
+    directorio = Path(args.directorio)
+    archivos = sorted(directorio.glob('*.npy')) if directorio.exists() else []
+    total = sum(a.stat().st_size for a in archivos)
+    print(f"✓ {len(archivos)} fondos en caché ({total / 1e6:.1f} MB) en {directorio}")
+    if args.limpiar and directorio.exists():
+        shutil.rmtree(directorio)
+        print("✓ Caché eliminada")
+
+
+if __name__ == '__main__':
+    main()
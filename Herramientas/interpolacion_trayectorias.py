@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interpolación de Trayectorias para Animaciones a cualquier fps
+LogPositions registra cada 5 s; para animar en cámara lenta o a tiempo real
+escalado se necesitan posiciones entre registros. Todos los nodos se
+interpolan a la vez como arreglos (lineal por tramos, o spline cúbica /
+PCHIP para movimiento suave) y las posiciones se recortan al área simulada.
+
+Los frames se calculan por bloques bajo demanda (LectorFrames): a miles de
+frames la memoria queda acotada por el tamaño de bloque, no por la duración.
+
+Uso:
+    trayectorias = TrayectoriasInterpoladas(cargar_trazas('positions_mobile.csv'), 'pchip')
+    tiempos = trayectorias.tiempos_animacion(fps=30, escala=10)   # 10 s simulados por s de video
+    lector = trayectorias.lector(tiempos)
+    xy = lector[k]      # (nodos, 2) en tiempos[k]
+
+    python3 interpolacion_trayectorias.py positions_mobile.csv --fps 30 --escala 10 --metodo pchip
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from trazas import cargar_trazas
+
+AREA = ((0.0, 25000.0), (0.0, 15000.0))
+METODOS = ('lineal', 'spline', 'pchip')
+
+
+class TrayectoriasInterpoladas:
+    """Interpolador de todos los nodos de unas Trazas"""
+
+    def __init__(self, trazas, metodo='lineal', limites=AREA):
+        if metodo not in METODOS:
+            raise ValueError(f"Método desconocido: {metodo}")
+        self.trazas = trazas
+        self.metodo = metodo
+        self.limites = limites
+        self.presentes = ~np.isnan(trazas.xy[:, :, 0])
+        # Límites por nodo: el área, ampliada a lo registrado (p. ej. el servidor en tierra)
+        with np.errstate(invalid='ignore'):
+            registrado_min = np.nan_to_num(np.nanmin(trazas.xy, axis=0), nan=np.inf)
+            registrado_max = np.nan_to_num(np.nanmax(trazas.xy, axis=0), nan=-np.inf)
+        area = np.array(limites, dtype=float)
+        self._minimo = np.minimum(area[:, 0], registrado_min)
+        self._maximo = np.maximum(area[:, 1], registrado_max)
+        self._curva = None
+        if metodo != 'lineal' and len(trazas) > 2:
+            from scipy.interpolate import CubicSpline, PchipInterpolator
+            # Huecos rellenados linealmente para que la curva sea continua por nodo
+            lleno = trazas.remuestrear(trazas.tiempos, 'lineal').xy
+            lleno = np.nan_to_num(lleno).reshape(len(trazas), -1)
+            clase = CubicSpline if metodo == 'spline' else PchipInterpolator
+            self._curva = clase(trazas.tiempos, lleno, axis=0)
+
+    @property
+    def ids(self):
+        return self.trazas.ids
+
+    @property
+    def tipos(self):
+        return self.trazas.tipos
+
+    def tiempos_animacion(self, fps=5, escala=None, t_inicio=None, t_fin=None):
+        """
+        Tiempos simulados de cada frame. `escala` = segundos simulados por
+        segundo de video (por defecto el paso de registro × fps, es decir un
+        frame por registro); escala < paso × fps da cámara lenta.
+        """
+        t0 = self.trazas.tiempos[0] if t_inicio is None else t_inicio
+        t1 = self.trazas.tiempos[-1] if t_fin is None else t_fin
+        if escala is None:
+            escala = self.trazas.paso_tipico() * fps or 1.0
+        paso = escala / fps
+        n = int(np.floor((t1 - t0) / paso + 1e-9)) + 1
+        return np.round(t0 + paso * np.arange(n), 6)
+
+    def evaluar(self, tiempos):
+        """Posiciones (len(tiempos), nodos, 2); NaN donde el nodo no estaba registrado"""
+        tiempos = np.asarray(tiempos, dtype=float)
+        if self._curva is None:
+            xy = self.trazas.remuestrear(tiempos, 'lineal').xy
+        else:
+            t = np.clip(tiempos, self.trazas.tiempos[0], self.trazas.tiempos[-1])
+            xy = self._curva(t).reshape(len(t), -1, 2)
+        # Presencia según el registro más cercano
+        ausentes = ~self.presentes[self.trazas.indices_cercanos(tiempos)]
+        xy[ausentes] = np.nan
+        return np.clip(xy, self._minimo, self._maximo, out=xy)
+
+    def lector(self, tiempos, bloque=256):
+        return LectorFrames(self, tiempos, bloque)
+
+
+class LectorFrames:
+    """Acceso por frame que evalúa bloques de `bloque` frames bajo demanda"""
+
+    def __init__(self, trayectorias, tiempos, bloque=256):
+        self.trayectorias = trayectorias
+        self.tiempos = np.asarray(tiempos, dtype=float)
+        self.bloque = bloque
+        self._inicio = None
+        self._xy = None
+
+    def __len__(self):
+        return len(self.tiempos)
+
+    def __getitem__(self, k):
+        k = int(k) % len(self.tiempos)
+        if self._inicio is None or not self._inicio <= k < self._inicio + len(self._xy):
+            self._inicio = k - k % self.bloque
+            self._xy = self.trayectorias.evaluar(self.tiempos[self._inicio:self._inicio + self.bloque])
+        return self._xy[k - self._inicio]
+
+    def frame(self, k):
+        """(ids, tipos, xy) de los nodos presentes en el frame k"""
+        xy = self[k]
+        validos = ~np.isnan(xy[:, 0])
+        return self.trayectorias.ids[validos], self.trayectorias.tipos[validos], xy[validos]
+
+    def bloques(self):
+        """Recorre la animación como (tiempos, xy) por bloque"""
+        for i in range(0, len(self.tiempos), self.bloque):
+            t = self.tiempos[i:i + self.bloque]
+            yield t, self.trayectorias.evaluar(t)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interpolación de trayectorias por bloques")
+    parser.add_argument('posiciones', help='CSV de LogPositions')
+    parser.add_argument('--fps', type=float, default=30)
+    parser.add_argument('--escala', type=float, help='Segundos simulados por segundo de video')
+    parser.add_argument('--metodo', choices=METODOS, default='lineal')
+    parser.add_argument('--bloque', type=int, default=256)
+    parser.add_argument('--salida', help='Guardar posiciones interpoladas (.npy, memmap)')
+    args = parser.parse_args()
+
+    trazas = cargar_trazas(args.posiciones)
+    trayectorias = TrayectoriasInterpoladas(trazas, args.metodo)
+    tiempos = trayectorias.tiempos_animacion(args.fps, args.escala)
+    lector = trayectorias.lector(tiempos, args.bloque)
+
+    destino = None
+    if args.salida:
+        destino = np.lib.format.open_memmap(args.salida, mode='w+', dtype=np.float64,
+                                            shape=(len(tiempos), len(trazas.ids), 2))
+    inicio = time.perf_counter()
+    i = 0
+    for t, xy in lector.bloques():
+        if destino is not None:
+            destino[i:i + len(t)] = xy
+        i += len(t)
+    duracion = time.perf_counter() - inicio
+    if destino is not None:
+        destino.flush()
+
+    print(f"✓ {len(trazas)} registros -> {len(tiempos)} frames ({args.metodo}) "
+          f"para {len(trazas.ids)} nodos en {duracion:.2f} s")
+    print(f"  Paso: {tiempos[1] - tiempos[0] if len(tiempos) > 1 else 0:g} s simulados por frame")
+    if destino is not None:
+        print(f"✓ Posiciones guardadas: {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
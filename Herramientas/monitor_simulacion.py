@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Monitor en Vivo de Simulaciones
+Sigue los CSV de posiciones y cobertura mientras ns-3 los escribe y
+actualiza las estadísticas de forma incremental (solo líneas nuevas).
+
+Uso (desde ~/ns-3-dev/, en otra terminal o en segundo plano):
+    python3 monitor_simulacion.py --posiciones positions_salinas_movil_3gw.csv \\
+        --cobertura cobertura_salinas_movil_3gw.csv --pid <PID ns3> --abortar
+"""
+
+import argparse
+import os
+import signal
+import sys
+import time
+
+import numpy as np
+
+from radio_lora import LORA_MAX_RANGE, P2P_RANGE
+
+
+class SeguidorCSV:
+    """Lee solo las líneas completas agregadas desde la última lectura"""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.offset = 0
+        self.resto = b''
+        self.encabezado = None
+        self.ultima_actividad = time.monotonic()
+
+    def leer_nuevas(self):
+        """Devuelve las líneas nuevas completas (sin encabezado) como listas de campos"""
+        try:
+            tam = os.path.getsize(self.ruta)
+        except OSError:
+            return []
+        if tam < self.offset:
+            # Archivo truncado o recreado: empezar de nuevo
+            self.offset, self.resto, self.encabezado = 0, b'', None
+        if tam == self.offset:
+            return []
+
+        with open(self.ruta, 'rb') as f:
+            f.seek(self.offset)
+            datos = f.read(tam - self.offset)
+        self.offset += len(datos)
+        self.ultima_actividad = time.monotonic()
+
+        lineas = (self.resto + datos).split(b'\n')
+        self.resto = lineas.pop()  # línea incompleta (o vacía)
+        filas = []
+        for linea in lineas:
+            linea = linea.strip()
+            if not linea:
+                continue
+            campos = linea.decode('utf-8', errors='replace').split(',')
+            if self.encabezado is None:
+                self.encabezado = campos
+                continue
+            filas.append(campos)
+        return filas
+
+
+class EstadisticasCobertura:
+    """Acumula las filas de CalculateCoverage"""
+
+    def __init__(self):
+        self.muestras = 0
+        self.suma_cobertura = 0.0
+        self.min_cobertura = None
+        self.ultima = None
+        self.tiempo = None
+        self.racha_cero = 0
+
+    def agregar(self, filas):
+        for campos in filas:
+            try:
+                t, total, en_rango, pct, prom, dmin, dmax = map(float, campos[:7])
+            except ValueError:
+                continue
+            self.muestras += 1
+            self.suma_cobertura += pct
+            self.min_cobertura = pct if self.min_cobertura is None else min(self.min_cobertura, pct)
+            self.ultima = (t, int(total), int(en_rango), pct, prom)
+            self.tiempo = t
+            self.racha_cero = self.racha_cero + 1 if en_rango == 0 else 0
+
+    @property
+    def promedio(self):
+        return self.suma_cobertura / self.muestras if self.muestras else 0.0
+
+
+class EstadisticasEnlaces:
+    """
+    Estadísticas de enlaces a partir de LogPositions.
+
+    Las filas de un instante se acumulan hasta que aparece un tiempo nuevo;
+    entonces el frame se cierra y se evalúa una sola vez (O(filas nuevas)).
+    """
+
+    def __init__(self, alcance=LORA_MAX_RANGE, alcance_p2p=P2P_RANGE):
+        self.alcance = alcance
+        self.alcance_p2p = alcance_p2p
+        self.frames = 0
+        self.muestras_barcos = 0
+        self.directos = 0
+        self.via_p2p = 0
+        self.sin_cobertura = 0
+        self.ultimo = None
+        self._tiempo = None
+        self._filas = []
+
+    def agregar(self, filas):
+        for campos in filas:
+            try:
+                t = float(campos[0])
+                x, y = float(campos[2]), float(campos[3])
+            except (ValueError, IndexError):
+                continue
+            if self._tiempo is not None and t != self._tiempo:
+                self._cerrar_frame()
+            self._tiempo = t
+            self._filas.append((x, y, campos[4].strip()))
+
+    def _cerrar_frame(self):
+        boats = np.array([(x, y) for x, y, tipo in self._filas if tipo == 'boat']).reshape(-1, 2)
+        gws = np.array([(x, y) for x, y, tipo in self._filas if tipo == 'gateway']).reshape(-1, 2)
+        self._filas = []
+        if len(boats) == 0:
+            return
+
+        if len(gws):
+            d_gw = np.sqrt(((boats[:, None, :] - gws[None, :, :]) ** 2).sum(axis=2)).min(axis=1)
+        else:
+            d_gw = np.full(len(boats), np.inf)
+        directo = d_gw <= self.alcance
+
+        # Relay de un salto: vecino dentro del alcance P2P que sí tiene enlace directo
+        p2p = np.zeros(len(boats), dtype=bool)
+        fuera, dentro = np.flatnonzero(~directo), np.flatnonzero(directo)
+        if len(fuera) and len(dentro):
+            d_b = np.sqrt(((boats[fuera, None, :] - boats[None, dentro, :]) ** 2).sum(axis=2))
+            p2p[fuera] = (d_b < self.alcance_p2p).any(axis=1)
+
+        n = len(boats)
+        self.frames += 1
+        self.muestras_barcos += n
+        self.directos += int(directo.sum())
+        self.via_p2p += int(p2p.sum())
+        self.sin_cobertura += int(n - directo.sum() - p2p.sum())
+        self.ultimo = (self._tiempo, n, len(gws), int(directo.sum()), int(p2p.sum()))
+
+    def cerrar(self):
+        """Cierra el frame pendiente (el último de la traza no tiene un tiempo que lo siga)"""
+        if self._filas:
+            self._cerrar_frame()
+
+    def porcentaje(self, valor):
+        return 100.0 * valor / self.muestras_barcos if self.muestras_barcos else 0.0
+
+
+def diagnosticar(cob, enl, seguidores, args):
+    """Devuelve la lista de condiciones degeneradas detectadas"""
+    alertas = []
+    ahora = time.monotonic()
+    if all(ahora - s.ultima_actividad > args.estancado for s in seguidores):
+        alertas.append(f"sin datos nuevos hace más de {args.estancado:.0f} s (¿simulación estancada?)")
+    if cob.racha_cero >= args.muestras_cero:
+        alertas.append(f"cobertura 0% en {cob.racha_cero} muestras consecutivas")
+    if enl.ultimo is not None and enl.ultimo[2] == 0:
+        alertas.append("no hay gateways en la traza de posiciones")
+    if (cob.muestras >= args.muestras_cero and args.cobertura_min > 0
+            and cob.promedio < args.cobertura_min):
+        alertas.append(f"cobertura promedio {cob.promedio:.1f}% < {args.cobertura_min:.1f}%")
+    return alertas
+
+
+def imprimir_tablero(cob, enl, alertas, sim_time):
+    """Tablero de consola (se redibuja en cada actualización)"""
+    lineas = ["=" * 70, "MONITOR EN VIVO - SIMULACIÓN LoRaWAN", "=" * 70]
+    if cob.ultima is not None:
+        t, total, en_rango, pct, prom = cob.ultima
+        avance = f" ({100 * t / sim_time:.0f}%)" if sim_time else ""
+        lineas += [f"Tiempo simulado: {t:.0f}s{avance}",
+                   f"Cobertura actual: {pct:.1f}% ({en_rango}/{total}) | dist. prom: {prom:.0f} m",
+                   f"Cobertura promedio: {cob.promedio:.2f}% | mínima: {cob.min_cobertura:.1f}% "
+                   f"| muestras: {cob.muestras}"]
+    if enl.ultimo is not None:
+        t, n, g, d, p = enl.ultimo
+        lineas += [f"Frame t={t:.0f}s: {n} embarcaciones, {g} gateways, {d} directas, {p} vía P2P",
+                   f"Acumulado ({enl.frames} frames): directo {enl.porcentaje(enl.directos):.2f}% | "
+                   f"P2P {enl.porcentaje(enl.via_p2p):.2f}% | "
+                   f"sin cobertura {enl.porcentaje(enl.sin_cobertura):.2f}%"]
+    for alerta in alertas:
+        lineas.append(f"⚠️  {alerta}")
+    if sys.stdout.isatty():
+        sys.stdout.write("\033[2J\033[H")
+    print("\n".join(lineas), flush=True)
+
+
+class GraficaEnVivo:
+    """Gráfica ligera de cobertura vs tiempo (opcional, --grafica)"""
+
+    def __init__(self):
+        import matplotlib.pyplot as plt
+        self.plt = plt
+        plt.ion()
+        self.fig, self.ax = plt.subplots(figsize=(9, 4))
+        self.linea, = self.ax.plot([], [], color='#27AE60', linewidth=1.5)
+        self.ax.set_xlabel('Tiempo simulado (s)')
+        self.ax.set_ylabel('Cobertura (%)')
+        self.ax.set_ylim(0, 105)
+        self.ax.grid(True, alpha=0.3, linestyle='--')
+        self.t, self.c = [], []
+
+    def agregar(self, filas):
+        for campos in filas:
+            try:
+                self.t.append(float(campos[0]))
+                self.c.append(float(campos[3]))
+            except (ValueError, IndexError):
+                continue
+        if self.t:
+            self.linea.set_data(self.t, self.c)
+            self.ax.set_xlim(0, max(self.t[-1], 1))
+        self.plt.pause(0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monitor en vivo de posiciones y cobertura")
+    parser.add_argument('--posiciones', default='positions_salinas_movil_3gw.csv')
+    parser.add_argument('--cobertura', default='cobertura_salinas_movil_3gw.csv')
+    parser.add_argument('--intervalo', type=float, default=2.0, help='Segundos entre lecturas')
+    parser.add_argument('--sim-time', type=float, default=3600, help='Duración simulada esperada')
+    parser.add_argument('--alcance-p2p', type=float, default=P2P_RANGE)
+    parser.add_argument('--estancado', type=float, default=120,
+                        help='Segundos sin datos nuevos para considerar la corrida estancada')
+    parser.add_argument('--muestras-cero', type=int, default=12,
+                        help='Muestras consecutivas con cobertura 0%% antes de alertar')
+    parser.add_argument('--cobertura-min', type=float, default=0,
+                        help='Alertar si la cobertura promedio cae bajo este valor')
+    parser.add_argument('--pid', type=int, help='PID de la simulación a detener')
+    parser.add_argument('--abortar', action='store_true',
+                        help='Enviar SIGTERM a --pid y salir con código 2 ante una alerta')
+    parser.add_argument('--grafica', action='store_true', help='Mostrar gráfica en vivo')
+    args = parser.parse_args()
+
+    seg_pos = SeguidorCSV(args.posiciones)
+    seg_cob = SeguidorCSV(args.cobertura)
+    cob = EstadisticasCobertura()
+    enl = EstadisticasEnlaces(alcance_p2p=args.alcance_p2p)
+    grafica = GraficaEnVivo() if args.grafica else None
+
+    try:
+        while True:
+            filas_cob = seg_cob.leer_nuevas()
+            cob.agregar(filas_cob)
+            enl.agregar(seg_pos.leer_nuevas())
+            if grafica is not None:
+                grafica.agregar(filas_cob)
+
+            alertas = diagnosticar(cob, enl, (seg_pos, seg_cob), args)
+            imprimir_tablero(cob, enl, alertas, args.sim_time)
+
+            if alertas and args.abortar:
+                if args.pid:
+                    try:
+                        os.kill(args.pid, signal.SIGTERM)
+                        print(f"❌ Simulación (PID {args.pid}) detenida por el monitor")
+                    except ProcessLookupError:
+                        pass
+                sys.exit(2)
+            fin = None
+            if args.pid and not os.path.exists(f'/proc/{args.pid}'):
+                fin = "✓ La simulación terminó"
+            elif cob.tiempo is not None and cob.tiempo >= args.sim_time - 5:
+                fin = "✓ Simulación completa"
+            if fin is not None:
+                # Últimas líneas escritas y frame final antes del tablero definitivo
+                cob.agregar(seg_cob.leer_nuevas())
+                enl.agregar(seg_pos.leer_nuevas())
+                enl.cerrar()
+                imprimir_tablero(cob, enl, [], args.sim_time)
+                print(fin)
+                break
+            time.sleep(args.intervalo)
+    except KeyboardInterrupt:
+        print("\nMonitor detenido")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Optimizador de Ubicación de Gateways a partir de Trazas
+Busca sitios fijos (o waypoints por ventana de tiempo para gateways móviles)
+que maximizan la cobertura promedio en el tiempo de las embarcaciones
+registradas en positions_*.csv.
+
+Método: grilla de candidatos + selección greedy (k-median) con actualización
+incremental de la distancia al gateway más cercano, seguida de intercambios
+(swap) hasta que ninguna sustitución mejora el puntaje.
+
+Uso:
+    python3 optimizador_gateways.py positions_salinas_movil_3gw.csv --gateways 3
+    python3 optimizador_gateways.py positions_salinas_movil_3gw.csv --ventanas 6 --salida rutas_3gw
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from radio_lora import LORA_MAX_RANGE
+from trazas import cargar_trazas
+
+AREA_X, AREA_Y = 25000.0, 15000.0   # Rectangle(0, 25000, 0, 15000) en los .cc
+ALTURA_GW = 15                      # z de gwInitialPositions
+VELOCIDAD_MAX_GW = 7.7              # m/s, RandomWalk2d de los gateways móviles
+
+SITIOS_ACTUALES = {
+    'tradicional': [(500, 500, 'Puerto Santa Rosa'), (4200, 9500, 'Punta Carnero'),
+                    (3500, 2500, 'La Libertad')],
+    'movil': [(5000, 5000, 'Ruta Norte'), (12000, 7500, 'Ruta Oeste'),
+              (10000, 11000, 'Ruta Suroeste')],
+}
+
+
+def grilla_candidatos(resolucion, ancho=AREA_X, alto=AREA_Y):
+    """Centros candidatos (C, 2) sobre el área de simulación"""
+    xs = np.arange(0, ancho + 1e-9, resolucion)
+    ys = np.arange(0, alto + 1e-9, resolucion)
+    gx, gy = np.meshgrid(xs, ys)
+    return np.column_stack([gx.ravel(), gy.ravel()])
+
+
+class EvaluadorUbicaciones:
+    """
+    Evalúa configuraciones de gateways contra un conjunto de muestras (S, 2).
+
+    La distancia de cada muestra al gateway más cercano (`mejor`) se mantiene
+    entre pasos, así que puntuar "configuración actual + candidato c" para
+    todos los candidatos cuesta un solo mínimo elemento a elemento por bloque.
+    """
+
+    def __init__(self, muestras, candidatos, alcance=LORA_MAX_RANGE,
+                 objetivo='cobertura', bloque=128):
+        self.mx = np.ascontiguousarray(muestras[:, 0], dtype=np.float32)
+        self.my = np.ascontiguousarray(muestras[:, 1], dtype=np.float32)
+        self.candidatos = np.asarray(candidatos, dtype=float)
+        self.alcance = np.float32(alcance)
+        self.objetivo = objetivo
+        self.bloque = bloque
+        self.evaluaciones = 0
+
+    def distancias(self, puntos):
+        """Distancias (P, S) de cada punto a cada muestra"""
+        p = np.asarray(puntos, dtype=np.float32).reshape(-1, 2)
+        return np.sqrt((p[:, 0:1] - self.mx) ** 2 + (p[:, 1:2] - self.my) ** 2)
+
+    def _puntaje(self, mejor):
+        """Puntaje a maximizar para cada fila de `mejor` (B, S)"""
+        distancia_media = mejor.mean(axis=-1, dtype=np.float64)
+        if self.objetivo == 'distancia':
+            return -distancia_media
+        # Cobertura (%) y, a igualdad, menor distancia media
+        cobertura = 100.0 * (mejor <= self.alcance).mean(axis=-1)
+        return cobertura - 1e-9 * distancia_media
+
+    def puntaje(self, sitios):
+        """Puntaje de una configuración concreta de sitios"""
+        self.evaluaciones += 1
+        return float(self._puntaje(self.distancias(sitios).min(axis=0)))
+
+    def metricas(self, sitios):
+        """Cobertura (%) y distancia media/máxima al gateway más cercano"""
+        mejor = self.distancias(sitios).min(axis=0)
+        return {'cobertura': 100.0 * float((mejor <= self.alcance).mean()),
+                'distancia_media': float(mejor.mean(dtype=np.float64)),
+                'distancia_max': float(mejor.max())}
+
+    def puntuar_agregados(self, mejor, mascara=None):
+        """Puntaje de `mejor` + cada candidato (los excluidos por la máscara quedan en -inf)"""
+        puntajes = np.full(len(self.candidatos), -np.inf)
+        indices = np.arange(len(self.candidatos)) if mascara is None else np.flatnonzero(mascara)
+        for i in range(0, len(indices), self.bloque):
+            idx = indices[i:i + self.bloque]
+            d = self.distancias(self.candidatos[idx])
+            np.minimum(d, mejor, out=d)
+            puntajes[idx] = self._puntaje(d)
+        self.evaluaciones += len(indices)
+        return puntajes
+
+    def greedy(self, k, mascaras=None):
+        """Selección greedy de k candidatos; devuelve índices y distancias por sitio"""
+        mejor = np.full(len(self.mx), np.inf, dtype=np.float32)
+        elegidos, por_sitio = [], []
+        for j in range(k):
+            mascara = None if mascaras is None else mascaras[j]
+            c = int(np.argmax(self.puntuar_agregados(mejor, mascara)))
+            d = self.distancias(self.candidatos[c])[0]
+            np.minimum(mejor, d, out=mejor)
+            elegidos.append(c)
+            por_sitio.append(d)
+        return elegidos, np.array(por_sitio)
+
+    def intercambiar(self, elegidos, por_sitio=None, mascaras=None, max_iter=20):
+        """Búsqueda local: sustituye un sitio a la vez mientras el puntaje mejore"""
+        elegidos = list(elegidos)
+        if por_sitio is None:
+            por_sitio = self.distancias(self.candidatos[elegidos])
+        actual = float(self._puntaje(por_sitio.min(axis=0)))
+        for _ in range(max_iter):
+            mejoro = False
+            for j in range(len(elegidos)):
+                resto = np.delete(por_sitio, j, axis=0)
+                sin_j = resto.min(axis=0) if len(resto) else np.full(len(self.mx), np.inf, np.float32)
+                mascara = None if mascaras is None else mascaras[j]
+                puntajes = self.puntuar_agregados(sin_j, mascara)
+                c = int(np.argmax(puntajes))
+                if puntajes[c] > actual + 1e-12 and c != elegidos[j]:
+                    elegidos[j] = c
+                    por_sitio[j] = self.distancias(self.candidatos[c])[0]
+                    actual = float(puntajes[c])
+                    mejoro = True
+            if not mejoro:
+                break
+        return elegidos, por_sitio, actual
+
+    def optimizar(self, k, mascaras=None, iniciales=None, max_iter=20):
+        """Greedy (o sitios iniciales) + intercambios; devuelve las coordenadas"""
+        if iniciales is None:
+            elegidos, por_sitio = self.greedy(k, mascaras)
+        else:
+            elegidos, por_sitio = list(iniciales), None
+        elegidos, _, puntaje = self.intercambiar(elegidos, por_sitio, mascaras, max_iter)
+        return self.candidatos[elegidos], elegidos, puntaje
+
+
+def optimizar_rutas(trazas, candidatos, k, ventanas, alcance, objetivo,
+                    velocidad=VELOCIDAD_MAX_GW, max_iter=20):
+    """
+    Waypoints por ventana de tiempo para k gateways móviles. Cada ventana parte
+    de la solución anterior y solo admite destinos alcanzables a `velocidad`.
+    """
+    cortes = np.array_split(np.arange(len(trazas)), ventanas)
+    waypoints, evaluaciones, anterior = [], 0, None
+    for frames in cortes:
+        t0, t1 = trazas.tiempos[frames[0]], trazas.tiempos[frames[-1]]
+        plano = trazas.xy[frames].reshape(-1, 2)
+        ev = EvaluadorUbicaciones(plano[~np.isnan(plano[:, 0])], candidatos, alcance, objetivo)
+        if anterior is None:
+            sitios, elegidos, _ = ev.optimizar(k, max_iter=max_iter)
+        else:
+            duracion = t0 - waypoints[-1][0] if waypoints else 0.0
+            d_max = max(velocidad * duracion, 1.0)
+            mascaras = [np.hypot(*(candidatos - candidatos[c]).T) <= d_max for c in anterior]
+            sitios, elegidos, _ = ev.optimizar(k, mascaras=mascaras, iniciales=anterior,
+                                               max_iter=max_iter)
+        waypoints.append((t0, t1, sitios))
+        evaluaciones += ev.evaluaciones
+        anterior = elegidos
+    return waypoints, evaluaciones
+
+
+def exportar_sitios(prefijo, sitios, metricas):
+    """CSV de sitios propuestos + fragmento listo para pegar en el .cc"""
+    with open(f'{prefijo}.csv', 'w') as f:
+        f.write('gateway,x,y\n')
+        for i, (x, y) in enumerate(sitios):
+            f.write(f'{i},{x:.1f},{y:.1f}\n')
+    with open(f'{prefijo}_ns3.txt', 'w') as f:
+        f.write(f'    // Sitios optimizados: cobertura {metricas["cobertura"]:.2f}%, '
+                f'distancia media {metricas["distancia_media"]:.0f} m\n')
+        for x, y in sitios:
+            f.write(f'    gwInitialPositions->Add(Vector({x:.0f}, {y:.0f}, {ALTURA_GW}));\n')
+    print(f"✓ Sitios exportados: {prefijo}.csv, {prefijo}_ns3.txt")
+
+
+def exportar_rutas(prefijo, waypoints):
+    """CSV de waypoints + fragmento para ns3::WaypointMobilityModel"""
+    k = len(waypoints[0][2])
+    with open(f'{prefijo}.csv', 'w') as f:
+        f.write('gateway,t_inicio,t_fin,x,y\n')
+        for t0, t1, sitios in waypoints:
+            for i, (x, y) in enumerate(sitios):
+                f.write(f'{i},{t0:.0f},{t1:.0f},{x:.1f},{y:.1f}\n')
+    with open(f'{prefijo}_ns3.txt', 'w') as f:
+        f.write('    mobilityGW.SetMobilityModel("ns3::WaypointMobilityModel");\n')
+        f.write('    mobilityGW.Install(mobileGateways);\n')
+        for i in range(k):
+            f.write(f'    {{\n        Ptr<WaypointMobilityModel> wp = '
+                    f'mobileGateways.Get({i})->GetObject<WaypointMobilityModel>();\n')
+            for t0, _, sitios in waypoints:
+                x, y = sitios[i]
+                f.write(f'        wp->AddWaypoint(Waypoint(Seconds({t0:.0f}), '
+                        f'Vector({x:.0f}, {y:.0f}, {ALTURA_GW})));\n')
+            f.write('    }\n')
+    print(f"✓ Rutas exportadas: {prefijo}.csv, {prefijo}_ns3.txt")
+
+
+def graficar(ruta, muestras, actuales, propuestos, waypoints=None):
+    """Densidad de embarcaciones con sitios actuales y propuestos"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(12, 7.5))
+    ax.hexbin(muestras[:, 0], muestras[:, 1], gridsize=40, cmap='Blues', mincnt=1)
+    if actuales is not None:
+        ax.scatter(actuales[:, 0], actuales[:, 1], s=250, marker='^', c='#95A5A6',
+                   edgecolors='black', label='Sitios actuales', zorder=5)
+    if waypoints is not None:
+        rutas = np.array([s for _, _, s in waypoints])   # (ventanas, k, 2)
+        for i in range(rutas.shape[1]):
+            ax.plot(rutas[:, i, 0], rutas[:, i, 1], '-o', color='#E74C3C', markersize=4,
+                    linewidth=1.5, zorder=4)
+    ax.scatter(propuestos[:, 0], propuestos[:, 1], s=300, marker='*', c='#E74C3C',
+               edgecolors='black', zorder=6,
+               label='Propuesta' if waypoints is None else 'Inicio de ruta')
+    ax.set_xlim(0, AREA_X)
+    ax.set_ylim(0, AREA_Y)
+    ax.set_aspect('equal')
+    ax.set_xlabel('Distancia X (m)', fontweight='bold')
+    ax.set_ylabel('Distancia Y (m)', fontweight='bold')
+    ax.set_title('Ubicación Optimizada de Gateways', fontweight='bold')
+    ax.legend(loc='upper right')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    plt.tight_layout()
+    plt.savefig(ruta, dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Gráfica guardada: {ruta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimizador de ubicación de gateways")
+    parser.add_argument('posiciones', help='CSV de LogPositions (time,node_id,x,y,type)')
+    parser.add_argument('--gateways', type=int, default=3)
+    parser.add_argument('--resolucion', type=float, default=500, help='Paso de la grilla (m)')
+    parser.add_argument('--alcance', type=float, default=LORA_MAX_RANGE)
+    parser.add_argument('--objetivo', choices=['cobertura', 'distancia'], default='cobertura',
+                        help='cobertura: %% de muestras en alcance (desempate por distancia); '
+                             'distancia: k-median puro')
+    parser.add_argument('--paso', type=int, default=1, help='Usar uno de cada N frames')
+    parser.add_argument('--ventanas', type=int, default=0,
+                        help='>0: waypoints por ventana de tiempo (gateways móviles)')
+    parser.add_argument('--velocidad', type=float, default=VELOCIDAD_MAX_GW,
+                        help='Velocidad máxima de los gateways entre waypoints (m/s)')
+    parser.add_argument('--comparar', choices=list(SITIOS_ACTUALES), default='movil',
+                        help='Sitios actuales contra los que comparar')
+    parser.add_argument('--salida', default='gateways_optimizados', help='Prefijo de salida')
+    parser.add_argument('--grafica', action='store_true', help='Guardar PNG con la propuesta')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("OPTIMIZADOR DE UBICACIÓN DE GATEWAYS")
+    print("=" * 70)
+    trazas = cargar_trazas(args.posiciones, tipo='boat')
+    trazas = type(trazas)(trazas.tiempos[::args.paso], trazas.ids, trazas.tipos,
+                          trazas.xy[::args.paso])
+    muestras = trazas.muestras()
+    candidatos = grilla_candidatos(args.resolucion)
+    print(f"✓ {len(trazas)} frames, {len(trazas.ids)} embarcaciones, {len(muestras)} muestras")
+    print(f"✓ {len(candidatos)} sitios candidatos (grilla de {args.resolucion:.0f} m)")
+
+    ev = EvaluadorUbicaciones(muestras, candidatos, args.alcance, args.objetivo)
+    actuales = np.array([(x, y) for x, y, _ in SITIOS_ACTUALES[args.comparar]], dtype=float)
+    if len(actuales) == args.gateways:
+        m = ev.metricas(actuales)
+        print(f"\nSitios actuales ({args.comparar}): cobertura {m['cobertura']:.2f}% | "
+              f"distancia media {m['distancia_media']:.0f} m | máx {m['distancia_max']:.0f} m")
+    else:
+        actuales = None
+
+    inicio = time.perf_counter()
+    waypoints = None
+    if args.ventanas > 0:
+        waypoints, evaluaciones = optimizar_rutas(trazas, candidatos, args.gateways,
+                                                  args.ventanas, args.alcance, args.objetivo,
+                                                  args.velocidad)
+        sitios = waypoints[0][2]
+    else:
+        sitios, _, _ = ev.optimizar(args.gateways)
+        evaluaciones = ev.evaluaciones
+    duracion = time.perf_counter() - inicio
+    print(f"✓ {evaluaciones} configuraciones evaluadas en {duracion:.2f} s "
+          f"({evaluaciones / max(duracion, 1e-9):.0f}/s)")
+
+    if waypoints is None:
+        m = ev.metricas(sitios)
+        print(f"\nPropuesta: cobertura {m['cobertura']:.2f}% | "
+              f"distancia media {m['distancia_media']:.0f} m | máx {m['distancia_max']:.0f} m")
+        for i, (x, y) in enumerate(sitios):
+            print(f"  GW {i + 1}: ({x / 1000:.1f} km, {y / 1000:.1f} km)")
+        exportar_sitios(args.salida, sitios, m)
+    else:
+        # Cobertura de la ruta completa: cada frame contra los waypoints de su ventana
+        cubiertas, total, suma_d = 0, 0, 0.0
+        for t0, t1, s in waypoints:
+            parcial = trazas.recortar(t0, t1).muestras()
+            d = EvaluadorUbicaciones(parcial, s, args.alcance).distancias(s).min(axis=0)
+            cubiertas += int((d <= args.alcance).sum())
+            suma_d += float(d.sum(dtype=np.float64))
+            total += len(d)
+        print(f"\nRutas ({args.ventanas} ventanas): cobertura {100 * cubiertas / total:.2f}% | "
+              f"distancia media {suma_d / total:.0f} m")
+        exportar_rutas(args.salida, waypoints)
+
+    if args.grafica:
+        graficar(f'{args.salida}.png', muestras, actuales, sitios, waypoints)
+
+
+if __name__ == '__main__':
+    main()
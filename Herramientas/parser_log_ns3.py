@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parser en Streaming de Logs NS_LOG
+Extrae los registros por paquete que los .cc emiten con NS_LOG_DEBUG
+(envío + energía, latencia end-to-end, fallos y resultado del relay P2P)
+y los guarda como columnas binarias tipadas, escritas por bloques.
+
+El log se lee en bloques de varios MB alineados a fin de línea y se recorre
+con una sola expresión regular precompilada (finditer en C), así que las
+líneas que no interesan no pasan por Python. La memoria queda acotada por el
+tamaño de bloque. Acepta logs comprimidos con gzip (.gz).
+
+Captura del log (NS_LOG escribe en stderr):
+    NS_LOG="SalinasMobileGW=level_debug|prefix_time|prefix_node" \\
+        ./ns3 run "scratch/salinas-mobile-3gw" 2> salinas_debug.log
+
+Uso:
+    python3 parser_log_ns3.py salinas_debug.log --salida columnas_salinas/
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+# Tipos de registro
+ENVIO, RECEPCION, RELAY = 0, 1, 2
+NOMBRES_TIPO = {ENVIO: 'envio', RECEPCION: 'recepcion', RELAY: 'relay'}
+
+COLUMNAS = {
+    'tipo': np.int8,
+    'tiempo': np.float64,        # s (prefix_time o el t= del mensaje de envío)
+    'nodo': np.int32,            # prefix_node o nodo del fallo; -1 si se desconoce
+    'paquete': np.int64,         # packet->GetUid(); -1 en registros de relay
+    'latencia_ms': np.float64,
+    'energia_mj': np.float64,
+    'relay': np.int32,           # nodo elegido como relay; -1 si no hubo
+    'exito': np.int8,            # relay: 1 éxito, 0 fallo; -1 si no aplica
+}
+
+# Prefijos opcionales de NS_LOG: "+12.5s 3 Componente:Funcion(): [DEBUG] "
+_PREFIJO = (rb'^(?:\+(?P<t>[0-9.eE+-]+)s )?(?:(?P<nodo>-?\d+) )?'
+            rb'(?:[\w:]+\(\): )?(?:\[\s*\w+\s*\] )?\s*')
+_MENSAJES = (
+    rb'(?:Paquete (?P<env_id>\d+) enviado en t=(?P<env_t>[0-9.eE+-]+)s'
+    rb'|Energ\xc3\xada consumida: (?P<energia>[0-9.eE+-]+) mJ'
+    rb'|Latencia paquete (?P<lat_id>\d+): (?P<lat>[0-9.eE+-]+) ms'
+    rb'|Transmisi\xc3\xb3n fallida del nodo (?P<fallo>\d+)'
+    rb'|(?P<sin_vecinos>No hay vecinos disponibles)'
+    rb'|\xe2\x9c\x93 P2P Relay exitoso hacia nodo (?P<relay>\d+)'
+    rb'|(?P<relay_falla>\xe2\x9c\x97 P2P Relay fall\xc3\xb3))'
+)
+PATRON = re.compile(_PREFIJO + _MENSAJES, re.M)
+
+
+def _abrir(ruta):
+    if ruta.endswith('.gz'):
+        return gzip.open(ruta, 'rb')
+    return open(ruta, 'rb', buffering=0)
+
+
+def leer_bloques(ruta, tam_bloque=8 << 20):
+    """Bloques de bytes del log que terminan en fin de línea"""
+    resto = b''
+    with _abrir(ruta) as f:
+        while True:
+            datos = f.read(tam_bloque)
+            if not datos:
+                break
+            datos = resto + datos
+            corte = datos.rfind(b'\n') + 1
+            if corte == 0:
+                resto = datos
+                continue
+            resto = datos[corte:]
+            yield datos[:corte]
+    if resto:
+        yield resto + b'\n'
+
+
+class AcumuladorRegistros:
+    """Registros por columnas con volcado al alcanzar `filas_bloque`"""
+
+    def __init__(self, filas_bloque=1_000_000, al_volcar=None):
+        self.filas_bloque = filas_bloque
+        self.al_volcar = al_volcar
+        self.total = 0
+        self.por_tipo = {t: 0 for t in NOMBRES_TIPO}
+        self._columnas = {c: [] for c in COLUMNAS}
+        self._pendiente_energia = None   # índice del último envío (la energía llega después)
+        self._pendiente_relay = None     # índice del último fallo (el resultado llega después)
+
+    def __len__(self):
+        return len(self._columnas['tipo'])
+
+    def agregar(self, tipo, tiempo=np.nan, nodo=-1, paquete=-1, latencia_ms=np.nan,
+                energia_mj=np.nan, relay=-1, exito=-1):
+        # Solo se vuelca entre registros completos para no separar envío y energía
+        if len(self) >= self.filas_bloque:
+            self.volcar()
+        c = self._columnas
+        c['tipo'].append(tipo)
+        c['tiempo'].append(tiempo)
+        c['nodo'].append(nodo)
+        c['paquete'].append(paquete)
+        c['latencia_ms'].append(latencia_ms)
+        c['energia_mj'].append(energia_mj)
+        c['relay'].append(relay)
+        c['exito'].append(exito)
+        self.por_tipo[tipo] += 1
+        return len(self) - 1
+
+    def procesar(self, bloque):
+        """Aplica el patrón a un bloque de líneas completas"""
+        for m in PATRON.finditer(bloque):
+            # El último grupo capturado identifica el mensaje
+            clave = m.lastgroup
+            if clave == 'env_t':
+                self._pendiente_relay = None
+                nodo = m.group('nodo')
+                self._pendiente_energia = self.agregar(
+                    ENVIO, float(m.group('env_t')), int(nodo) if nodo else -1,
+                    int(m.group('env_id')))
+            elif clave == 'energia':
+                if self._pendiente_energia is not None:
+                    self._columnas['energia_mj'][self._pendiente_energia] = float(m.group('energia'))
+                    self._pendiente_energia = None
+            elif clave == 'lat':
+                t, nodo = m.group('t', 'nodo')
+                self.agregar(RECEPCION, float(t) if t else np.nan, int(nodo) if nodo else -1,
+                             int(m.group('lat_id')), latencia_ms=float(m.group('lat')))
+            elif clave == 'fallo':
+                self._pendiente_energia = None
+                t = m.group('t')
+                self._pendiente_relay = self.agregar(RELAY, float(t) if t else np.nan,
+                                                     int(m.group('fallo')))
+            elif self._pendiente_relay is not None:
+                i = self._pendiente_relay
+                if clave == 'relay':
+                    self._columnas['relay'][i] = int(m.group('relay'))
+                    self._columnas['exito'][i] = 1
+                else:
+                    self._columnas['exito'][i] = 0
+                self._pendiente_relay = None
+
+    def volcar(self):
+        """Entrega el bloque acumulado como arreglos tipados y lo vacía"""
+        if len(self) == 0:
+            return
+        arreglos = {c: np.asarray(v, dtype=COLUMNAS[c]) for c, v in self._columnas.items()}
+        self.total += len(arreglos['tipo'])
+        self._columnas = {c: [] for c in COLUMNAS}
+        self._pendiente_energia = self._pendiente_relay = None
+        if self.al_volcar is not None:
+            self.al_volcar(arreglos)
+
+
+class EscritorColumnas:
+    """Una columna binaria por campo (columna.bin) + esquema.json"""
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+        self.filas = 0
+        self._archivos = {c: open(os.path.join(directorio, f'{c}.bin'), 'wb') for c in COLUMNAS}
+
+    def escribir(self, arreglos):
+        for c, f in self._archivos.items():
+            arreglos[c].tofile(f)
+        self.filas += len(arreglos['tipo'])
+
+    def cerrar(self):
+        for f in self._archivos.values():
+            f.close()
+        esquema = {'filas': self.filas,
+                   'columnas': {c: np.dtype(t).str for c, t in COLUMNAS.items()},
+                   'tipos': NOMBRES_TIPO}
+        with open(os.path.join(self.directorio, 'esquema.json'), 'w') as f:
+            json.dump(esquema, f, indent=2)
+
+
+def cargar_columnas(directorio):
+    """Columnas escritas por EscritorColumnas como np.memmap de solo lectura"""
+    with open(os.path.join(directorio, 'esquema.json')) as f:
+        esquema = json.load(f)
+    n = esquema['filas']
+    return {c: np.memmap(os.path.join(directorio, f'{c}.bin'), dtype=np.dtype(t), mode='r',
+                         shape=(n,))
+            if n else np.empty(0, dtype=np.dtype(t))
+            for c, t in esquema['columnas'].items()}
+
+
+def iterar_registros(ruta_log, filas_bloque=1_000_000, tam_bloque=8 << 20):
+    """Generador de bloques de arreglos tipados leídos directamente del log"""
+    listos = []
+    acumulador = AcumuladorRegistros(filas_bloque, al_volcar=listos.append)
+    for bloque in leer_bloques(ruta_log, tam_bloque):
+        acumulador.procesar(bloque)
+        while listos:
+            yield listos.pop(0)
+    acumulador.volcar()
+    while listos:
+        yield listos.pop(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser en streaming de logs NS_LOG")
+    parser.add_argument('log', help='Captura de NS_LOG (texto o .gz)')
+    parser.add_argument('--salida', help='Directorio de columnas (por defecto <log>_columnas)')
+    parser.add_argument('--filas-bloque', type=int, default=1_000_000,
+                        help='Registros por bloque volcado a disco')
+    parser.add_argument('--tam-lectura', type=int, default=8, help='MB leídos por vez')
+    args = parser.parse_args()
+
+    salida = args.salida or os.path.splitext(args.log)[0] + '_columnas'
+    escritor = EscritorColumnas(salida)
+    acumulador = AcumuladorRegistros(args.filas_bloque, al_volcar=escritor.escribir)
+
+    inicio = time.perf_counter()
+    leidos = 0
+    for bloque in leer_bloques(args.log, args.tam_lectura << 20):
+        leidos += len(bloque)
+        acumulador.procesar(bloque)
+    acumulador.volcar()
+    escritor.cerrar()
+    duracion = time.perf_counter() - inicio
+
+    print(f"✓ {leidos / 1e6:.1f} MB procesados en {duracion:.2f} s "
+          f"({leidos / 1e6 / max(duracion, 1e-9):.0f} MB/s)")
+    for tipo, nombre in NOMBRES_TIPO.items():
+        print(f"  {nombre:<10} {acumulador.por_tipo[tipo]}")
+    print(f"✓ {escritor.filas} registros en {salida}/")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline de Resultados con Dependencias (tipo make)
+Cada script de análisis/visualización se declara como un Paso con su
+directorio de trabajo, sus entradas y sus salidas (rutas relativas a la raíz
+del repositorio). El grafo se arma uniendo salidas con entradas.
+
+Un paso está desactualizado si cambió el hash de alguna entrada (incluido el
+propio script y los módulos de Herramientas que usa) o falta alguna salida.
+Solo se ejecuta el subgrafo invalidado; los pasos sin dependencias entre sí
+corren en paralelo. La huella de un paso se calcula justo antes de lanzarlo,
+así que si un paso previo regenera sus salidas con el mismo contenido, los
+pasos siguientes no se repiten.
+
+Los scripts leen nombres fijos en su directorio (positions_mobile.csv, ...);
+`preparar` copia ahí los CSV de simulación correspondientes antes de correr.
+
+Uso:
+    python3 pipeline_resultados.py --plan             # qué se regeneraría
+    python3 pipeline_resultados.py                    # todo lo desactualizado
+    python3 pipeline_resultados.py ob1.animacion_movil --procesos 2
+    python3 pipeline_resultados.py ob2 --forzar
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from trabajos_graficas import CacheHuellas
+
+RAIZ = Path(__file__).resolve().parents[1]
+RUTA_HUELLAS = '.huellas_pipeline.json'
+
+OB1 = 'Resultados Ob1'
+OB1_ANIM = f'{OB1}/Animacion_gif'
+OB1_MOVIL = f'{OB1}/Resultados_mòvil_3gw'
+OB1_TRAD = f'{OB1}/Resultados_tradicional_3gw'
+OB1_10GW = f'{OB1}/Resultados_Movil_10gw'
+OB2_ANALISIS = 'Resultados Ob2/Analisis_objetivo2'
+OB3_DENSIDAD = 'Resultados Ob3/Resultados_escenarios/escenario2_densidad'
+
+CAPTURAS = ['1_inicio', '2_cuarto', '3_mitad', '4_tres_cuartos', '5_final']
+
+# Trazas de posiciones de cada arquitectura y su serie de cobertura de área
+POSICIONES_OB1 = {
+    f'{OB1_TRAD}/posiciones_tradicional_3gw.csv': f'{OB1_TRAD}/cobertura_area_tradicional_3gw.csv',
+    f'{OB1_MOVIL}/positions_salinas_movil_3gw.csv': f'{OB1_MOVIL}/cobertura_area_salinas_movil_3gw.csv',
+    f'{OB1_10GW}/positions_salinas_gw10_p2p.csv': f'{OB1_10GW}/cobertura_area_salinas_gw10_p2p.csv',
+}
+
+# Módulos de dibujo compartidos por los renderizadores de animaciones
+RENDER = ['fondo_mapa.py', 'discos_cobertura.py', 'etapas_render.py']
+# Carga de trazas y topología por frame compartidas (sesion_visual.py)
+SESION = ['sesion_visual.py', 'topologia_red.py', 'radio_lora.py', 'trazas.py']
+
+
+class Paso:
+    """Un script con sus entradas y salidas declaradas"""
+
+    def __init__(self, nombre, directorio, comando, entradas=(), salidas=(), preparar=None):
+        self.nombre = nombre
+        self.directorio = directorio
+        self.comando = list(comando)
+        self.preparar = dict(preparar or {})   # nombre local -> ruta en el repositorio
+        self.entradas = list(entradas) + list(self.preparar.values())
+        self.salidas = list(salidas)
+
+    def expandir(self, raiz):
+        """Entradas con comodines -> archivos existentes (ordenados)"""
+        archivos = []
+        for e in self.entradas:
+            if any(c in e for c in '*?['):
+                encontrados = glob.glob(os.path.join(glob.escape(str(raiz)), e), recursive=True)
+                archivos += sorted(os.path.relpath(a, raiz) for a in encontrados)
+            else:
+                archivos.append(e)
+        return archivos
+
+    def huella(self, hashes):
+        """SHA-256 de comando + preparación + hash de cada entrada + salidas"""
+        h = hashlib.sha256()
+        h.update(json.dumps([self.directorio, self.comando, self.preparar, self.salidas,
+                             sorted(hashes.items())]).encode('utf-8'))
+        return h.hexdigest()
+
+
+def paso_script(nombre, directorio, script, salidas, entradas=(), preparar=None,
+                herramientas=(), argumentos=()):
+    """Paso que corre `python3 script` en su directorio; el script es entrada"""
+    entradas = [f'{directorio}/{script}'] + [f'Herramientas/{h}' for h in herramientas] \
+        + list(entradas)
+    return Paso(nombre, directorio, ['{python}', script, *argumentos], entradas,
+                [f'{directorio}/{s}' for s in salidas], preparar)
+
+
+# ===== PASOS DEL REPOSITORIO =====
+
+PASOS = [
+    paso_script('ob1.graficas', f'{OB1}/Script_graficas/Generacion_graficas',
+                'generar_graficas_objetivo1.py',
+                [f'grafica_{g}_objetivo1.png' for g in
+                 ('pdr', 'cobertura', 'distancia', 'embarcaciones', 'relay_p2p', 'radar')],
+                herramientas=['trabajos_graficas.py']),
+    paso_script('ob1.analisis_p2p', f'{OB1}/Script_graficas/Analisis_P2P_Graficas',
+                'analizar_p2p_objetivo1.py',
+                ['objetivo1_tabla_protocolos_p2p.csv', 'objetivo1_tabla_metricas_relay.csv',
+                 'grafica_protocolo_p2p_objetivo1.png'],
+                preparar={
+                    'resultados-salinas-traditional-gw.csv': f'{OB1_TRAD}/resultados_tradicional_3gw.csv',
+                    'resultados_movil_3gw.csv': f'{OB1_MOVIL}/resultados_salinas_movil_3gw_base.csv',
+                    'resultados_salinas_movil_3gw_p2p.csv': f'{OB1_MOVIL}/resultados_salinas_movil_3gw_p2p.csv',
+                    'resultados_salinas_gw10_p2p.csv': f'{OB1_10GW}/resultados_salinas_gw10_p2p.csv',
+                }),
+    paso_script('ob1.animacion_movil', f'{OB1_ANIM}/Animacion_movil', 'animacion_movil.py',
+                ['Animacion_Arquitectura_Movil.gif'] + [f'Movil_Captura_{c}.png' for c in CAPTURAS],
+                herramientas=['salida_video.py', 'estelas.py', 'interpolacion_trayectorias.py',
+                              *SESION, *RENDER],
+                preparar={'positions_mobile.csv': f'{OB1_MOVIL}/positions_salinas_movil_3gw.csv'}),
+    paso_script('ob1.animacion_tradicional', f'{OB1_ANIM}/Animacion_tradicional',
+                'animacion_tradicional.py',
+                ['Animacion_Arquitectura_Tradicional.gif']
+                + [f'Tradicional_Captura_{c}.png' for c in CAPTURAS],
+                herramientas=['salida_video.py', *SESION, *RENDER],
+                preparar={'positions_fixed.csv': f'{OB1_TRAD}/posiciones_tradicional_3gw.csv'}),
+    paso_script('ob1.animacion_comparativa', f'{OB1_ANIM}/Gif_ambas_arquitecturas',
+                'animacion_comparativa.py',
+                ['Animacion_Comparacion_Arquitecturas.gif'] + [f'Captura_{c}.png' for c in CAPTURAS],
+                herramientas=['salida_video.py', *SESION, *RENDER],
+                preparar={'positions_fixed.csv': f'{OB1_TRAD}/posiciones_tradicional_3gw.csv',
+                          'positions_mobile.csv': f'{OB1_MOVIL}/positions_salinas_movil_3gw.csv'}),
+    paso_script('ob1.comparacion_geografica', f'{OB1_ANIM}/Sin_animacion_ambas_arquitecturas',
+                'comparacion_geografica_v2.py', ['Comparacion_Geografica_Arquitecturas.png'],
+                herramientas=SESION,
+                preparar={'positions_fixed.csv': f'{OB1_TRAD}/posiciones_tradicional_3gw.csv',
+                          'positions_mobile.csv': f'{OB1_MOVIL}/positions_salinas_movil_3gw.csv'}),
+    paso_script('ob1.red_movil', OB1_ANIM, 'visualizacion_gif_movil.py',
+                ['lorawan_mobile_network.gif'] + [f'network_snapshot_{i}.png' for i in range(1, 5)],
+                herramientas=['salida_video.py', *SESION, *RENDER],
+                preparar={'positions_mobile.csv': f'{OB1_MOVIL}/positions_salinas_movil_3gw.csv'}),
+    Paso('ob1.cobertura_area', 'Herramientas',
+         ['{python}', 'cobertura_area.py', *[f'../{p}' for p in POSICIONES_OB1]],
+         ['Herramientas/cobertura_area.py', 'Herramientas/radio_lora.py', 'Herramientas/trazas.py',
+          *POSICIONES_OB1],
+         list(POSICIONES_OB1.values())),
+    Paso('ob3.capacidad_aloha', 'Herramientas',
+         ['{python}', 'capacidad_aloha.py',
+          '--tradicional', f'../{OB1_TRAD}/posiciones_tradicional_3gw.csv',
+          '--movil', f'../{OB1_MOVIL}/positions_salinas_movil_3gw.csv',
+          '--salida', f'../{OB3_DENSIDAD}/capacidad_aloha.csv',
+          '--grafica', f'../{OB3_DENSIDAD}/capacidad_aloha.png'],
+         ['Herramientas/capacidad_aloha.py', 'Herramientas/radio_lora.py', 'Herramientas/trazas.py',
+          f'{OB1_TRAD}/posiciones_tradicional_3gw.csv', f'{OB1_MOVIL}/positions_salinas_movil_3gw.csv'],
+         [f'{OB3_DENSIDAD}/capacidad_aloha.csv', f'{OB3_DENSIDAD}/capacidad_aloha.png']),
+    paso_script('ob2.analisis', OB2_ANALISIS, 'analisis_objetivo2_final.py',
+                ['objetivo2_analisis_completo.png', 'objetivo2_impacto_potencia.png',
+                 'objetivo2_resultados_completos.csv', 'objetivo2_comparacion_14dbm.csv',
+                 'objetivo2_impacto_potencia.csv', 'objetivo2_resumen.txt'],
+                herramientas=['trabajos_graficas.py'], argumentos=['--salida', '.']),
+]
+
+
+# ===== GRAFO =====
+
+class Grafo:
+    """Pasos unidos por archivos: una salida de A usada como entrada de B => A -> B"""
+
+    def __init__(self, pasos, raiz=RAIZ):
+        self.raiz = Path(raiz)
+        self.pasos = {p.nombre: p for p in pasos}
+        self.productor = {}
+        for p in pasos:
+            for s in p.salidas:
+                if s in self.productor:
+                    raise ValueError(f"{s} lo producen {self.productor[s]} y {p.nombre}")
+                self.productor[s] = p.nombre
+        self.previos = {p.nombre: set() for p in pasos}
+        self.siguientes = {p.nombre: set() for p in pasos}
+        for p in pasos:
+            for e in p.expandir(self.raiz):
+                origen = self.productor.get(e)
+                if origen and origen != p.nombre:
+                    self.previos[p.nombre].add(origen)
+                    self.siguientes[origen].add(p.nombre)
+        self.orden = self._orden_topologico()
+
+    def _orden_topologico(self):
+        pendientes = {n: len(v) for n, v in self.previos.items()}
+        listos = sorted(n for n, k in pendientes.items() if k == 0)
+        orden = []
+        while listos:
+            n = listos.pop(0)
+            orden.append(n)
+            for s in sorted(self.siguientes[n]):
+                pendientes[s] -= 1
+                if pendientes[s] == 0:
+                    listos.append(s)
+        if len(orden) != len(self.pasos):
+            ciclo = sorted(set(self.pasos) - set(orden))
+            raise ValueError(f"Ciclo de dependencias entre: {', '.join(ciclo)}")
+        return orden
+
+    def seleccionar(self, objetivos):
+        """Pasos pedidos (nombre, prefijo 'ob1' o ruta de salida) + sus previos"""
+        if not objetivos:
+            return list(self.orden)
+        elegidos = set()
+        for obj in objetivos:
+            obj = obj.rstrip('/')
+            encontrados = {n for n in self.pasos if n == obj or n.startswith(obj + '.')}
+            if obj in self.productor:
+                encontrados.add(self.productor[obj])
+            if not encontrados:
+                raise KeyError(f"Objetivo desconocido: {obj}")
+            elegidos |= encontrados
+        pila = list(elegidos)
+        while pila:
+            for previo in self.previos[pila.pop()]:
+                if previo not in elegidos:
+                    elegidos.add(previo)
+                    pila.append(previo)
+        return [n for n in self.orden if n in elegidos]
+
+
+# ===== EJECUCIÓN =====
+
+class Pipeline:
+    def __init__(self, grafo, ruta_huellas=None):
+        self.grafo = grafo
+        self.raiz = grafo.raiz
+        self.cache = CacheHuellas(ruta_huellas or self.raiz / RUTA_HUELLAS, raiz=str(self.raiz))
+
+    def _huella(self, paso):
+        hashes = {e: self.cache.hash_archivo(e) for e in paso.expandir(self.raiz)}
+        return paso.huella(hashes), [e for e, h in hashes.items() if h is None]
+
+    def _al_dia(self, paso, huella):
+        return (self.cache.trabajos.get(paso.nombre) == huella
+                and all((self.raiz / s).exists() for s in paso.salidas))
+
+    def plan(self, nombres, forzar=False):
+        """Estado previsto de cada paso: 'al día', 'desactualizado' o 'depende'"""
+        estado = {}
+        for n in nombres:
+            paso = self.grafo.pasos[n]
+            if any(estado.get(p) in ('desactualizado', 'depende') for p in self.grafo.previos[n]):
+                estado[n] = 'depende'
+            elif forzar or not self._al_dia(paso, self._huella(paso)[0]):
+                estado[n] = 'desactualizado'
+            else:
+                estado[n] = 'al día'
+        return estado
+
+    def _ejecutar(self, paso):
+        """Corre en un hilo; devuelve (código, segundos, salida combinada)"""
+        directorio = self.raiz / paso.directorio
+        for local, origen in paso.preparar.items():
+            shutil.copy2(self.raiz / origen, directorio / local)
+        comando = [sys.executable if c == '{python}' else c for c in paso.comando]
+        entorno = dict(os.environ, MPLBACKEND='Agg')
+        inicio = time.perf_counter()
+        r = subprocess.run(comando, cwd=directorio, env=entorno, stdout=subprocess.PIPE,
+                           stderr=subprocess.STDOUT)
+        return r.returncode, time.perf_counter() - inicio, r.stdout.decode('utf-8', 'replace')
+
+    def ejecutar(self, nombres, procesos=1, forzar=False):
+        """Ejecuta los pasos desactualizados respetando dependencias"""
+        nombres = list(nombres)
+        restantes = {n: self.grafo.previos[n] & set(nombres) for n in nombres}
+        hechos, fallidos, omitidos, regenerados = set(), set(), set(), []
+        en_curso = {}
+        inicio = time.perf_counter()
+
+        procesos = max(1, procesos)
+        with ThreadPoolExecutor(max_workers=procesos) as pool:
+            while restantes or en_curso:
+                for n in [n for n in nombres if n in restantes]:
+                    if len(en_curso) >= procesos:
+                        break
+                    previos = restantes[n]
+                    if previos & (fallidos | omitidos):
+                        print(f"⚠️  {n}: omitido (falló {', '.join(sorted(previos & (fallidos | omitidos)))})")
+                        omitidos.add(n)
+                        del restantes[n]
+                        continue
+                    if not previos <= hechos:
+                        continue
+                    del restantes[n]
+                    paso = self.grafo.pasos[n]
+                    # Huella al momento de lanzar: ya refleja lo que regeneraron los previos
+                    huella, faltantes = self._huella(paso)
+                    if faltantes:
+                        print(f"❌ {n}: faltan entradas: {', '.join(faltantes)}")
+                        fallidos.add(n)
+                        continue
+                    if not forzar and self._al_dia(paso, huella):
+                        print(f"⏭️  Sin cambios: {n}")
+                        hechos.add(n)
+                        continue
+                    print(f"▶ {n}")
+                    en_curso[pool.submit(self._ejecutar, paso)] = (n, huella)
+
+                if not en_curso:
+                    continue
+                listos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    n, huella = en_curso.pop(futuro)
+                    paso = self.grafo.pasos[n]
+                    try:
+                        codigo, segundos, salida = futuro.result()
+                    except OSError as e:
+                        codigo, segundos, salida = -1, 0.0, str(e)
+                    sin_generar = [s for s in paso.salidas if not (self.raiz / s).exists()]
+                    if codigo != 0 or sin_generar:
+                        fallidos.add(n)
+                        motivo = f"código {codigo}" if codigo != 0 else \
+                            f"no generó {', '.join(sin_generar)}"
+                        print(f"❌ {n}: {motivo}")
+                        for linea in salida.rstrip().splitlines()[-15:]:
+                            print(f"    {linea}")
+                        continue
+                    self.cache.trabajos[n] = huella
+                    self.cache.guardar()
+                    hechos.add(n)
+                    regenerados.append(n)
+                    print(f"✓ {n} ({segundos:.1f} s)")
+
+        self.cache.guardar()
+        print(f"✓ {len(regenerados)} pasos ejecutados, {len(hechos) - len(regenerados)} al día "
+              f"en {time.perf_counter() - inicio:.1f} s")
+        if fallidos or omitidos:
+            print(f"❌ {len(fallidos)} fallidos, {len(omitidos)} omitidos")
+        return regenerados, fallidos | omitidos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline de resultados con dependencias")
+    parser.add_argument('objetivos', nargs='*',
+                        help='Pasos, prefijos (ob1, ob2) o salidas; por defecto todos')
+    parser.add_argument('--plan', action='store_true', help='Solo mostrar qué se ejecutaría')
+    parser.add_argument('--listar', action='store_true', help='Listar pasos, entradas y salidas')
+    parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--forzar', action='store_true', help='Ejecutar aunque esté al día')
+    parser.add_argument('--huellas', help=f'Archivo de huellas (por defecto <raíz>/{RUTA_HUELLAS})')
+    args = parser.parse_args()
+
+    grafo = Grafo(PASOS)
+    try:
+        nombres = grafo.seleccionar(args.objetivos)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        sys.exit(1)
+
+    if args.listar:
+        for n in nombres:
+            paso = grafo.pasos[n]
+            previos = ', '.join(sorted(grafo.previos[n])) or '-'
+            print(f"{n}  [{paso.directorio}]  (después de: {previos})")
+            for e in paso.expandir(grafo.raiz):
+                print(f"   < {e}")
+            for s in paso.salidas:
+                print(f"   > {s}")
+        return
+
+    pipeline = Pipeline(grafo, args.huellas)
+    if args.plan:
+        estado = pipeline.plan(nombres, args.forzar)
+        simbolo = {'al día': '✓', 'desactualizado': '▶', 'depende': '?'}
+        for n in nombres:
+            print(f"{simbolo[estado[n]]} {n:<30} {estado[n]}")
+        pendientes = sum(e != 'al día' for e in estado.values())
+        print(f"{pendientes}/{len(nombres)} pasos por ejecutar")
+        return
+
+    _, fallidos = pipeline.ejecutar(nombres, args.procesos, args.forzar)
+    if fallidos:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modelo Radio LoRa Vectorizado
+Las fórmulas de los .cc en numpy, para operar sobre arreglos completos de
+paquetes, embarcaciones o frames:
+
+  - tiempo_en_aire_cc / energia_transmision: CalculateTransmissionEnergy tal
+    cual (BW 125 kHz, CR 4/5, tabla de corriente del SX1276, 3.3 V).
+  - tiempo_en_aire: LoraPhy::GetOnAirTime de ns-3 (cabecera explícita, CRC,
+    optimización de baja tasa en SF11/12), que es el que ocupa el canal y
+    decide las colisiones.
+  - perdida_trayecto / rssi: LogDistancePropagationLossModel con referencia
+    (1 m, 7.7 dB + weatherLoss) y exponente configurable; el de cada .cc
+    está en EXPONENTES (2.2 tradicional, 2.0 móvil, que es EXPONENTE).
+
+Uso:
+    python3 radio_lora.py --payload 10 --tx-power 14
+"""
+
+import argparse
+
+import numpy as np
+
+BANDWIDTH = 125000.0
+CODING_RATE = 4.0 / 5.0
+VOLTAGE = 3.3
+TX_POWER_DBM = 14.0
+PAYLOAD_APP = 10            # bytes del PeriodicSender (lo que ve PacketSentCallback)
+CABECERA_MAC = 9            # LorawanMacHeader (1) + LoraFrameHeader (8) que agrega la MAC
+PREAMBULO = 8
+PERDIDA_REFERENCIA = 7.7    # dB a 1 m
+EXPONENTE = 2.0             # SetPathLossExponent de salinas-mobile-3gw.cc
+# SetPathLossExponent de cada arquitectura (salinas-traditional.cc usa 2.2)
+EXPONENTES = {'tradicional': 2.2, 'movil': EXPONENTE}
+# Alcances (m) de los .cc, compartidos por las herramientas de topología
+LORA_MAX_RANGE = 15000.0    # LORA_MAX_RANGE
+P2P_RANGE = 5000.0          # UpdateNeighborTables (tabla de vecinos)
+P2P_RELAY_RANGE = 3000.0    # OnTransmissionFailedCallback (relay tras un fallo)
+SPREADING_FACTORS = np.arange(7, 13)
+# Sensibilidad del gateway por SF (GatewayLoraPhy::sensitivity, SF7..SF12)
+SENSIBILIDAD_GW = np.array([-130.0, -132.5, -135.0, -137.5, -140.0, -142.5])
+
+# Tabla de corriente de CalculateTransmissionEnergy: (tope de potencia dBm, mA)
+TABLA_CORRIENTE = ((2, 22.0), (5, 24.0), (8, 28.0), (11, 33.0), (14, 44.0))
+CORRIENTE_MAXIMA = 120.0
+
+
+# ===== TIEMPO EN AIRE =====
+
+def tiempo_simbolo(sf, bandwidth=BANDWIDTH):
+    return np.power(2.0, np.asarray(sf, dtype=float)) / bandwidth
+
+
+def tiempo_en_aire_cc(sf, payload=PAYLOAD_APP, bandwidth=BANDWIDTH):
+    """Tiempo en aire (s) con la fórmula de CalculateTransmissionEnergy"""
+    sf = np.asarray(sf, dtype=float)
+    t_sym = tiempo_simbolo(sf, bandwidth)
+    simbolos = 8 + np.maximum(np.ceil((8.0 * np.asarray(payload) - 4.0 * sf + 28 + 16) / (4.0 * sf))
+                              * CODING_RATE, 0.0)
+    return (PREAMBULO + 4.25) * t_sym + simbolos * t_sym
+
+
+def tiempo_en_aire(sf, payload=PAYLOAD_APP + CABECERA_MAC, bandwidth=BANDWIDTH):
+    """Tiempo en aire (s) de LoraPhy::GetOnAirTime para un payload PHY en bytes"""
+    sf = np.asarray(sf, dtype=float)
+    t_sym = tiempo_simbolo(sf, bandwidth)
+    baja_tasa = (t_sym > 0.016).astype(float)       # SF11 y SF12 a 125 kHz
+    cr = 1                                           # 4/5
+    numerador = 8.0 * np.asarray(payload) - 4.0 * sf + 28 + 16
+    simbolos = 8 + np.maximum(np.ceil(numerador / (4.0 * (sf - 2 * baja_tasa))) * (cr + 4), 0.0)
+    return (PREAMBULO + 4.25) * t_sym + simbolos * t_sym
+
+
+# ===== ENERGÍA =====
+
+def corriente_tx(tx_power):
+    """Corriente de transmisión (mA) del SX1276 según la potencia (dBm)"""
+    tx_power = np.asarray(tx_power, dtype=float)
+    topes = np.array([t for t, _ in TABLA_CORRIENTE], dtype=float)
+    corrientes = np.array([c for _, c in TABLA_CORRIENTE] + [CORRIENTE_MAXIMA])
+    return corrientes[np.searchsorted(topes, tx_power, side='left')]
+
+
+def energia_transmision(sf, tx_power=TX_POWER_DBM, payload=PAYLOAD_APP):
+    """Energía (J) por transmisión, igual que CalculateTransmissionEnergy"""
+    return VOLTAGE * corriente_tx(tx_power) / 1000.0 * tiempo_en_aire_cc(sf, payload)
+
+
+# ===== PROPAGACIÓN =====
+
+def perdida_trayecto(d, exponente=EXPONENTE, weather_loss=0.0, referencia=PERDIDA_REFERENCIA):
+    """Pérdida log-distancia (dB) con distancia de referencia 1 m"""
+    d = np.maximum(np.asarray(d, dtype=float), 1.0)
+    return referencia + weather_loss + 10.0 * exponente * np.log10(d)
+
+
+def rssi(d, tx_power=TX_POWER_DBM, exponente=EXPONENTE, weather_loss=0.0):
+    """Potencia recibida (dBm) a distancia d"""
+    return tx_power - perdida_trayecto(d, exponente, weather_loss)
+
+
+def sensibilidad(sf):
+    """Sensibilidad del gateway (dBm) para cada SF"""
+    return SENSIBILIDAD_GW[np.asarray(sf, dtype=int) - 7]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo en aire, energía y enlace LoRa por SF")
+    parser.add_argument('--payload', type=int, default=PAYLOAD_APP, help='Bytes de aplicación')
+    parser.add_argument('--tx-power', type=float, default=TX_POWER_DBM, help='Potencia de transmisión (dBm)')
+    parser.add_argument('--exponente', type=float, default=EXPONENTE)
+    parser.add_argument('--weather-loss', type=float, default=0.0, help='Pérdidas climáticas (dB)')
+    args = parser.parse_args()
+
+    sf = SPREADING_FACTORS
+    toa_cc = tiempo_en_aire_cc(sf, args.payload)
+    toa = tiempo_en_aire(sf, args.payload + CABECERA_MAC)
+    energia = energia_transmision(sf, args.tx_power, args.payload)
+    # Distancia a la que el RSSI iguala la sensibilidad
+    margen = args.tx_power - sensibilidad(sf) - PERDIDA_REFERENCIA - args.weather_loss
+    alcance = np.power(10.0, margen / (10.0 * args.exponente))
+
+    print("=" * 80)
+    print("MODELO RADIO LORA POR SPREADING FACTOR")
+    print("=" * 80)
+    print(f"Payload: {args.payload} B | Potencia: {args.tx_power:g} dBm "
+          f"({float(corriente_tx(args.tx_power)):g} mA) | Exponente: {args.exponente:g} | "
+          f"weatherLoss: {args.weather_loss:g} dB")
+    print(f"\n{'SF':>4} {'ToA .cc (ms)':>14} {'ToA PHY (ms)':>14} {'Energía (mJ)':>14} "
+          f"{'Sensib. (dBm)':>14} {'Alcance (km)':>14}")
+    for i, s in enumerate(sf):
+        print(f"{s:>4} {toa_cc[i] * 1000:>14.2f} {toa[i] * 1000:>14.2f} {energia[i] * 1000:>14.3f} "
+              f"{sensibilidad(s):>14.1f} {alcance[i] / 1000:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
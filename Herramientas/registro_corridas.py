@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro Local de Corridas (SQLite)
+Indexa parámetros, archivos de salida, métricas y tiempos de cada simulación
+para consultar barridos sin recorrer ni parsear carpetas.
+
+Uso:
+    python3 registro_corridas.py ingestar ..            # carga el árbol de resultados
+    python3 registro_corridas.py consultar --arquitectura movil --sf 12 --n-devices-min 75
+    python3 registro_corridas.py registrar --resultados movil_p2p_nodes75.csv \\
+        --cobertura cobertura_movil_nodes75.csv --weather-loss 0 --duracion 812
+"""
+
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+RUTA_REGISTRO = 'registro_corridas.sqlite'
+
+# Columnas indexadas (filtros frecuentes de los análisis)
+INDEXADAS = ['arquitectura', 'sf', 'tx_power', 'n_devices', 'weather_loss', 'n_gateways']
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS corridas (
+    id INTEGER PRIMARY KEY,
+    clave TEXT UNIQUE NOT NULL,
+    arquitectura TEXT NOT NULL,
+    escenario TEXT,
+    sf INTEGER,
+    tx_power REAL,
+    n_devices INTEGER,
+    weather_loss REAL,
+    n_gateways INTEGER,
+    p2p INTEGER,
+    sim_time REAL,
+    archivo_resultados TEXT,
+    fila_resultados INTEGER,
+    archivo_cobertura TEXT,
+    archivo_posiciones TEXT,
+    paquetes_enviados REAL,
+    paquetes_recibidos REAL,
+    pdr REAL,
+    latencia_promedio REAL,
+    latencia_min REAL,
+    latencia_max REAL,
+    latencia_std REAL,
+    total_p2p INTEGER,
+    relays_exitosos INTEGER,
+    relays_fallidos INTEGER,
+    eficiencia_p2p REAL,
+    cobertura_promedio REAL,
+    duracion_s REAL,
+    mtime REAL,
+    registrado_en TEXT
+);
+""" + "".join(f"CREATE INDEX IF NOT EXISTS idx_{c} ON corridas({c});\n" for c in INDEXADAS) + """
+CREATE INDEX IF NOT EXISTS idx_arq_sf_nodos ON corridas(arquitectura, sf, n_devices);
+"""
+
+# Encabezados del CSV de resultados de los .cc -> columnas del registro
+COLUMNAS_RESULTADOS = {
+    'Embarcaciones': ('n_devices', int),
+    'GatewaysFijos': ('n_gateways', int),
+    'GatewaysMóviles': ('n_gateways', int),
+    'SF': ('sf', int),
+    'TiempoSim': ('sim_time', float),
+    'PaquetesEnviados': ('paquetes_enviados', float),
+    'PaquetesRecibidos': ('paquetes_recibidos', float),
+    'PDR': ('pdr', float),
+    'LatenciaPromedio': ('latencia_promedio', float),
+    'LatenciaMin': ('latencia_min', float),
+    'LatenciaMax': ('latencia_max', float),
+    'StdDev': ('latencia_std', float),
+    'TotalP2PPackets': ('total_p2p', int),
+    'SuccessfulRelays': ('relays_exitosos', int),
+    'FailedRelays': ('relays_fallidos', int),
+    'P2PEfficiency': ('eficiencia_p2p', float),
+}
+
+# Parámetros por defecto de los .cc y de los scripts de barrido
+POR_DEFECTO = {'sf': 7, 'tx_power': 14.0, 'n_devices': 50, 'weather_loss': 0.0,
+               'n_gateways': 3, 'sim_time': 3600.0}
+
+VARIABLE_ESCENARIO = {'weather': 'weather_loss', 'nodes': 'n_devices', 'gw': 'n_gateways'}
+
+# ========== NOMBRES DE ARCHIVO (líneas mv de los scripts .sh) ==========
+# Cada patrón devuelve el rol del archivo, la clave que agrupa los archivos de
+# una misma corrida dentro de una carpeta y los parámetros que codifica el nombre.
+PATRONES = [
+    # Objetivo 3: tradicional_weather5.csv, movil_p2p_nodes75.csv, ...
+    (re.compile(r'^(?P<arq>tradicional|movil_p2p)_(?P<var>weather|nodes|gw)(?P<valor>\d+)\.csv$'),
+     lambda m: ('resultados', ('ob3', m['arq'][:4], m['var'], m['valor']))),
+    # Objetivo 3: cobertura_trad_weather5.csv, cobertura_movil_nodes75.csv, ...
+    (re.compile(r'^cobertura_(?P<arq>trad|movil)_(?P<var>weather|nodes|gw)(?P<valor>\d+)\.csv$'),
+     lambda m: ('cobertura', ('ob3', m['arq'][:4], m['var'], m['valor']))),
+    # Objetivo 2: movil_3gw_p2p_sf12_tx8_resultados.csv, tradicional_3gw_sf9_tx16_cobertura.csv
+    (re.compile(r'^(?P<arq>tradicional|movil)_3gw(?P<p2p>_p2p)?_sf(?P<sf>\d+)_tx(?P<tx>\d+)'
+                r'_(?P<rol>resultados|cobertura)\.csv$'),
+     lambda m: (m['rol'], ('ob2', m['arq'], m['sf'], m['tx']))),
+    # Nombres originales de los .cc
+    (re.compile(r'^(?P<rol>resultados|cobertura|posiciones)_tradicional_3gw\.csv$'),
+     lambda m: (m['rol'], ('tradicional_3gw',))),
+    (re.compile(r'^resultados_salinas_movil_3gw_(?P<modo>base|p2p)\.csv$'),
+     lambda m: ('resultados', ('movil_3gw', m['modo']))),
+    (re.compile(r'^(?P<rol>cobertura|positions)_salinas_movil_3gw\.csv$'),
+     lambda m: (m['rol'], ('movil_3gw', '*'))),
+    (re.compile(r'^resultados_salinas_gw10(?P<p2p>_p2p)?\.csv$'),
+     lambda m: ('resultados', ('gw10', 'p2p' if m['p2p'] else 'base'))),
+    (re.compile(r'^(?P<rol>cobertura|positions)_salinas_gw10_p2p\.csv$'),
+     lambda m: (m['rol'], ('gw10', '*'))),
+]
+
+
+def clasificar_archivo(nombre):
+    """(rol, clave, parámetros) según el nombre del archivo, o None"""
+    for patron, extraer in PATRONES:
+        m = patron.match(nombre)
+        if not m:
+            continue
+        rol, clave = extraer(m)
+        rol = {'positions': 'posiciones'}.get(rol, rol)
+        grupos = m.groupdict()
+        params = {}
+        arq = grupos.get('arq') or clave[0]
+        params['arquitectura'] = 'tradicional' if arq.startswith('trad') else 'movil'
+        if 'var' in grupos:
+            params[VARIABLE_ESCENARIO[grupos['var']]] = float(grupos['valor'])
+        if grupos.get('sf'):
+            params['sf'] = int(grupos['sf'])
+        if grupos.get('tx'):
+            params['tx_power'] = float(grupos['tx'])
+        if clave[0] == 'gw10':
+            params['n_gateways'] = 10
+        modo = grupos.get('modo')
+        if params['arquitectura'] == 'tradicional':
+            params['p2p'] = 0
+        elif modo is not None:
+            params['p2p'] = int(modo == 'p2p')
+        elif clave[0] in ('ob2', 'ob3'):
+            params['p2p'] = 1
+        elif 'p2p' in grupos:
+            params['p2p'] = int(bool(grupos['p2p']))
+        return rol, clave, params
+    return None
+
+
+def es_puntero_lfs(ruta):
+    """True si el archivo es un puntero de Git LFS sin descargar"""
+    with open(ruta, 'rb') as f:
+        return f.read(40).startswith(b'version https://git-lfs')
+
+
+def leer_resultados(ruta):
+    """Filas del CSV de resultados (el .cc abre en modo append: una fila por corrida)"""
+    if es_puntero_lfs(ruta):
+        return []
+    filas = []
+    with open(ruta, newline='', encoding='utf-8') as f:
+        for fila in csv.DictReader(f):
+            valores = {}
+            for encabezado, texto in fila.items():
+                if encabezado not in COLUMNAS_RESULTADOS or texto in (None, ''):
+                    continue
+                columna, tipo = COLUMNAS_RESULTADOS[encabezado]
+                try:
+                    valores[columna] = tipo(float(texto))
+                except ValueError:
+                    pass
+            filas.append(valores)
+    return filas
+
+
+def cobertura_promedio(ruta):
+    """Promedio de coverage_percent del CSV de CalculateCoverage"""
+    if ruta is None or es_puntero_lfs(ruta):
+        return None
+    total, n = 0.0, 0
+    with open(ruta, newline='', encoding='utf-8') as f:
+        for fila in csv.DictReader(f):
+            try:
+                total += float(fila['coverage_percent'])
+                n += 1
+            except (KeyError, TypeError, ValueError):
+                continue
+    return total / n if n else None
+
+
+class RegistroCorridas:
+    """Registro de corridas sobre sqlite3 (rutas guardadas relativas a la base)"""
+
+    def __init__(self, ruta=RUTA_REGISTRO):
+        self.ruta = Path(ruta)
+        self.base = self.ruta.resolve().parent
+        self.con = sqlite3.connect(str(self.ruta))
+        self.con.row_factory = sqlite3.Row
+        self.con.executescript(ESQUEMA)
+
+    def cerrar(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _relativa(self, ruta):
+        if ruta is None:
+            return None
+        return os.path.relpath(Path(ruta).resolve(), self.base)
+
+    def _absoluta(self, ruta):
+        return None if ruta is None else str((self.base / ruta).resolve())
+
+    def _fila(self, campos):
+        for c in ('archivo_resultados', 'archivo_cobertura', 'archivo_posiciones'):
+            campos[c] = self._relativa(campos.get(c))
+        ancla = campos['archivo_resultados'] or campos['archivo_cobertura']
+        campos['clave'] = f"{ancla}#{campos.get('fila_resultados') or 0}"
+        campos.setdefault('registrado_en', time.strftime('%Y-%m-%d %H:%M:%S'))
+        return campos
+
+    def _insertar(self, filas):
+        if not filas:
+            return 0
+        columnas = sorted({c for f in filas for c in f})
+        sql = (f"INSERT INTO corridas ({', '.join(columnas)}) "
+               f"VALUES ({', '.join(':' + c for c in columnas)}) "
+               f"ON CONFLICT(clave) DO UPDATE SET "
+               # Lo que no se conoce en esta pasada (p. ej. la duración) se conserva
+               + ', '.join(f"{c}=COALESCE(excluded.{c}, corridas.{c})"
+                           for c in columnas if c != 'clave'))
+        with self.con:
+            self.con.executemany(sql, [{c: f.get(c) for c in columnas} for f in filas])
+        return len(filas)
+
+    def registrar(self, archivo_resultados=None, archivo_cobertura=None,
+                  archivo_posiciones=None, escenario=None, duracion_s=None, **params):
+        """Registra una corrida (o todas las filas de su CSV de resultados)"""
+        if archivo_resultados is None and archivo_cobertura is None:
+            raise ValueError("Se requiere al menos el CSV de resultados o el de cobertura")
+        clasif = clasificar_archivo(os.path.basename(archivo_resultados or archivo_cobertura))
+        base = dict(POR_DEFECTO)
+        if clasif is not None:
+            base.update(clasif[2])
+        base.update({k: v for k, v in params.items() if v is not None})
+        if 'arquitectura' not in base:
+            raise ValueError("No se pudo deducir la arquitectura: indique --arquitectura")
+
+        ancla = archivo_resultados or archivo_cobertura
+        if escenario is None:
+            escenario = os.path.basename(os.path.dirname(os.path.abspath(ancla)))
+        comunes = dict(base, escenario=escenario, duracion_s=duracion_s,
+                       archivo_resultados=archivo_resultados,
+                       archivo_cobertura=archivo_cobertura,
+                       archivo_posiciones=archivo_posiciones,
+                       cobertura_promedio=cobertura_promedio(archivo_cobertura))
+        comunes['mtime'] = os.path.getmtime(ancla)
+
+        filas_csv = leer_resultados(archivo_resultados) if archivo_resultados else []
+        filas = []
+        for i, valores in enumerate(filas_csv or [{}]):
+            fila = dict(comunes, fila_resultados=i)
+            # Lo que el .cc escribió manda sobre lo deducido del nombre,
+            # salvo lo indicado explícitamente por el usuario
+            fila.update({k: v for k, v in valores.items() if params.get(k) is None})
+            filas.append(self._fila(fila))
+        return self._insertar(filas)
+
+    def ingestar_arbol(self, raiz):
+        """Recorre el árbol de resultados y registra todas las corridas reconocidas"""
+        grupos = {}
+        for carpeta, _, archivos in os.walk(raiz):
+            for nombre in archivos:
+                clasif = clasificar_archivo(nombre)
+                if clasif is None:
+                    continue
+                rol, clave, params = clasif
+                grupo = grupos.setdefault((carpeta, clave), {'params': {}})
+                grupo[rol] = os.path.join(carpeta, nombre)
+                grupo['params'].update(params)
+
+        # Los archivos compartidos (clave con '*') se asocian a cada variante
+        for (carpeta, clave), grupo in list(grupos.items()):
+            if clave[-1] == '*':
+                continue
+            comodin = grupos.get((carpeta, clave[:-1] + ('*',)))
+            if comodin:
+                for rol in ('cobertura', 'posiciones'):
+                    grupo.setdefault(rol, comodin.get(rol))
+
+        total = 0
+        for (carpeta, clave), grupo in sorted(grupos.items()):
+            if clave[-1] == '*' or ('resultados' not in grupo and 'cobertura' not in grupo):
+                continue
+            total += self.registrar(archivo_resultados=grupo.get('resultados'),
+                                    archivo_cobertura=grupo.get('cobertura'),
+                                    archivo_posiciones=grupo.get('posiciones'),
+                                    **grupo['params'])
+        return total
+
+    def consultar(self, orden='id', **filtros):
+        """
+        Corridas que cumplen los filtros. Cada columna admite igualdad
+        (sf=12) y rangos con sufijo _min/_max (n_devices_min=75).
+        """
+        condiciones, valores = [], []
+        for nombre, valor in filtros.items():
+            if valor is None:
+                continue
+            if nombre.endswith('_min'):
+                columna, op = nombre[:-4], '>='
+            elif nombre.endswith('_max'):
+                columna, op = nombre[:-4], '<='
+            else:
+                columna, op = nombre, '='
+            if not re.fullmatch(r'[a-z_0-9]+', columna):
+                raise ValueError(f"Columna inválida: {columna}")
+            condiciones.append(f"{columna} {op} ?")
+            valores.append(valor)
+        if not re.fullmatch(r'[a-z_0-9]+( desc)?', orden):
+            raise ValueError(f"Orden inválido: {orden}")
+        sql = "SELECT * FROM corridas"
+        if condiciones:
+            sql += " WHERE " + " AND ".join(condiciones)
+        sql += f" ORDER BY {orden}"
+        corridas = []
+        for fila in self.con.execute(sql, valores):
+            corrida = dict(fila)
+            for c in ('archivo_resultados', 'archivo_cobertura', 'archivo_posiciones'):
+                corrida[c] = self._absoluta(corrida[c])
+            corridas.append(corrida)
+        return corridas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Registro local de corridas (SQLite)")
+    parser.add_argument('--registro', default=RUTA_REGISTRO, help='Archivo de la base de datos')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_ing = sub.add_parser('ingestar', help='Registrar todo un árbol de resultados')
+    p_ing.add_argument('raiz', nargs='?', default='.')
+
+    filtros = [('--arquitectura', str), ('--escenario', str), ('--sf', int), ('--tx-power', float),
+               ('--n-devices', int), ('--weather-loss', float), ('--n-gateways', int), ('--p2p', int)]
+
+    p_reg = sub.add_parser('registrar', help='Registrar una corrida (p. ej. tras su mv)')
+    p_reg.add_argument('--resultados')
+    p_reg.add_argument('--cobertura')
+    p_reg.add_argument('--posiciones')
+    p_reg.add_argument('--duracion', type=float, help='Duración real de la corrida (s)')
+    for opcion, tipo in filtros:
+        p_reg.add_argument(opcion, type=tipo)
+
+    p_con = sub.add_parser('consultar', help='Consultar corridas registradas')
+    for opcion, tipo in filtros:
+        p_con.add_argument(opcion, type=tipo)
+        if tipo is not str:
+            p_con.add_argument(opcion + '-min', type=tipo)
+            p_con.add_argument(opcion + '-max', type=tipo)
+    p_con.add_argument('--orden', default='id')
+
+    args = parser.parse_args()
+    with RegistroCorridas(args.registro) as registro:
+        if args.comando == 'ingestar':
+            inicio = time.perf_counter()
+            n = registro.ingestar_arbol(args.raiz)
+            print(f"✓ {n} corridas registradas en {time.perf_counter() - inicio:.2f} s "
+                  f"({args.registro})")
+
+        elif args.comando == 'registrar':
+            params = {k: v for k, v in vars(args).items()
+                      if k not in ('registro', 'comando', 'resultados', 'cobertura',
+                                   'posiciones', 'duracion', 'escenario')}
+            n = registro.registrar(archivo_resultados=args.resultados,
+                                   archivo_cobertura=args.cobertura,
+                                   archivo_posiciones=args.posiciones,
+                                   escenario=args.escenario, duracion_s=args.duracion,
+                                   **params)
+            print(f"✓ {n} corrida(s) registrada(s)")
+
+        else:
+            filtros_sql = {k: v for k, v in vars(args).items()
+                           if k not in ('registro', 'comando', 'orden')}
+            inicio = time.perf_counter()
+            corridas = registro.consultar(orden=args.orden, **filtros_sql)
+            ms = (time.perf_counter() - inicio) * 1000
+            for c in corridas:
+                pdr = f"{c['pdr']:.2f}%" if c['pdr'] is not None else "—"
+                print(f"{c['id']:>4} {c['arquitectura']:<11} {c['escenario'] or '':<28} "
+                      f"SF{c['sf']} {c['tx_power']:g} dBm {c['n_devices']} nodos "
+                      f"{c['n_gateways']} GW {c['weather_loss']:g} dB  PDR {pdr}  "
+                      f"{c['archivo_resultados'] or c['archivo_cobertura']}")
+            print(f"✓ {len(corridas)} corridas ({ms:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
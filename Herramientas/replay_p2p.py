@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Replay de Decisiones de Relay P2P a partir de Trazas
+Reproduce fuera de ns-3 los contadores TotalP2PPackets / SuccessfulRelays /
+FailedRelays de los .cc móviles a partir del CSV de posiciones.
+
+Dos modos:
+  - periódico (por defecto): el monitoreo cada 120 s programado en main();
+    cada embarcación tiene 20% de probabilidad de intentar P2P, busca vecinos
+    entre las embarcaciones a menos de 3 km y acierta con probabilidad 80%.
+  - eventos (--eventos time,node_id): la lógica de OnTransmissionFailedCallback;
+    vecinos entre todos los nodos de NodeList a menos de 3 km, ordenados por
+    RSSI log-distancia, relay = mejor RSSI, éxito con probabilidad 80%.
+
+Las búsquedas de vecinos se resuelven por lotes con un árbol KD por frame; el
+único paso secuencial es el consumo de números aleatorios, que sigue el orden
+del .cc. Con --rng glibc se emula rand() sin srand() (semilla 1), como en ns-3.
+
+Uso:
+    python3 replay_p2p.py positions_salinas_movil_3gw.csv --resultados resultados_salinas_movil_3gw_p2p.csv
+    python3 replay_p2p.py positions_salinas_movil_3gw.csv --eventos fallos.csv --rng numpy --semilla 7
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from radio_lora import P2P_RELAY_RANGE, TX_POWER_DBM
+from trazas import cargar_trazas
+
+RAND_MAX = 2147483647
+INTERVALO_MONITOREO = 120.0
+PROB_NECESITA_P2P = 0.2
+PROB_EXITO = 0.8
+
+
+class RandGlibc:
+    """rand() de glibc (generador aditivo TYPE_3) con la semilla por defecto"""
+
+    def __init__(self, semilla=1):
+        r = [semilla]
+        for i in range(1, 31):
+            r.append((16807 * r[i - 1]) % 2147483647)
+        for i in range(31, 34):
+            r.append(r[i - 31])
+        for i in range(34, 344):
+            r.append((r[i - 31] + r[i - 3]) & 0xFFFFFFFF)
+        self._r = r[-34:]
+
+    def rand(self):
+        r = self._r
+        nuevo = (r[-31] + r[-3]) & 0xFFFFFFFF
+        r.append(nuevo)
+        del r[0]
+        return nuevo >> 1
+
+    def uniforme(self):
+        """(double)rand() / RAND_MAX"""
+        return self.rand() / RAND_MAX
+
+
+class RandNumpy:
+    """Alternativa con semilla explícita (no reproduce la secuencia de ns-3)"""
+
+    def __init__(self, semilla=1, bloque=4096):
+        self._gen = np.random.default_rng(semilla)
+        self._bloque = bloque
+        self._buffer = np.empty(0)
+        self._pos = 0
+
+    def uniforme(self):
+        if self._pos >= len(self._buffer):
+            self._buffer = self._gen.random(self._bloque)
+            self._pos = 0
+        self._pos += 1
+        return float(self._buffer[self._pos - 1])
+
+
+def crear_rng(tipo, semilla):
+    return RandGlibc(semilla) if tipo == 'glibc' else RandNumpy(semilla)
+
+
+def rssi_log_distancia(d, tx_power=TX_POWER_DBM):
+    """RSSI de OnTransmissionFailedCallback: 14 - (7.7 + 10·2.2·log10(d/1000))"""
+    with np.errstate(divide='ignore'):
+        return tx_power - (7.7 + 10.0 * 2.2 * np.log10(np.asarray(d, dtype=float) / 1000.0))
+
+
+def contar_vecinos(xy, alcance=P2P_RELAY_RANGE):
+    """Vecinos de cada nodo a distancia estrictamente menor que el alcance"""
+    validos = ~np.isnan(xy[:, 0])
+    cuenta = np.zeros(len(xy), dtype=np.int32)
+    if validos.sum() < 2:
+        return cuenta
+    pares = cKDTree(xy[validos]).query_pairs(np.nextafter(alcance, 0), output_type='ndarray')
+    cuenta[validos] = np.bincount(pares.ravel(), minlength=int(validos.sum()))
+    return cuenta
+
+
+def replay_periodico(trazas, sim_time, rng, alcance=P2P_RELAY_RANGE, intervalo=INTERVALO_MONITOREO,
+                     prob_p2p=PROB_NECESITA_P2P, prob_exito=PROB_EXITO):
+    """Monitoreo P2P periódico de main(); devuelve los eventos como DataFrame"""
+    boats = trazas.seleccionar('boat')
+    filas = []
+    t = intervalo
+    while t < sim_time:
+        f = boats.indice(t)
+        vecinos = contar_vecinos(boats.xy[f], alcance)
+        presentes = ~np.isnan(boats.xy[f, :, 0])
+        # Mismo orden de consumo de rand() que el .cc: embarcaciones en orden de id
+        for i in range(len(boats.ids)):
+            if rng.uniforme() >= prob_p2p:
+                continue
+            if not presentes[i]:
+                continue
+            exito = vecinos[i] > 0 and rng.uniforme() < prob_exito
+            filas.append((t, int(boats.ids[i]), int(vecinos[i]), -1, np.nan, bool(exito)))
+        t += intervalo
+    return pd.DataFrame(filas, columns=['time', 'node_id', 'vecinos', 'relay', 'rssi_relay', 'exito'])
+
+
+def replay_eventos(trazas, eventos, rng, alcance=P2P_RELAY_RANGE, prob_exito=PROB_EXITO):
+    """
+    OnTransmissionFailedCallback para cada (time, node_id). Los eventos se
+    agrupan por frame y cada frame se consulta una sola vez en el árbol KD.
+    """
+    eventos = eventos.sort_values('time', kind='stable').reset_index(drop=True)
+    frames = np.array([trazas.indice(t) for t in eventos['time']])
+    fila_nodo = np.searchsorted(trazas.ids, eventos['node_id'].to_numpy())
+    fila_nodo = np.clip(fila_nodo, 0, len(trazas.ids) - 1)
+    conocidos = trazas.ids[fila_nodo] == eventos['node_id'].to_numpy()
+
+    n_ev = len(eventos)
+    vecinos = np.zeros(n_ev, dtype=np.int32)
+    relay = np.full(n_ev, -1, dtype=np.int64)
+    rssi_relay = np.full(n_ev, np.nan)
+
+    for f in np.unique(frames):
+        sel = np.flatnonzero((frames == f) & conocidos)
+        xy = trazas.xy[f]
+        validos = np.flatnonzero(~np.isnan(xy[:, 0]))
+        if len(sel) == 0 or len(validos) == 0:
+            continue
+        arbol = cKDTree(xy[validos])
+        origenes = xy[fila_nodo[sel]]
+        con_pos = ~np.isnan(origenes[:, 0])
+        listas = arbol.query_ball_point(np.nan_to_num(origenes), np.nextafter(alcance, 0))
+        for k, e in enumerate(sel):
+            if not con_pos[k]:
+                continue
+            cand = validos[np.asarray(listas[k], dtype=int)]
+            cand = cand[cand != fila_nodo[e]]
+            if len(cand) == 0:
+                continue
+            d = np.sqrt(((xy[cand] - origenes[k]) ** 2).sum(axis=1))
+            rssi = rssi_log_distancia(d)
+            # std::sort por RSSI descendente: el relay es el primero
+            mejor = int(np.argmax(rssi))
+            vecinos[e] = len(cand)
+            relay[e] = int(trazas.ids[cand[mejor]])
+            rssi_relay[e] = rssi[mejor]
+
+    # Consumo secuencial de rand(): una tirada por evento con vecinos
+    exito = np.zeros(n_ev, dtype=bool)
+    for e in range(n_ev):
+        if vecinos[e] > 0:
+            exito[e] = rng.uniforme() < prob_exito
+    return pd.DataFrame({'time': eventos['time'], 'node_id': eventos['node_id'],
+                         'vecinos': vecinos, 'relay': relay, 'rssi_relay': rssi_relay,
+                         'exito': exito})
+
+
+def contadores(decisiones):
+    """TotalP2PPackets, SuccessfulRelays, FailedRelays, P2PEfficiency"""
+    total = len(decisiones)
+    exitos = int(decisiones['exito'].sum())
+    eficiencia = 100.0 * exitos / total if total else 0.0
+    return total, exitos, total - exitos, eficiencia
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay de decisiones de relay P2P")
+    parser.add_argument('posiciones', help='CSV de LogPositions (time,node_id,x,y,type)')
+    parser.add_argument('--eventos', help='CSV time,node_id de transmisiones fallidas')
+    parser.add_argument('--sim-time', type=float, default=3600)
+    parser.add_argument('--alcance-p2p', type=float, default=P2P_RELAY_RANGE)
+    parser.add_argument('--intervalo', type=float, default=INTERVALO_MONITOREO)
+    parser.add_argument('--rng', choices=['glibc', 'numpy'], default='glibc',
+                        help='glibc reproduce rand() de ns-3; numpy usa --semilla')
+    parser.add_argument('--semilla', type=int, default=1)
+    parser.add_argument('--resultados', help='CSV de resultados del .cc para comparar')
+    parser.add_argument('--salida', help='CSV con la decisión de cada evento')
+    args = parser.parse_args()
+
+    trazas = cargar_trazas(args.posiciones)
+    rng = crear_rng(args.rng, args.semilla)
+    inicio = time.perf_counter()
+    if args.eventos:
+        eventos = pd.read_csv(args.eventos)
+        eventos.columns = eventos.columns.str.strip()
+        decisiones = replay_eventos(trazas, eventos, rng, args.alcance_p2p)
+        modo = f"eventos ({args.eventos})"
+    else:
+        decisiones = replay_periodico(trazas, args.sim_time, rng, args.alcance_p2p, args.intervalo)
+        modo = f"monitoreo periódico cada {args.intervalo:g} s"
+    duracion = time.perf_counter() - inicio
+
+    total, exitos, fallidos, eficiencia = contadores(decisiones)
+    print("=" * 70)
+    print("REPLAY DE RELAYS P2P")
+    print("=" * 70)
+    print(f"Modo: {modo} | RNG: {args.rng} (semilla {args.semilla})")
+    print(f"✓ {total} decisiones en {duracion * 1000:.1f} ms")
+    print(f"  TotalP2PPackets:  {total}")
+    print(f"  SuccessfulRelays: {exitos}")
+    print(f"  FailedRelays:     {fallidos}")
+    print(f"  P2PEfficiency:    {eficiencia:.2f}%")
+
+    if args.resultados:
+        res = pd.read_csv(args.resultados).iloc[-1]
+        esperado = (int(res['TotalP2PPackets']), int(res['SuccessfulRelays']),
+                    int(res['FailedRelays']))
+        if esperado == (total, exitos, fallidos):
+            print(f"✓ Coincide con {args.resultados}")
+        else:
+            print(f"⚠️  {args.resultados}: Total {esperado[0]}, Exitosos {esperado[1]}, "
+                  f"Fallidos {esperado[2]}")
+
+    if args.salida:
+        decisiones.to_csv(args.salida, index=False)
+        print(f"✓ Decisiones guardadas: {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
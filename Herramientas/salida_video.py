@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Salida de Video por Streaming
+Envía los frames renderizados directamente a ffmpeg (MP4 / WebM / GIF)
+con memoria constante, sin acumular la animación completa en RAM.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import matplotlib
+import matplotlib.animation as animation
+
+# Argumentos de codificación por formato (la entrada siempre es RGBA crudo)
+PAD_PAR = 'pad=ceil(iw/2)*2:ceil(ih/2)*2'  # libx264/libvpx exigen dimensiones pares
+
+FORMATOS = {
+    'mp4': ['-vf', PAD_PAR, '-c:v', 'libx264', '-preset', 'medium', '-crf', '20',
+            '-pix_fmt', 'yuv420p', '-movflags', '+faststart'],
+    'webm': ['-vf', PAD_PAR, '-c:v', 'libvpx-vp9', '-b:v', '0', '-crf', '32',
+             '-row-mt', '1', '-pix_fmt', 'yuv420p'],
+    # El GIF se codifica en dos pasadas desde un intermedio sin pérdidas (ver cerrar())
+    'gif': ['-c:v', 'ffv1', '-level', '3', '-g', '1'],
+}
+
+
+def ruta_ffmpeg():
+    """Ejecutable de ffmpeg (respeta rcParams['animation.ffmpeg_path'])"""
+    return shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+
+
+def formato_desde_ruta(ruta_salida):
+    """Deduce el formato a partir de la extensión del archivo"""
+    extension = os.path.splitext(ruta_salida)[1].lower().lstrip('.')
+    if extension not in FORMATOS:
+        raise ValueError(f"Formato no soportado: '{extension}' (use {', '.join(FORMATOS)})")
+    return extension
+
+
+def capturar_frame(fig):
+    """Renderiza la figura y devuelve una copia del buffer RGBA del canvas"""
+    fig.canvas.draw()
+    return bytes(fig.canvas.buffer_rgba())
+
+
+class CodificadorStream:
+    """
+    Codificador ffmpeg alimentado por tubería.
+
+    Un hilo escritor consume una cola acotada de frames, de modo que la
+    codificación (proceso ffmpeg) se solapa con el renderizado y la memoria
+    queda limitada a `tam_cola` frames sin importar la duración.
+    """
+
+    def __init__(self, ruta_salida, ancho, alto, fps=5, formato=None, tam_cola=8):
+        self.ruta_salida = ruta_salida
+        self.ancho = ancho
+        self.alto = alto
+        self.fps = fps
+        self.formato = formato or formato_desde_ruta(ruta_salida)
+        self.frames_escritos = 0
+        self.tiempo_escritura = 0.0   # s del hilo escritor entregando frames a ffmpeg
+
+        self._ffmpeg = ruta_ffmpeg()
+        if self._ffmpeg is None:
+            raise RuntimeError("ffmpeg no está instalado o no está en el PATH")
+
+        self._tmpdir = tempfile.mkdtemp(prefix='salida_video_')
+        if self.formato == 'gif':
+            destino = os.path.join(self._tmpdir, 'intermedio.mkv')
+        else:
+            destino = ruta_salida
+
+        cmd = [self._ffmpeg, '-y', '-loglevel', 'error',
+               '-f', 'rawvideo', '-pix_fmt', 'rgba',
+               '-s', f'{ancho}x{alto}', '-r', str(fps), '-i', 'pipe:0',
+               *FORMATOS[self.formato], destino]
+
+        # stderr a archivo: una tubería sin leer podría bloquear a ffmpeg
+        self._log = open(os.path.join(self._tmpdir, 'ffmpeg.log'), 'w+b')
+        self._proceso = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=self._log)
+        self._destino = destino
+
+        self._cola = queue.Queue(maxsize=tam_cola)
+        self._error = None
+        self._hilo = threading.Thread(target=self._escribir, daemon=True)
+        self._hilo.start()
+
+    def _escribir(self):
+        while True:
+            frame = self._cola.get()
+            if frame is None:
+                break
+            if self._error is not None:
+                continue  # vaciar la cola sin escribir
+            inicio = time.perf_counter()
+            try:
+                self._proceso.stdin.write(frame)
+            except (BrokenPipeError, OSError) as e:
+                self._error = e
+            self.tiempo_escritura += time.perf_counter() - inicio
+
+    def _mensaje_ffmpeg(self):
+        self._log.flush()
+        self._log.seek(0)
+        return self._log.read().decode('utf-8', errors='replace').strip()[-2000:]
+
+    def agregar_frame(self, frame):
+        """Encola un frame RGBA (bytes de ancho*alto*4)"""
+        if self._error is not None:
+            raise RuntimeError(f"ffmpeg terminó inesperadamente: {self._mensaje_ffmpeg()}")
+        if len(frame) != self.ancho * self.alto * 4:
+            raise ValueError(f"Tamaño de frame inválido: {len(frame)} bytes "
+                             f"(esperado {self.ancho}x{self.alto}x4)")
+        self._cola.put(frame)  # bloquea si la cola está llena (contrapresión)
+        self.frames_escritos += 1
+
+    def cerrar(self):
+        """Vacía la cola, cierra ffmpeg y completa la pasada de paleta del GIF"""
+        self._cola.put(None)
+        self._hilo.join()
+        try:
+            self._proceso.stdin.close()
+        except OSError:
+            pass
+        codigo = self._proceso.wait()
+        try:
+            if codigo != 0 or self._error is not None:
+                raise RuntimeError(f"ffmpeg falló (código {codigo}): {self._mensaje_ffmpeg()}")
+            if self.formato == 'gif':
+                self._codificar_gif()
+        finally:
+            self._log.close()
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def _codificar_gif(self):
+        """Paleta optimizada en dos pasadas leyendo el intermedio desde disco"""
+        paleta = os.path.join(self._tmpdir, 'paleta.png')
+        base = [self._ffmpeg, '-y', '-loglevel', 'error']
+        subprocess.run(base + ['-i', self._destino,
+                               '-vf', 'palettegen=stats_mode=diff', paleta],
+                       check=True, stderr=self._log)
+        subprocess.run(base + ['-i', self._destino, '-i', paleta,
+                               '-lavfi', 'paletteuse=dither=bayer:bayer_scale=5:diff_mode=rectangle',
+                               '-loop', '0', self.ruta_salida],
+                       check=True, stderr=self._log)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.cerrar()
+        else:
+            # Error durante el renderizado: abortar sin ocultar la excepción original
+            self._cola.put(None)
+            self._hilo.join()
+            self._proceso.kill()
+            self._proceso.wait()
+            self._log.close()
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+        return False
+
+
+def guardar_animacion(fig, dibujar_frame, n_frames, ruta_salida, fps=5, dpi=100,
+                      tam_cola=8, capturar=capturar_frame):
+    """
+    Renderiza `n_frames` llamando a dibujar_frame(i) y los codifica por streaming.
+    Si ffmpeg no está disponible y la salida es GIF, recurre al writer 'pillow'.
+    """
+    formato = formato_desde_ruta(ruta_salida)
+
+    if ruta_ffmpeg() is None:
+        if formato != 'gif':
+            raise RuntimeError(f"Se requiere ffmpeg para generar {formato.upper()}")
+        print("⚠️  ffmpeg no encontrado: usando writer 'pillow' (frames en memoria)")
+        anim = animation.FuncAnimation(fig, dibujar_frame, frames=n_frames,
+                                       interval=1000 / fps, repeat=False)
+        anim.save(ruta_salida, writer='pillow', fps=fps, dpi=dpi)
+        return
+
+    fig.set_dpi(dpi)
+    codificador = None
+    try:
+        for i in range(n_frames):
+            dibujar_frame(i)
+            frame = capturar(fig)
+            if codificador is None:
+                ancho, alto = fig.canvas.get_width_height(physical=True)
+                codificador = CodificadorStream(ruta_salida, ancho, alto, fps=fps,
+                                                formato=formato, tam_cola=tam_cola)
+            codificador.agregar_frame(frame)
+            if (i + 1) % 50 == 0 or i + 1 == n_frames:
+                print(f"  Frames codificados: {i + 1}/{n_frames}")
+    except BaseException:
+        if codificador is not None:
+            codificador.__exit__(*sys.exc_info())
+        raise
+    if codificador is not None:
+        codificador.cerrar()
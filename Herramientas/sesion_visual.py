@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sesión de Datos Compartida entre Renderizadores
+Cada script de Ob1 leía su CSV de posiciones y recalculaba la topología por
+su cuenta. Aquí los CSV, sus Trazas y las topologías (TopologiaTrazas) se
+memorizan por proceso: corriendo varios scripts en el mismo intérprete
+(visuales_ob1.py) cada traza se lee una vez y cada topología se calcula una
+vez. Un script suelto usa la misma API y solo paga su propia carga.
+
+Los scripts piden sus archivos por el nombre local de siempre
+('positions_mobile.csv'); `registrar` asocia ese nombre a una ruta o a un
+DataFrame ya cargado, y sin registro se lee el archivo del directorio actual.
+
+Uso:
+    import sesion_visual as sesion
+    df = sesion.posiciones('positions_fixed.csv')
+    topologia = sesion.topologia('positions_fixed.csv', alcance=15000)
+    red = topologia.frame(0)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from topologia_red import LORA_MAX_RANGE, TopologiaTrazas
+from trazas import Trazas
+
+_registro = {}          # nombre local -> ruta o DataFrame
+_posiciones = {}        # clave -> DataFrame
+_trazas = {}            # clave -> Trazas
+_topologias = {}        # (clave, alcance, estricto, grilla, metodo) -> TopologiaTrazas
+
+
+def _clave(nombre):
+    return nombre if nombre in _registro else os.path.abspath(nombre)
+
+
+def registrar(nombre, origen):
+    """Asocia un nombre local a una ruta de CSV o a un DataFrame de LogPositions"""
+    _registro[nombre] = origen
+    clave = _clave(nombre)
+    _posiciones.pop(clave, None)
+    _trazas.pop(clave, None)
+    for k in [k for k in _topologias if k[0] == clave]:
+        del _topologias[k]
+
+
+def posiciones(nombre):
+    """DataFrame del CSV (FileNotFoundError con e.filename si no existe)"""
+    clave = _clave(nombre)
+    if clave not in _posiciones:
+        origen = _registro.get(nombre, nombre)
+        if isinstance(origen, pd.DataFrame):
+            df = origen
+        else:
+            df = pd.read_csv(origen)
+            df.columns = df.columns.str.strip()
+        _posiciones[clave] = df
+    return _posiciones[clave]
+
+
+def trazas(nombre):
+    """Trazas densas del CSV"""
+    clave = _clave(nombre)
+    if clave not in _trazas:
+        _trazas[clave] = Trazas.desde_dataframe(posiciones(nombre))
+    return _trazas[clave]
+
+
+def topologia(nombre, alcance=LORA_MAX_RANGE, estricto=False, grilla=None, metodo='lineal'):
+    """
+    TopologiaTrazas de la traza, o de la traza remuestreada en `grilla`. Si el
+    remuestreo reproduce exactamente la traza se reutiliza la topología cruda.
+    """
+    base = trazas(nombre)
+    datos = base
+    clave_grilla = None
+    if grilla is not None:
+        grilla = np.asarray(grilla, dtype=float)
+        datos = base.remuestrear(grilla, metodo)
+        if not (np.array_equal(grilla, base.tiempos)
+                and np.array_equal(datos.xy, base.xy, equal_nan=True)):
+            clave_grilla = (grilla.tobytes(), metodo)
+    clave = (_clave(nombre), float(alcance), estricto, clave_grilla)
+    if clave not in _topologias:
+        _topologias[clave] = TopologiaTrazas(datos, alcance, estricto)
+    return _topologias[clave]
+
+
+def precalcular(pedidos):
+    """Carga y calcula por adelantado: [(nombre, alcance, estricto), ...]"""
+    for nombre, alcance, estricto in pedidos:
+        topologia(nombre, alcance, estricto)
+
+
+def resumen():
+    """Cuántas trazas y topologías hay en memoria"""
+    return {'trazas': len(_trazas), 'topologias': len(_topologias)}
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sketches de Cuantiles Fusionables (latencia y energía por paquete)
+Resume distribuciones por paquete en memoria acotada y permite combinarlas
+entre corridas y semillas sin guardar las muestras crudas.
+
+- SketchDD: cubetas logarítmicas (estilo DDSketch) con error relativo
+  acotado por `precision` en todos los cuantiles (p50, p95, p99, p99.9).
+- Histograma: conteos sobre bordes fijos, fusionables sumando.
+
+Uso:
+    python3 sketch_cuantiles.py construir salinas_sf12_s1.log --salida sf12_s1.json
+    python3 sketch_cuantiles.py fusionar sf12_s*.json --salida sf12.json
+    python3 sketch_cuantiles.py reporte sf7.json sf12.json
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+CUANTILES = (0.5, 0.95, 0.99, 0.999)
+
+# Bordes por defecto de los histogramas
+BORDES = {
+    'latencia_ms': np.arange(0, 10001, 50),
+    'energia_mj': np.arange(0, 1001, 5),
+}
+UNIDADES = {'latencia_ms': 'ms', 'energia_mj': 'mJ'}
+
+
+class SketchDD:
+    """
+    Sketch de cuantiles con error relativo `precision`: el valor x cae en la
+    cubeta k = ceil(log_gamma(x)), gamma = (1 + precision) / (1 - precision).
+    Las cubetas se guardan como un arreglo denso desde la clave mínima; si se
+    supera `max_cubetas` se colapsan las más bajas (se protege la cola alta).
+    """
+
+    VALOR_MIN = 1e-9   # por debajo se cuenta como cero
+
+    def __init__(self, precision=0.01, max_cubetas=2048):
+        self.precision = precision
+        self.max_cubetas = max_cubetas
+        self.gamma = (1 + precision) / (1 - precision)
+        self._log_gamma = np.log(self.gamma)
+        self.cuentas = np.zeros(0, dtype=np.int64)
+        self.clave_min = 0
+        self.ceros = 0
+        self.n = 0
+        self.suma = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def agregar(self, valores):
+        """Agrega un lote de valores (se ignoran NaN)"""
+        v = np.asarray(valores, dtype=float).ravel()
+        v = v[~np.isnan(v)]
+        if len(v) == 0:
+            return
+        if (v < 0).any():
+            raise ValueError("SketchDD solo admite valores no negativos")
+        self.n += len(v)
+        self.suma += float(v.sum())
+        self.minimo = min(self.minimo, float(v.min()))
+        self.maximo = max(self.maximo, float(v.max()))
+        positivos = v[v > self.VALOR_MIN]
+        self.ceros += len(v) - len(positivos)
+        if len(positivos):
+            claves = np.ceil(np.log(positivos) / self._log_gamma).astype(np.int64)
+            k0 = int(claves.min())
+            self._acumular(k0, np.bincount(claves - k0))
+
+    def _acumular(self, k0, cuentas):
+        """Suma conteos densos que empiezan en la clave k0"""
+        if len(cuentas) == 0:
+            return
+        if len(self.cuentas) == 0:
+            self.clave_min, self.cuentas = k0, np.asarray(cuentas, dtype=np.int64).copy()
+        else:
+            inicio = min(self.clave_min, k0)
+            fin = max(self.clave_min + len(self.cuentas), k0 + len(cuentas))
+            nuevas = np.zeros(fin - inicio, dtype=np.int64)
+            nuevas[self.clave_min - inicio:self.clave_min - inicio + len(self.cuentas)] += self.cuentas
+            nuevas[k0 - inicio:k0 - inicio + len(cuentas)] += cuentas
+            self.clave_min, self.cuentas = inicio, nuevas
+        self._colapsar()
+
+    def _colapsar(self):
+        exceso = len(self.cuentas) - self.max_cubetas
+        if exceso > 0:
+            self.cuentas[exceso] += self.cuentas[:exceso].sum()
+            self.cuentas = self.cuentas[exceso:]
+            self.clave_min += exceso
+
+    def fusionar(self, otro):
+        """Incorpora otro sketch con la misma precisión"""
+        if not np.isclose(self.precision, otro.precision):
+            raise ValueError("Solo se pueden fusionar sketches con la misma precisión")
+        self._acumular(otro.clave_min, otro.cuentas)
+        self.ceros += otro.ceros
+        self.n += otro.n
+        self.suma += otro.suma
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        return self
+
+    @property
+    def promedio(self):
+        return self.suma / self.n if self.n else np.nan
+
+    def cuantil(self, q):
+        """Cuantil(es) estimado(s); q escalar o arreglo en [0, 1]"""
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        rango = q * (self.n - 1)
+        acumulado = self.ceros + np.cumsum(self.cuentas)
+        i = np.searchsorted(acumulado, rango, side='right')
+        i = np.minimum(i, len(self.cuentas) - 1) if len(self.cuentas) else i
+        valores = 2 * self.gamma ** (self.clave_min + i) / (self.gamma + 1)
+        valores = np.where(rango < self.ceros, 0.0, valores)
+        return np.clip(valores, self.minimo, self.maximo)
+
+    def a_dict(self):
+        # Solo el tramo con conteos (los extremos en cero no aportan)
+        nz = np.flatnonzero(self.cuentas)
+        cuentas = self.cuentas[nz[0]:nz[-1] + 1] if len(nz) else self.cuentas[:0]
+        return {'precision': self.precision, 'max_cubetas': self.max_cubetas,
+                'clave_min': int(self.clave_min + (nz[0] if len(nz) else 0)),
+                'cuentas': cuentas.tolist(), 'ceros': self.ceros, 'n': self.n,
+                'suma': self.suma,
+                'minimo': self.minimo if self.n else None,
+                'maximo': self.maximo if self.n else None}
+
+    @classmethod
+    def desde_dict(cls, d):
+        s = cls(d['precision'], d['max_cubetas'])
+        s.clave_min = d['clave_min']
+        s.cuentas = np.asarray(d['cuentas'], dtype=np.int64)
+        s.ceros, s.n, s.suma = d['ceros'], d['n'], d['suma']
+        s.minimo = np.inf if d['minimo'] is None else d['minimo']
+        s.maximo = -np.inf if d['maximo'] is None else d['maximo']
+        return s
+
+
+class Histograma:
+    """Conteos sobre bordes fijos con desborde inferior y superior"""
+
+    def __init__(self, bordes):
+        self.bordes = np.asarray(bordes, dtype=float)
+        self.cuentas = np.zeros(len(self.bordes) + 1, dtype=np.int64)
+
+    def agregar(self, valores):
+        v = np.asarray(valores, dtype=float).ravel()
+        v = v[~np.isnan(v)]
+        self.cuentas += np.bincount(np.searchsorted(self.bordes, v, side='right'),
+                                    minlength=len(self.cuentas))
+
+    def fusionar(self, otro):
+        if not np.array_equal(self.bordes, otro.bordes):
+            raise ValueError("Solo se pueden fusionar histogramas con los mismos bordes")
+        self.cuentas += otro.cuentas
+        return self
+
+    def a_dict(self):
+        return {'bordes': self.bordes.tolist(), 'cuentas': self.cuentas.tolist()}
+
+    @classmethod
+    def desde_dict(cls, d):
+        h = cls(d['bordes'])
+        h.cuentas = np.asarray(d['cuentas'], dtype=np.int64)
+        return h
+
+
+class Distribuciones:
+    """Sketch + histograma de latencia y energía de una o varias corridas"""
+
+    def __init__(self, etiquetas=(), precision=0.01):
+        self.etiquetas = list(etiquetas)
+        self.sketches = {m: SketchDD(precision) for m in BORDES}
+        self.histogramas = {m: Histograma(b) for m, b in BORDES.items()}
+
+    def agregar(self, metrica, valores):
+        self.sketches[metrica].agregar(valores)
+        self.histogramas[metrica].agregar(valores)
+
+    def agregar_registros(self, arreglos):
+        """Bloque de parser_log_ns3 (latencia en recepciones, energía en envíos)"""
+        from parser_log_ns3 import ENVIO, RECEPCION
+        tipo = arreglos['tipo']
+        self.agregar('latencia_ms', arreglos['latencia_ms'][tipo == RECEPCION])
+        self.agregar('energia_mj', arreglos['energia_mj'][tipo == ENVIO])
+
+    def fusionar(self, otra):
+        self.etiquetas += otra.etiquetas
+        for m in BORDES:
+            self.sketches[m].fusionar(otra.sketches[m])
+            self.histogramas[m].fusionar(otra.histogramas[m])
+        return self
+
+    def guardar(self, ruta):
+        with open(ruta, 'w') as f:
+            json.dump({'etiquetas': self.etiquetas,
+                       'sketches': {m: s.a_dict() for m, s in self.sketches.items()},
+                       'histogramas': {m: h.a_dict() for m, h in self.histogramas.items()}}, f)
+
+    @classmethod
+    def cargar(cls, ruta):
+        with open(ruta) as f:
+            d = json.load(f)
+        dist = cls(d['etiquetas'])
+        dist.sketches = {m: SketchDD.desde_dict(s) for m, s in d['sketches'].items()}
+        dist.histogramas = {m: Histograma.desde_dict(h) for m, h in d['histogramas'].items()}
+        return dist
+
+
+def construir_desde_log(ruta_log, etiqueta=None, precision=0.01):
+    """Recorre un log NS_LOG en streaming y devuelve sus Distribuciones"""
+    from parser_log_ns3 import iterar_registros
+    dist = Distribuciones([etiqueta or os.path.basename(ruta_log)], precision)
+    for arreglos in iterar_registros(ruta_log):
+        dist.agregar_registros(arreglos)
+    return dist
+
+
+def construir_desde_columnas(directorio, etiqueta=None, precision=0.01, bloque=1_000_000):
+    """Igual que construir_desde_log, a partir de la salida de parser_log_ns3"""
+    from parser_log_ns3 import cargar_columnas
+    columnas = cargar_columnas(directorio)
+    dist = Distribuciones([etiqueta or os.path.basename(os.path.normpath(directorio))], precision)
+    for i in range(0, len(columnas['tipo']), bloque):
+        dist.agregar_registros({c: v[i:i + bloque] for c, v in columnas.items()})
+    return dist
+
+
+def imprimir_reporte(nombre, dist):
+    print(f"\n{nombre} ({len(dist.etiquetas)} corrida(s))")
+    for m, s in dist.sketches.items():
+        if s.n == 0:
+            print(f"  {m:<12} sin muestras")
+            continue
+        q = s.cuantil(CUANTILES)
+        u = UNIDADES[m]
+        print(f"  {m:<12} n={s.n:<9} prom={s.promedio:.2f} {u} | "
+              + " | ".join(f"p{100 * c:g}={v:.2f}" for c, v in zip(CUANTILES, q))
+              + f" | máx={s.maximo:.2f} {u}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sketches de cuantiles de latencia y energía")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_c = sub.add_parser('construir', help='Log NS_LOG o directorio de columnas -> sketch')
+    p_c.add_argument('entrada')
+    p_c.add_argument('--etiqueta')
+    p_c.add_argument('--precision', type=float, default=0.01, help='Error relativo (0.01 = 1%%)')
+    p_c.add_argument('--salida', required=True)
+
+    p_f = sub.add_parser('fusionar', help='Combinar sketches de varias corridas/semillas')
+    p_f.add_argument('sketches', nargs='+')
+    p_f.add_argument('--salida', required=True)
+
+    p_r = sub.add_parser('reporte', help='Cuantiles de uno o más sketches')
+    p_r.add_argument('sketches', nargs='+')
+
+    args = parser.parse_args()
+
+    if args.comando == 'construir':
+        if os.path.isdir(args.entrada):
+            dist = construir_desde_columnas(args.entrada, args.etiqueta, args.precision)
+        else:
+            dist = construir_desde_log(args.entrada, args.etiqueta, args.precision)
+        dist.guardar(args.salida)
+        imprimir_reporte(args.salida, dist)
+        print(f"\n✓ Sketch guardado: {args.salida}")
+
+    elif args.comando == 'fusionar':
+        dist = Distribuciones.cargar(args.sketches[0])
+        for ruta in args.sketches[1:]:
+            dist.fusionar(Distribuciones.cargar(ruta))
+        dist.guardar(args.salida)
+        imprimir_reporte(args.salida, dist)
+        print(f"\n✓ {len(args.sketches)} sketches fusionados en {args.salida}")
+
+    else:
+        for ruta in args.sketches:
+            imprimir_reporte(ruta, Distribuciones.cargar(ruta))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Topología de Red por Frame (Vectorizada)
+Los renderizadores de Ob1 buscaban el gateway más cercano de cada
+embarcación con dos iterrows anidados por frame, y la arquitectura móvil
+además un relay P2P con un tercer bucle. Aquí lo mismo se resuelve con
+arreglos: distancias embarcación × gateway de todos los frames a la vez,
+gateway más cercano (el primero en caso de empate, como el bucle) y relay.
+
+TopologiaTrazas calcula la traza completa una vez; RedFrame es la vista de
+un frame con solo los nodos presentes, en el orden de node_id.
+
+Uso:
+    python3 topologia_red.py positions_mobile.csv --alcance 15000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from radio_lora import LORA_MAX_RANGE, P2P_RANGE
+from trazas import cargar_trazas
+
+ALCANCE_EXTENDIDO = 20000.0     # hasta aquí se busca relay P2P (animación móvil)
+
+
+def enlaces_directos(boats_xy, gws_xy, alcance=LORA_MAX_RANGE, estricto=False):
+    """
+    Gateway más cercano por embarcación: (cercano, distancia, en_rango).
+    boats_xy (..., B, 2), gws_xy (..., G, 2); NaN = nodo ausente. Sin gateways
+    presentes: cercano -1 y distancia inf. `estricto` usa d < alcance.
+    """
+    boats_xy = np.asarray(boats_xy, dtype=float)
+    gws_xy = np.asarray(gws_xy, dtype=float)
+    forma = boats_xy.shape[:-1]
+    if gws_xy.shape[-2] == 0:
+        return np.full(forma, -1), np.full(forma, np.inf), np.zeros(forma, dtype=bool)
+    # Misma fórmula que el bucle original (sqrt de la suma de cuadrados)
+    d = np.sqrt((boats_xy[..., :, None, 0] - gws_xy[..., None, :, 0]) ** 2
+                + (boats_xy[..., :, None, 1] - gws_xy[..., None, :, 1]) ** 2)
+    d = np.where(np.isnan(d), np.inf, d)
+    cercano = d.argmin(axis=-1)
+    distancia = np.take_along_axis(d, cercano[..., None], axis=-1)[..., 0]
+    cercano = np.where(np.isfinite(distancia), cercano, -1)
+    en_rango = distancia < alcance if estricto else distancia <= alcance
+    return cercano, distancia, en_rango
+
+
+def relays_p2p(boats_xy, gws_xy, cercano, distancia, alcance=LORA_MAX_RANGE,
+               alcance_extendido=ALCANCE_EXTENDIDO, alcance_p2p=P2P_RANGE):
+    """
+    Para un frame: índice de la primera embarcación (en orden) a menos de
+    alcance_p2p que queda en alcance del gateway más cercano de cada
+    embarcación con alcance < d <= alcance_extendido; -1 si no hay.
+    """
+    relay = np.full(len(boats_xy), -1)
+    pendientes = np.flatnonzero((distancia > alcance) & (distancia <= alcance_extendido))
+    if len(pendientes) == 0:
+        return relay
+    origen = boats_xy[pendientes]
+    gw = gws_xy[cercano[pendientes]]
+    d_relay = np.sqrt(((origen[:, None, :] - boats_xy[None, :, :]) ** 2).sum(axis=2))
+    d_relay_gw = np.sqrt(((boats_xy[None, :, :] - gw[:, None, :]) ** 2).sum(axis=2))
+    valido = (d_relay < alcance_p2p) & (d_relay_gw <= alcance)
+    hay = valido.any(axis=1)
+    relay[pendientes[hay]] = valido[hay].argmax(axis=1)
+    return relay
+
+
+class RedFrame:
+    """Nodos presentes de un frame con su gateway más cercano (índices locales)"""
+
+    def __init__(self, tiempo, boats, gateways, servidor, cercano, distancia, en_rango,
+                 ids_boats=None):
+        self.tiempo = tiempo
+        self.boats = boats
+        self.gateways = gateways
+        self.servidor = servidor
+        self.cercano = cercano
+        self.distancia = distancia
+        self.en_rango = en_rango
+        self.ids_boats = ids_boats
+
+    @classmethod
+    def desde_arreglos(cls, tiempo, boats, gateways, servidor, alcance=LORA_MAX_RANGE,
+                       estricto=False, ids_boats=None):
+        """Frame a partir de posiciones sueltas (sin NaN)"""
+        cercano, distancia, en_rango = enlaces_directos(boats, gateways, alcance, estricto)
+        return cls(tiempo, boats, gateways, servidor, cercano, distancia, en_rango, ids_boats)
+
+    @property
+    def conectadas(self):
+        return int(self.en_rango.sum())
+
+    def enlaces(self):
+        """(embarcación, gateway) de cada enlace directo, en orden de embarcación"""
+        i = np.flatnonzero(self.en_rango)
+        return self.boats[i], self.gateways[self.cercano[i]]
+
+    def relays(self, **kwargs):
+        """Relay P2P por embarcación (-1 sin relay), ver relays_p2p"""
+        return relays_p2p(self.boats, self.gateways, self.cercano, self.distancia, **kwargs)
+
+
+class TopologiaTrazas:
+    """Gateway más cercano de cada embarcación en todos los frames de unas Trazas"""
+
+    def __init__(self, trazas, alcance=LORA_MAX_RANGE, estricto=False, bloque=512):
+        self.tiempos = trazas.tiempos
+        self.alcance = alcance
+        self.boats = trazas.seleccionar('boat')
+        self.gateways = trazas.seleccionar('gateway')
+        self.servidor = trazas.seleccionar('server')
+        frames, n_boats = self.boats.xy.shape[:2]
+        self.cercano = np.full((frames, n_boats), -1)
+        self.distancia = np.full((frames, n_boats), np.inf)
+        self.en_rango = np.zeros((frames, n_boats), dtype=bool)
+        for i in range(0, frames, bloque):
+            c, d, r = enlaces_directos(self.boats.xy[i:i + bloque], self.gateways.xy[i:i + bloque],
+                                       alcance, estricto)
+            self.cercano[i:i + bloque], self.distancia[i:i + bloque], self.en_rango[i:i + bloque] = c, d, r
+        # Índice del gateway entre los presentes de su frame (lo que ve RedFrame)
+        presentes_gw = ~np.isnan(self.gateways.xy[:, :, 0])
+        local = np.cumsum(presentes_gw, axis=1) - 1
+        self._cercano_local = np.where(self.cercano >= 0,
+                                       np.take_along_axis(local, np.maximum(self.cercano, 0), axis=1), -1)
+
+    def __len__(self):
+        return len(self.tiempos)
+
+    def indice(self, t):
+        """Frame con tiempo exactamente t (KeyError si no existe)"""
+        i = int(np.searchsorted(self.tiempos, t))
+        if i >= len(self.tiempos) or self.tiempos[i] != t:
+            raise KeyError(t)
+        return i
+
+    def frame(self, i):
+        """RedFrame del frame i con solo los nodos presentes"""
+        b = ~np.isnan(self.boats.xy[i, :, 0])
+        g = ~np.isnan(self.gateways.xy[i, :, 0])
+        s = ~np.isnan(self.servidor.xy[i, :, 0])
+        return RedFrame(self.tiempos[i], self.boats.xy[i, b], self.gateways.xy[i, g],
+                        self.servidor.xy[i, s], self._cercano_local[i, b], self.distancia[i, b],
+                        self.en_rango[i, b], self.boats.ids[b])
+
+    def cobertura(self):
+        """% de embarcaciones presentes con gateway en alcance, por frame"""
+        presentes = ~np.isnan(self.boats.xy[:, :, 0])
+        return 100.0 * self.en_rango.sum(axis=1) / np.maximum(presentes.sum(axis=1), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Topología por frame (gateway más cercano y relays)")
+    parser.add_argument('posiciones', help='CSV de LogPositions (time,node_id,x,y,type)')
+    parser.add_argument('--alcance', type=float, default=LORA_MAX_RANGE)
+    args = parser.parse_args()
+
+    trazas = cargar_trazas(args.posiciones)
+    inicio = time.perf_counter()
+    topologia = TopologiaTrazas(trazas, args.alcance)
+    relays = sum(int((topologia.frame(i).relays(alcance=args.alcance) >= 0).sum())
+                 for i in range(len(topologia)))
+    duracion = time.perf_counter() - inicio
+    cobertura = topologia.cobertura()
+    print(f"✓ {len(topologia)} frames × {len(topologia.boats.ids)} embarcaciones en {duracion * 1000:.1f} ms")
+    print(f"  Cobertura directa: media {cobertura.mean():.1f}% | mín {cobertura.min():.1f}%")
+    print(f"  Embarcaciones-frame con relay P2P: {relays}")
+
+
+if __name__ == '__main__':
+    main()
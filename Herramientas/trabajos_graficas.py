@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Trabajos de Gráficas en Paralelo con Omisión si no hay Cambios
+Cada figura se declara como un TrabajoGrafica (función constructora, salidas,
+archivos de entrada, datos y estilo). Su huella combina el código de la
+módulo de la función (sus globales, como los colores, cuentan), los datos, el
+estilo y el contenido de las entradas; si coincide con la de la última
+ejecución y las salidas existen, la figura no se regenera. Las figuras
+pendientes se construyen en un pool de procesos con backend Agg; si alguna
+falla, ejecutar_trabajos lanza RuntimeError al terminar.
+
+Uso (desde un script de gráficas):
+    trabajos = [TrabajoGrafica('pdr', crear_grafica_pdr, ['grafica_pdr.png'],
+                               datos=datos_pdr, estilo=ESTILO)]
+    ejecutar_trabajos(trabajos, procesos=args.procesos, forzar=args.forzar)
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+RUTA_HUELLAS = '.huellas_graficas.json'
+
+
+class TrabajoGrafica:
+    """Una figura independiente: función sin estado global mutable y sus salidas"""
+
+    def __init__(self, nombre, funcion, salidas, entradas=(), datos=None, estilo=None,
+                 args=(), kwargs=None):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.salidas = [str(s) for s in salidas]
+        self.entradas = [str(e) for e in entradas]
+        self.datos = datos
+        self.estilo = estilo or {}
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+
+    def huella(self, hashes_entradas):
+        """SHA-256 de código + datos + estilo + argumentos + entradas + salidas"""
+        h = hashlib.sha256()
+        codigo = getattr(self.funcion, '__qualname__', repr(self.funcion))
+        # Todo el módulo: la función lee globales (COLORS, ...) que no están en su fuente
+        for objeto in (inspect.getmodule(self.funcion), self.funcion):
+            try:
+                codigo = inspect.getsource(objeto)
+                break
+            except (OSError, TypeError):
+                continue
+        for parte in (codigo,
+                      json.dumps(self.datos, sort_keys=True, default=str),
+                      json.dumps(self.estilo, sort_keys=True, default=str),
+                      json.dumps([self.args, self.kwargs], sort_keys=True, default=str),
+                      json.dumps([hashes_entradas[e] for e in self.entradas]),
+                      json.dumps(self.salidas)):
+            h.update(parte.encode('utf-8'))
+            h.update(b'\0')
+        return h.hexdigest()
+
+
+class CacheHuellas:
+    """Huellas por trabajo + hash de cada entrada (reutilizado si mtime y tamaño no cambian)"""
+
+    def __init__(self, ruta=RUTA_HUELLAS, raiz=None):
+        self.ruta = Path(ruta)
+        self.raiz = raiz   # si se da, las rutas se guardan relativas a ella
+        try:
+            with open(self.ruta) as f:
+                d = json.load(f)
+        except (OSError, ValueError):
+            d = {}
+        self.trabajos = d.get('trabajos', {})
+        self.archivos = d.get('archivos', {})
+
+    def hash_archivo(self, ruta):
+        real = os.path.join(self.raiz, ruta) if self.raiz else ruta
+        try:
+            st = os.stat(real)
+        except OSError:
+            return None   # entrada ausente: cuenta como cambio cuando aparezca
+        previo = self.archivos.get(ruta)
+        if previo and previo[0] == st.st_mtime_ns and previo[1] == st.st_size:
+            return previo[2]
+        h = hashlib.sha256()
+        with open(real, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                h.update(bloque)
+        self.archivos[ruta] = [st.st_mtime_ns, st.st_size, h.hexdigest()]
+        return h.hexdigest()
+
+    def guardar(self):
+        tmp = self.ruta.with_name(self.ruta.name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'trabajos': self.trabajos, 'archivos': self.archivos}, f, indent=1)
+        os.replace(tmp, self.ruta)
+
+
+def _aplicar_estilo(estilo):
+    import matplotlib.pyplot as plt
+    estilo = dict(estilo)
+    base = estilo.pop('base', None)
+    if base:
+        plt.style.use(base)
+    plt.rcParams.update({k: v for k, v in estilo.items() if k in plt.rcParams})
+
+
+def _inicializar_trabajador():
+    os.environ['MPLBACKEND'] = 'Agg'
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _ejecutar(trabajo):
+    """Corre en el proceso trabajador; devuelve (nombre, segundos)"""
+    import matplotlib.pyplot as plt
+    inicio = time.perf_counter()
+    if trabajo.estilo:
+        _aplicar_estilo(trabajo.estilo)
+    trabajo.funcion(*trabajo.args, **trabajo.kwargs)
+    plt.close('all')
+    return trabajo.nombre, time.perf_counter() - inicio
+
+
+def ejecutar_trabajos(trabajos, procesos=None, forzar=False, ruta_huellas=RUTA_HUELLAS):
+    """
+    Construye solo las figuras cuya huella cambió (o cuyas salidas faltan).
+    Devuelve la lista de nombres regenerados; RuntimeError si alguna falló
+    (su huella no se guarda, así que se reintenta en la próxima ejecución).
+    """
+    cache = CacheHuellas(ruta_huellas)
+    hashes = {e: cache.hash_archivo(e) for t in trabajos for e in t.entradas}
+    pendientes, huellas = [], {}
+    for t in trabajos:
+        huellas[t.nombre] = t.huella(hashes)
+        al_dia = (cache.trabajos.get(t.nombre) == huellas[t.nombre]
+                  and all(os.path.exists(s) for s in t.salidas))
+        if forzar or not al_dia:
+            pendientes.append(t)
+        else:
+            print(f"⏭️  Sin cambios: {', '.join(t.salidas)}")
+
+    if not pendientes:
+        cache.guardar()
+        print("✓ Todas las gráficas están al día")
+        return []
+
+    procesos = procesos or min(len(pendientes), os.cpu_count() or 1)
+    inicio = time.perf_counter()
+    hechos, errores = [], []
+    if procesos <= 1:
+        _inicializar_trabajador()
+        for t in pendientes:
+            try:
+                hechos.append(_ejecutar(t))
+            except Exception as e:
+                errores.append((t.nombre, e))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_trabajador) as pool:
+            futuros = {pool.submit(_ejecutar, t): t for t in pendientes}
+            for futuro in as_completed(futuros):
+                try:
+                    hechos.append(futuro.result())
+                except Exception as e:
+                    errores.append((futuros[futuro].nombre, e))
+
+    for nombre, _ in hechos:
+        cache.trabajos[nombre] = huellas[nombre]
+    cache.guardar()
+
+    for nombre, e in errores:
+        print(f"❌ Error en {nombre}: {e}")
+    print(f"✓ {len(hechos)}/{len(pendientes)} gráficas regeneradas en "
+          f"{time.perf_counter() - inicio:.1f} s ({procesos} procesos)")
+    if errores:
+        raise RuntimeError(f"{len(errores)} gráficas fallaron: {', '.join(n for n, _ in errores)}")
+    return [nombre for nombre, _ in hechos]
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Formato Comprimido de Trazas de Movilidad (.trz)
+Guarda los CSV de LogPositions (time,node_id,x,y,type) como un flujo por nodo:
+tiempo y coordenadas cuantizados, codificados en deltas y comprimidos con zlib
+en bloques independientes, con índice por tiempo para leer solo un intervalo.
+
+Estructura del archivo:
+    b'TRZ1' | largo del encabezado (uint32) | encabezado JSON | bloques zlib
+
+Uso:
+    python3 traza_comprimida.py comprimir positions_salinas_gw10_p2p.csv
+    python3 traza_comprimida.py leer positions_salinas_gw10_p2p.trz --desde 600 --hasta 900
+    python3 traza_comprimida.py descomprimir positions_salinas_gw10_p2p.trz salida.csv
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+MAGICO = b'TRZ1'
+RESOLUCION_TIEMPO = 0.001   # s (las trazas se registran cada pocos segundos)
+
+
+def _codificar_bloque(tq, xq, yq, nivel):
+    """Deltas de tiempo (int64) y coordenadas (int32) comprimidos en un solo bloque"""
+    datos = b''.join([
+        np.diff(tq, prepend=0).astype('<i8').tobytes(),
+        np.diff(xq, prepend=0).astype('<i4').tobytes(),
+        np.diff(yq, prepend=0).astype('<i4').tobytes(),
+    ])
+    return zlib.compress(datos, nivel)
+
+
+def _decodificar_bloque(datos, n):
+    """Inversa de _codificar_bloque: tiempos y coordenadas cuantizados"""
+    crudo = zlib.decompress(datos)
+    tq = np.cumsum(np.frombuffer(crudo, '<i8', n, 0))
+    xq = np.cumsum(np.frombuffer(crudo, '<i4', n, 8 * n), dtype=np.int64)
+    yq = np.cumsum(np.frombuffer(crudo, '<i4', n, 12 * n), dtype=np.int64)
+    return tq, xq, yq
+
+
+def comprimir_dataframe(df, ruta_salida, resolucion=0.1, muestras_bloque=256, nivel=6):
+    """Escribe un DataFrame de LogPositions en formato .trz"""
+    df = df.sort_values(['node_id', 'time'], kind='stable')
+    ids = df['node_id'].to_numpy()
+    tq = np.round(df['time'].to_numpy(dtype=float) / RESOLUCION_TIEMPO).astype(np.int64)
+    xq = np.round(df['x'].to_numpy(dtype=float) / resolucion).astype(np.int64)
+    yq = np.round(df['y'].to_numpy(dtype=float) / resolucion).astype(np.int64)
+    if len(xq) and max(np.abs(xq).max(), np.abs(yq).max()) >= 2 ** 30:
+        raise ValueError("Coordenadas fuera de rango para la resolución elegida")
+    tipos = df['type'].astype(str).str.strip().to_numpy()
+
+    cortes = np.flatnonzero(np.diff(ids)) + 1
+    inicios = np.concatenate([[0], cortes])
+    finales = np.concatenate([cortes, [len(ids)]])
+
+    nodos, bloques, offset = [], [], 0
+    for i0, i1 in zip(inicios.tolist(), finales.tolist()):
+        indice = []
+        for b0 in range(i0, i1, muestras_bloque):
+            b1 = min(b0 + muestras_bloque, i1)
+            datos = _codificar_bloque(tq[b0:b1], xq[b0:b1], yq[b0:b1], nivel)
+            indice.append([int(tq[b0]), int(tq[b1 - 1]), offset, len(datos), int(b1 - b0)])
+            bloques.append(datos)
+            offset += len(datos)
+        nodos.append({'id': int(ids[i0]), 'tipo': tipos[i0], 'bloques': indice})
+
+    encabezado = json.dumps({
+        'resolucion': resolucion,
+        'resolucion_tiempo': RESOLUCION_TIEMPO,
+        'muestras': int(len(ids)),
+        'nodos': nodos,
+    }, separators=(',', ':')).encode('utf-8')
+    with open(ruta_salida, 'wb') as f:
+        f.write(MAGICO)
+        f.write(struct.pack('<I', len(encabezado)))
+        f.write(encabezado)
+        for datos in bloques:
+            f.write(datos)
+
+
+def comprimir_csv(ruta_csv, ruta_salida=None, **opciones):
+    """Convierte un CSV de posiciones a .trz; devuelve la ruta generada"""
+    ruta_salida = ruta_salida or os.path.splitext(ruta_csv)[0] + '.trz'
+    df = pd.read_csv(ruta_csv)
+    df.columns = df.columns.str.strip()
+    comprimir_dataframe(df, ruta_salida, **opciones)
+    return ruta_salida
+
+
+class TrazaComprimida:
+    """Lector de archivos .trz con acceso por intervalo de tiempo"""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, 'rb') as f:
+            if f.read(4) != MAGICO:
+                raise ValueError(f"{ruta} no es una traza .trz")
+            largo, = struct.unpack('<I', f.read(4))
+            encabezado = json.loads(f.read(largo).decode('utf-8'))
+        self.inicio_datos = 8 + largo
+        self.resolucion = encabezado['resolucion']
+        self.resolucion_tiempo = encabezado['resolucion_tiempo']
+        self.muestras = encabezado['muestras']
+        self.nodos = encabezado['nodos']
+        # Índice por nodo: (bloques, 5) = t_ini, t_fin, offset, largo, n
+        self._indices = [np.array(n['bloques'], dtype=np.int64).reshape(-1, 5) for n in self.nodos]
+
+    @property
+    def ids(self):
+        return [n['id'] for n in self.nodos]
+
+    def rango_tiempo(self):
+        """(t_min, t_max) de toda la traza en segundos"""
+        t0 = min(ind[0, 0] for ind in self._indices if len(ind))
+        t1 = max(ind[-1, 1] for ind in self._indices if len(ind))
+        return t0 * self.resolucion_tiempo, t1 * self.resolucion_tiempo
+
+    def leer_arreglos(self, t_min=None, t_max=None, nodos=None, tipo=None):
+        """
+        Arreglos (tiempos, ids, x, y, índice de nodo) de las muestras en
+        [t_min, t_max], ordenados por nodo y tiempo. Solo se descomprimen los
+        bloques que se solapan con el intervalo.
+        """
+        q0 = -np.inf if t_min is None else round(t_min / self.resolucion_tiempo)
+        q1 = np.inf if t_max is None else round(t_max / self.resolucion_tiempo)
+        seleccion = None if nodos is None else set(nodos)
+
+        tqs, xqs, yqs, nodo_idx = [], [], [], []
+        with open(self.ruta, 'rb') as f:
+            for k, (nodo, indice) in enumerate(zip(self.nodos, self._indices)):
+                if seleccion is not None and nodo['id'] not in seleccion:
+                    continue
+                if tipo is not None and nodo['tipo'] != tipo:
+                    continue
+                # Bloques que se solapan con el intervalo (t_fin >= q0 y t_ini <= q1)
+                b0 = np.searchsorted(indice[:, 1], q0, side='left')
+                b1 = np.searchsorted(indice[:, 0], q1, side='right')
+                for _, _, offset, largo, n in indice[b0:b1].tolist():
+                    f.seek(self.inicio_datos + offset)
+                    tq, xq, yq = _decodificar_bloque(f.read(largo), n)
+                    tqs.append(tq)
+                    xqs.append(xq)
+                    yqs.append(yq)
+                    nodo_idx.append(np.full(n, k, dtype=np.int32))
+
+        if not tqs:
+            vacio = np.empty(0)
+            return vacio, np.empty(0, dtype=np.int64), vacio, vacio, np.empty(0, dtype=np.int32)
+        tq, xq, yq, nodo_idx = (np.concatenate(v) for v in (tqs, xqs, yqs, nodo_idx))
+        # Recorte fino dentro de los bloques de los extremos
+        m = (tq >= q0) & (tq <= q1)
+        ids = np.array(self.ids, dtype=np.int64)
+        return (tq[m] * self.resolucion_tiempo, ids[nodo_idx[m]],
+                xq[m] * self.resolucion, yq[m] * self.resolucion, nodo_idx[m])
+
+    def leer(self, t_min=None, t_max=None, nodos=None, tipo=None):
+        """DataFrame time,node_id,x,y,type (orden del CSV: por tiempo y nodo)"""
+        t, ids, x, y, nodo_idx = self.leer_arreglos(t_min, t_max, nodos, tipo)
+        orden = np.lexsort((ids, t))
+        tipos = np.array([n['tipo'] for n in self.nodos], dtype=object)[nodo_idx[orden]]
+        return pd.DataFrame({'time': t[orden], 'node_id': ids[orden],
+                             'x': x[orden], 'y': y[orden], 'type': tipos})
+
+    def a_csv(self, ruta_csv, t_min=None, t_max=None):
+        """Reconstruye el CSV de LogPositions (precisión igual a la resolución)"""
+        df = self.leer(t_min, t_max)
+        decimales = max(0, int(np.ceil(-np.log10(self.resolucion))))
+        # El tiempo se escribe sin ceros de relleno, como lo hace ns-3
+        df['time'] = df['time'].round(3).map(lambda t: f'{t:g}')
+        with open(ruta_csv, 'w') as f:
+            f.write('time,node_id,x,y,type\n')
+            for t, i, x, y, tp in df.itertuples(index=False):
+                f.write(f'{t},{i},{x:.{decimales}f},{y:.{decimales}f},{tp}\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trazas de movilidad comprimidas (.trz)")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_c = sub.add_parser('comprimir', help='CSV de posiciones -> .trz')
+    p_c.add_argument('csv')
+    p_c.add_argument('salida', nargs='?')
+    p_c.add_argument('--resolucion', type=float, default=0.1, help='Resolución espacial (m)')
+    p_c.add_argument('--bloque', type=int, default=256, help='Muestras por bloque y nodo')
+    p_c.add_argument('--nivel', type=int, default=6, help='Nivel de compresión zlib')
+
+    p_d = sub.add_parser('descomprimir', help='.trz -> CSV de posiciones')
+    p_d.add_argument('trz')
+    p_d.add_argument('csv')
+    p_d.add_argument('--desde', type=float)
+    p_d.add_argument('--hasta', type=float)
+
+    p_l = sub.add_parser('leer', help='Leer un intervalo y mostrar un resumen')
+    p_l.add_argument('trz')
+    p_l.add_argument('--desde', type=float)
+    p_l.add_argument('--hasta', type=float)
+    p_l.add_argument('--tipo', choices=['boat', 'gateway', 'server'])
+
+    args = parser.parse_args()
+
+    if args.comando == 'comprimir':
+        inicio = time.perf_counter()
+        salida = comprimir_csv(args.csv, args.salida, resolucion=args.resolucion,
+                               muestras_bloque=args.bloque, nivel=args.nivel)
+        tam_csv, tam_trz = os.path.getsize(args.csv), os.path.getsize(salida)
+        print(f"✓ {salida}: {tam_trz / 1024:.1f} KB (CSV {tam_csv / 1024:.1f} KB, "
+              f"{tam_csv / max(tam_trz, 1):.1f}x) en {time.perf_counter() - inicio:.2f} s")
+
+    elif args.comando == 'descomprimir':
+        TrazaComprimida(args.trz).a_csv(args.csv, args.desde, args.hasta)
+        print(f"✓ CSV reconstruido: {args.csv}")
+
+    else:
+        inicio = time.perf_counter()
+        traza = TrazaComprimida(args.trz)
+        df = traza.leer(args.desde, args.hasta, tipo=args.tipo)
+        ms = (time.perf_counter() - inicio) * 1000
+        t0, t1 = traza.rango_tiempo()
+        print(f"Traza: {len(traza.nodos)} nodos, {traza.muestras} muestras, "
+              f"t = {t0:g}-{t1:g} s, resolución {traza.resolucion:g} m")
+        print(f"✓ {len(df)} muestras leídas ({df['node_id'].nunique()} nodos) en {ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Trazas de Posición en Arreglo Denso
+Carga los CSV de LogPositions (time,node_id,x,y,type) como un arreglo
+(frames × nodos × 2) para operar con numpy sin agrupar por tiempo.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class Trazas:
+    """
+    Posiciones densas: `xy[f, n]` es la posición del nodo `ids[n]` en
+    `tiempos[f]`, o NaN si ese nodo no aparece en el frame.
+    """
+
+    def __init__(self, tiempos, ids, tipos, xy):
+        self.tiempos = np.asarray(tiempos, dtype=float)
+        self.ids = np.asarray(ids)
+        self.tipos = np.asarray(tipos)
+        self.xy = xy
+
+    @classmethod
+    def desde_dataframe(cls, df):
+        """Construye el arreglo denso a partir de un DataFrame de LogPositions"""
+        tiempos = np.unique(df['time'].to_numpy(dtype=float))
+        ids, primera = np.unique(df['node_id'].to_numpy(), return_index=True)
+        tipos = df['type'].astype(str).str.strip().to_numpy()[primera]
+        xy = np.full((len(tiempos), len(ids), 2), np.nan)
+        f = np.searchsorted(tiempos, df['time'].to_numpy(dtype=float))
+        n = np.searchsorted(ids, df['node_id'].to_numpy())
+        xy[f, n, 0] = df['x'].to_numpy(dtype=float)
+        xy[f, n, 1] = df['y'].to_numpy(dtype=float)
+        return cls(tiempos, ids, tipos, xy)
+
+    def __len__(self):
+        return len(self.tiempos)
+
+    def seleccionar(self, tipo):
+        """Subconjunto de nodos de un tipo ('boat', 'gateway', 'server')"""
+        mascara = self.tipos == tipo
+        return Trazas(self.tiempos, self.ids[mascara], self.tipos[mascara], self.xy[:, mascara])
+
+    def recortar(self, t_min=None, t_max=None):
+        """Subconjunto de frames con t_min <= t <= t_max"""
+        i0 = 0 if t_min is None else np.searchsorted(self.tiempos, t_min, side='left')
+        i1 = len(self.tiempos) if t_max is None else np.searchsorted(self.tiempos, t_max, side='right')
+        return Trazas(self.tiempos[i0:i1], self.ids, self.tipos, self.xy[i0:i1])
+
+    def indice(self, t):
+        """Índice del último frame con tiempo <= t (o el primero si t es anterior)"""
+        return int(max(np.searchsorted(self.tiempos, t, side='right') - 1, 0))
+
+    def indices_cercanos(self, t):
+        """Índices de los frames más cercanos a cada tiempo de `t` (búsqueda binaria)"""
+        t = np.asarray(t, dtype=float)
+        i = np.clip(np.searchsorted(self.tiempos, t), 1, max(len(self.tiempos) - 1, 1))
+        anterior = np.abs(t - self.tiempos[i - 1]) <= np.abs(self.tiempos[np.minimum(i, len(self.tiempos) - 1)] - t)
+        return np.where(anterior, i - 1, i).clip(0, len(self.tiempos) - 1)
+
+    def frame(self, i):
+        """(ids, xy) de los nodos presentes en el frame i"""
+        validos = ~np.isnan(self.xy[i, :, 0])
+        return self.ids[validos], self.xy[i, validos]
+
+    def remuestrear(self, grilla, metodo='lineal', tolerancia=None):
+        """
+        Trazas en los tiempos de `grilla`, nodo por nodo y sin bucles: todas las
+        muestras válidas se ordenan por (nodo, tiempo) con un desplazamiento por
+        nodo, así una sola búsqueda binaria ubica cada (nodo, tiempo de grilla).
+        'lineal' interpola entre las muestras vecinas; 'cercano' toma la más
+        próxima. Fuera del intervalo registrado de un nodo se usa su muestra
+        extrema, salvo que quede a más de `tolerancia` segundos (-> NaN).
+        """
+        grilla = np.asarray(grilla, dtype=float)
+        f_idx, n_idx = np.nonzero(~np.isnan(self.xy[:, :, 0]))
+        orden = np.lexsort((f_idx, n_idx))
+        f_idx, n_idx = f_idx[orden], n_idx[orden]
+        n_nodos = len(self.ids)
+        xy = np.full((len(grilla), n_nodos, 2), np.nan)
+        if len(f_idx) == 0 or len(grilla) == 0:
+            return Trazas(grilla, self.ids, self.tipos, xy)
+
+        t = self.tiempos[f_idx]
+        base = min(t.min(), grilla.min())
+        tramo = max(t.max(), grilla.max()) - base + 1.0
+        clave = (t - base) + n_idx * tramo
+        nodos = np.arange(n_nodos)
+        consulta = ((grilla - base)[None, :] + nodos[:, None] * tramo).ravel()
+        nodo_q = np.repeat(nodos, len(grilla))
+
+        der = np.searchsorted(clave, consulta, side='left')
+        izq = der - 1
+        ultimo = len(clave) - 1
+        izq_ok = (izq >= 0) & (n_idx[np.clip(izq, 0, ultimo)] == nodo_q)
+        der_ok = (der <= ultimo) & (n_idx[np.clip(der, 0, ultimo)] == nodo_q)
+        izq, der = np.clip(izq, 0, ultimo), np.clip(der, 0, ultimo)
+
+        tq = np.tile(grilla, n_nodos)
+        d_izq = np.where(izq_ok, tq - t[izq], np.inf)
+        d_der = np.where(der_ok, t[der] - tq, np.inf)
+        muestras = self.xy[f_idx, n_idx]
+        resultado = np.where((d_izq <= d_der)[:, None], muestras[izq], muestras[der])
+        hueco = np.minimum(d_izq, d_der)
+
+        if metodo == 'lineal':
+            ambos = izq_ok & der_ok & (d_der > 0)
+            peso = np.where(ambos, d_izq / np.where(ambos, d_izq + d_der, 1.0), 0.0)
+            interpolado = muestras[izq] + peso[:, None] * (muestras[der] - muestras[izq])
+            resultado = np.where(ambos[:, None], interpolado, resultado)
+            hueco = np.where(ambos, 0.0, hueco)
+        elif metodo != 'cercano':
+            raise ValueError(f"Método desconocido: {metodo}")
+
+        resultado[~np.isfinite(hueco)] = np.nan
+        if tolerancia is not None:
+            resultado[hueco > tolerancia] = np.nan
+        xy[:] = resultado.reshape(n_nodos, len(grilla), 2).transpose(1, 0, 2)
+        return Trazas(grilla, self.ids, self.tipos, xy)
+
+    def paso_tipico(self):
+        """Mediana del intervalo entre frames (s)"""
+        return float(np.median(np.diff(self.tiempos))) if len(self.tiempos) > 1 else 0.0
+
+    def a_dataframe(self):
+        """DataFrame time,node_id,x,y,type con las posiciones válidas"""
+        f, n = np.nonzero(~np.isnan(self.xy[:, :, 0]))
+        return pd.DataFrame({'time': self.tiempos[f], 'node_id': self.ids[n],
+                             'x': self.xy[f, n, 0], 'y': self.xy[f, n, 1], 'type': self.tipos[n]})
+
+    def muestras(self):
+        """Todas las posiciones válidas como un arreglo (M, 2)"""
+        plano = self.xy.reshape(-1, 2)
+        return plano[~np.isnan(plano[:, 0])]
+
+
+def grilla_comun(trazas, paso=None, modo='union'):
+    """
+    Grilla uniforme para varias trazas: cubre la unión (o la intersección) de
+    sus intervalos con el paso más fino entre ellas salvo que se indique `paso`.
+    """
+    inicios = [tr.tiempos[0] for tr in trazas if len(tr)]
+    finales = [tr.tiempos[-1] for tr in trazas if len(tr)]
+    if not inicios:
+        return np.empty(0)
+    if modo == 'union':
+        t0, t1 = min(inicios), max(finales)
+    else:
+        t0, t1 = max(inicios), min(finales)
+        if t1 < t0:
+            raise ValueError("Las trazas no se solapan en el tiempo")
+    if paso is None:
+        pasos = [tr.paso_tipico() for tr in trazas if len(tr) > 1]
+        paso = min(pasos) if pasos else 1.0
+    n = int(np.floor((t1 - t0) / paso + 1e-9)) + 1
+    # Redondeo para que los tiempos de la grilla se comparen exactos
+    return np.round(t0 + paso * np.arange(n), 6)
+
+
+def alinear(trazas, grilla=None, paso=None, metodo='lineal', modo='union', tolerancia=None):
+    """Remuestrea todas las trazas sobre una grilla común; devuelve (grilla, [trazas])"""
+    if grilla is None:
+        grilla = grilla_comun(trazas, paso, modo)
+    grilla = np.asarray(grilla, dtype=float)
+    return grilla, [tr.remuestrear(grilla, metodo, tolerancia) for tr in trazas]
+
+
+def cargar_trazas(ruta, tipo=None):
+    """Lee un CSV de posiciones y devuelve sus Trazas (opcionalmente de un solo tipo)"""
+    df = pd.read_csv(ruta)
+    df.columns = df.columns.str.strip()
+    if tipo is not None:
+        df = df[df['type'].astype(str).str.strip() == tipo]
+    return Trazas.desde_dataframe(df)
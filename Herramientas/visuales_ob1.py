@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Visualizaciones de Ob1 en una Sola Invocación
+Los cinco renderizadores de Resultados Ob1/Animacion_gif (GIF tradicional,
+GIF móvil, GIF comparativo, PNG geográfico y GIF de la red móvil, cada uno
+con sus capturas) corrían como procesos separados: cada uno importaba
+matplotlib/pandas, leía su CSV y buscaba el gateway más cercano por su cuenta.
+
+Aquí las dos trazas se cargan una vez, las topologías que usan los scripts
+se calculan una vez (sesion_visual) y cada script se ejecuta en este mismo
+intérprete sobre esos datos en memoria, en su directorio y con sus propios
+argumentos y rcParams. Con --procesos N los scripts se reparten en procesos
+hijos creados por fork después de la carga, así que heredan los datos sin
+volver a leerlos.
+
+Uso:
+    python3 visuales_ob1.py                                   # todas las salidas
+    python3 visuales_ob1.py tradicional comparativa --frames 0
+    python3 visuales_ob1.py --tradicional posiciones_tradicional_3gw.csv \\
+        --movil positions_salinas_movil_3gw.csv --salida /tmp/ob1 --procesos 2
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import runpy
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import sesion_visual as sesion
+from pipeline_resultados import OB1_ANIM, OB1_MOVIL, OB1_TRAD, RAIZ
+
+FIJA = 'positions_fixed.csv'
+MOVIL = 'positions_mobile.csv'
+
+# Salida -> (script relativo a Animacion_gif, trazas que lee, topologías que pide)
+SALIDAS = {
+    'tradicional': ('Animacion_tradicional/animacion_tradicional.py', [FIJA],
+                    [(FIJA, 15000, False)]),
+    'movil': ('Animacion_movil/animacion_movil.py', [MOVIL], []),
+    'comparativa': ('Gif_ambas_arquitecturas/animacion_comparativa.py', [FIJA, MOVIL],
+                    [(FIJA, 15000, False), (MOVIL, 15000, False)]),
+    'geografica': ('Sin_animacion_ambas_arquitecturas/comparacion_geografica_v2.py', [FIJA, MOVIL],
+                   []),
+    'red_movil': ('visualizacion_gif_movil.py', [MOVIL], [(MOVIL, 5000, True)]),
+}
+
+
+def argumentos_script(nombre, args):
+    """Argumentos de línea de comandos que recibe cada script"""
+    if nombre == 'geografica':
+        return [] if args.tiempo is None else ['--tiempo', str(args.tiempo)]
+    argumentos = ['--formato', args.formato]
+    if args.frames is not None:
+        argumentos += ['--frames', str(args.frames)]
+    return argumentos
+
+
+def ejecutar_script(nombre, argumentos, salida=None):
+    """
+    Corre un script como __main__ en este intérprete. Devuelve
+    (nombre, código, segundos, texto impreso).
+    """
+    script = RAIZ / OB1_ANIM / SALIDAS[nombre][0]
+    directorio = Path(salida) / nombre if salida else script.parent
+    directorio.mkdir(parents=True, exist_ok=True)
+    anterior, argv = os.getcwd(), sys.argv
+    texto = io.StringIO()
+    codigo = 0
+    inicio = time.perf_counter()
+    try:
+        os.chdir(directorio)
+        sys.argv = [str(script), *argumentos]
+        with contextlib.redirect_stdout(texto), matplotlib.rc_context():
+            runpy.run_path(str(script), run_name='__main__')
+    except SystemExit as e:
+        codigo = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        codigo = 1
+        texto.write(traceback.format_exc())
+    finally:
+        plt.close('all')
+        os.chdir(anterior)
+        sys.argv = argv
+    return nombre, codigo, time.perf_counter() - inicio, texto.getvalue()
+
+
+def _ejecutar_en_hijo(tarea):
+    return ejecutar_script(*tarea)
+
+
+def cargar(nombres, fija, movil):
+    """Registra las trazas y calcula por adelantado lo que piden los scripts"""
+    sesion.registrar(FIJA, str(fija))
+    sesion.registrar(MOVIL, str(movil))
+    for nombre in nombres:
+        for archivo in SALIDAS[nombre][1]:
+            sesion.trazas(archivo)
+        sesion.precalcular(SALIDAS[nombre][2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Todas las visualizaciones de Ob1 en una invocación")
+    parser.add_argument('salidas', nargs='*', metavar='SALIDA',
+                        help=f"Qué generar ({', '.join(SALIDAS)}); por defecto todo")
+    parser.add_argument('--tradicional', default=RAIZ / OB1_TRAD / 'posiciones_tradicional_3gw.csv',
+                        help='CSV de posiciones de la arquitectura tradicional')
+    parser.add_argument('--movil', default=RAIZ / OB1_MOVIL / 'positions_salinas_movil_3gw.csv',
+                        help='CSV de posiciones de la arquitectura móvil')
+    parser.add_argument('--frames', type=int,
+                        help='Frames de cada animación (0 = traza completa; por defecto el de cada script)')
+    parser.add_argument('--formato', choices=['gif', 'mp4', 'webm'], default='gif')
+    parser.add_argument('--tiempo', type=float, help='Instante de la comparación geográfica (s)')
+    parser.add_argument('--salida', help='Directorio base (una carpeta por salida); por defecto '
+                                         'junto a cada script')
+    parser.add_argument('--procesos', type=int, default=1, help='Scripts en paralelo (fork)')
+    args = parser.parse_args()
+    desconocidas = [n for n in args.salidas if n not in SALIDAS]
+    if desconocidas:
+        parser.error(f"salidas desconocidas: {', '.join(desconocidas)}")
+    nombres = list(dict.fromkeys(args.salidas)) or list(SALIDAS)
+
+    print("=" * 80)
+    print("VISUALIZACIONES OB1 - UNA CARGA, UNA TOPOLOGÍA, TODAS LAS SALIDAS")
+    print("=" * 80)
+    inicio = time.perf_counter()
+    try:
+        cargar(nombres, args.tradicional, args.movil)
+    except FileNotFoundError as e:
+        print(f"❌ No se encontró {e.filename}")
+        sys.exit(1)
+    carga = time.perf_counter() - inicio
+    memoria = sesion.resumen()
+    print(f"✓ {memoria['trazas']} trazas y {memoria['topologias']} topologías en memoria "
+          f"({carga:.2f} s)")
+
+    tareas = [(n, argumentos_script(n, args), args.salida) for n in nombres]
+    resultados = []
+    if args.procesos > 1 and len(tareas) > 1:
+        contexto = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=args.procesos, mp_context=contexto) as pool:
+            futuros = [pool.submit(_ejecutar_en_hijo, t) for t in tareas]
+            for futuro in as_completed(futuros):
+                resultados.append(futuro.result())
+                print(f"  … {resultados[-1][0]} terminado")
+    else:
+        for tarea in tareas:
+            print(f"▶ {tarea[0]}")
+            resultados.append(ejecutar_script(*tarea))
+
+    print(f"\n{'Salida':<14} {'Tiempo':>9}  Estado")
+    fallidos = []
+    for nombre, codigo, segundos, texto in sorted(resultados, key=lambda r: nombres.index(r[0])):
+        print(f"{nombre:<14} {segundos:>8.1f}s  {'✓' if codigo == 0 else f'❌ código {codigo}'}")
+        if codigo != 0:
+            fallidos.append(nombre)
+            for linea in texto.rstrip().splitlines()[-15:]:
+                print(f"    {linea}")
+    print(f"\n✓ {len(resultados) - len(fallidos)}/{len(resultados)} salidas en "
+          f"{time.perf_counter() - inicio:.1f} s (carga y topología: {carga:.2f} s)")
+    if fallidos:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
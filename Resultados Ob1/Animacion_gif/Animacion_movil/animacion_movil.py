@@ -5,11 +5,40 @@ Animación de Arquitectura LoRaWAN Propuesta
 Gateways Móviles + Topología Híbrida (Estrella + P2P)
 """
 
-import pandas as pd
+import argparse
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Circle
-import numpy as np
+
+# Módulos compartidos (Herramientas/ en la raíz del repositorio)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'Herramientas'))
+import sesion_visual as sesion
+from etapas_render import animar_por_etapas
+from estelas import EstelaTrayectorias
+from topologia_red import RedFrame
+from interpolacion_trayectorias import METODOS, TrayectoriasInterpoladas
+from fondo_mapa import FondoEstatico
+from discos_cobertura import COBERTURA, DiscosCobertura
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument('--frames', type=int, default=60,
+                    help='Número de frames a animar (0 = traza completa)')
+parser.add_argument('--formato', choices=['gif', 'mp4', 'webm'], default='gif',
+                    help='Formato de salida de la animación')
+parser.add_argument('--procesos', type=int, default=1,
+                    help='Procesos de render en paralelo (fork)')
+parser.add_argument('--estela', type=int, default=6,
+                    help='Posiciones recientes en la estela de cada gateway')
+parser.add_argument('--sin-desvanecer', action='store_true',
+                    help='Dibujar la estela con opacidad uniforme')
+parser.add_argument('--fps', type=float, default=5,
+                    help='Frames por segundo del video')
+parser.add_argument('--escala', type=float,
+                    help='Segundos simulados por segundo de video (por defecto un frame por registro)')
+parser.add_argument('--suavizado', choices=METODOS, default='lineal',
+                    help='Interpolación de trayectorias entre registros')
+args = parser.parse_args()
 
 # Configuración
 plt.rcParams['font.family'] = 'DejaVu Sans'
@@ -22,152 +51,162 @@ print("=" * 80)
 # Leer datos
 print("\nCargando datos de posiciones...")
 try:
-    df_mobile = pd.read_csv('positions_mobile.csv')
+    df_mobile = sesion.posiciones('positions_mobile.csv')
     print(f"✓ Datos cargados: {len(df_mobile)} registros")
 except FileNotFoundError:
     print("❌ ERROR: No se encontró positions_mobile.csv")
     print("Asegúrate de ejecutar este script en ~/ns-3-dev/")
     exit(1)
 
-# Obtener tiempos únicos
-times = sorted(df_mobile['time'].unique())
-print(f"✓ Total de frames disponibles: {len(times)}")
+# Trayectorias interpoladas: tiempos de frame según fps y escala, posiciones
+# calculadas por bloques al pedirlas
+trayectorias = TrayectoriasInterpoladas(sesion.trazas('positions_mobile.csv'), args.suavizado)
+times = trayectorias.tiempos_animacion(fps=args.fps, escala=args.escala)
+print(f"✓ Total de frames disponibles: {len(times)} "
+      f"({times[1] - times[0] if len(times) > 1 else 0:g} s simulados por frame)")
 
-# Usar solo los primeros 60 frames (para animación más rápida)
-max_frames = min(60, len(times))
+# Usar solo los primeros N frames (--frames 0 anima la traza completa)
+max_frames = min(args.frames, len(times)) if args.frames > 0 else len(times)
 times = times[:max_frames]
+lector = trayectorias.lector(times)
 print(f"✓ Usando {max_frames} frames para animación")
 print(f"  Rango de tiempo: {times[0]:.0f}s - {times[-1]:.0f}s")
 
+def red_frame(frame_idx):
+    """Nodos presentes en el frame con su gateway más cercano (15 km)"""
+    ids, tipos, xy = lector.frame(frame_idx)
+    es = {tipo: tipos == tipo for tipo in ('boat', 'gateway', 'server')}
+    return RedFrame.desde_arreglos(times[frame_idx], xy[es['boat']], xy[es['gateway']],
+                                   xy[es['server']], alcance=15000, ids_boats=ids[es['boat']])
+
+# La estela lee con su propio lector: el de red_frame corre en el hilo de cálculo
+lector_estela = trayectorias.lector(times)
+
+def gateways_frame(frame_idx):
+    ids, tipos, xy = lector_estela.frame(frame_idx)
+    es_gw = tipos == 'gateway'
+    return ids[es_gw], xy[es_gw]
+
+df_gw = df_mobile[df_mobile['type'] == 'gateway']
+
+# Estela de gateways: buffer circular actualizado en O(gateways) por frame
+estela = EstelaTrayectorias(df_gw['node_id'].unique(), longitud=args.estela,
+                            desvanecer=not args.sin_desvanecer)
+ultimo_frame_estela = None
+
+def avanzar_estela(frame_idx):
+    """Lleva la estela hasta frame_idx (rellena si el frame no es consecutivo)"""
+    global ultimo_frame_estela
+    frame_idx %= len(times)
+    if ultimo_frame_estela is None or frame_idx != ultimo_frame_estela + 1:
+        estela.reiniciar()
+        desde = max(0, frame_idx - estela.longitud + 1)
+    else:
+        desde = frame_idx
+    for k in range(desde, frame_idx + 1):
+        estela.actualizar(*gateways_frame(k))
+    ultimo_frame_estela = frame_idx
+
 # Configurar figura
 fig, ax = plt.subplots(figsize=(14, 9))
+fondo = FondoEstatico(fig, clave=Path(__file__).read_bytes())
+discos = DiscosCobertura(ax, **COBERTURA['movil'], alpha=0.10)
 
 def init():
-    ax.clear()
+    # Fondo fijo: se rasteriza una vez y cada frame dibuja solo lo dinámico
     ax.set_facecolor('#E8F5E9')
-    ax.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7)
+    ax.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7, label='Costa')
     ax.set_xlim(0, 25000)
     ax.set_ylim(0, 15000)
-    ax.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=12)
-    ax.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=12)
+    ax.set_xlabel('Distancia Este (metros)', fontweight='bold', fontsize=12)
+    ax.set_ylabel('Distancia Norte (metros)', fontweight='bold', fontsize=12)
     ax.set_title('🚢 Red LoRaWAN Marítima - Arquitectura Propuesta\nGateways Móviles + P2P', 
                 fontweight='bold', fontsize=14, pad=15, color='#27AE60')
     ax.grid(True, alpha=0.3, linestyle='--')
+    
+    # Información adicional
+    info_text = f'Cantón Salinas | Área: 375 km² | SF: 7-12 | UPSE'
+    banner = ax.text(0.5, 0.02, info_text, transform=ax.transAxes,
+                     fontsize=9, verticalalignment='bottom', ha='center',
+                     bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
+                     style='italic', color='#7F8C8D')
+    fondo.fijar(persistentes=[banner, discos.coleccion])
     return []
 
-def animate(frame_idx):
-    ax.clear()
-    
-    # Fondo
-    ax.set_facecolor('#E8F5E9')
-    ax.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7, label='Costa')
+def calcular(frame_idx):
+    """Topología y relays P2P del frame (etapa de cálculo)"""
+    red = red_frame(frame_idx)
+    return red, red.relays()
+
+def animate(frame_idx, datos=None):
+    fondo.limpiar()
     
     current_time = times[frame_idx]
     
-    # Filtrar datos del tiempo actual
-    current_data = df_mobile[df_mobile['time'] == current_time]
+    # Nodos del tiempo actual con su gateway más cercano
+    red, relays = datos if datos is not None else calcular(frame_idx)
+    boats, gateways, server = red.boats, red.gateways, red.servidor
     
-    # Separar por tipo
-    boats = current_data[current_data['type'] == 'boat']
-    gateways = current_data[current_data['type'] == 'gateway']
-    server = current_data[current_data['type'] == 'server']
+    # Círculos de cobertura DINÁMICA de gateways móviles (15 km de radio)
+    discos.actualizar(gateways)
     
-    # Dibujar círculos de cobertura DINÁMICA de gateways móviles (15 km de radio)
-    for _, gw in gateways.iterrows():
-        coverage = Circle((gw['x'], gw['y']), 15000, 
-                         color='#27AE60', fill=True, alpha=0.10,
-                         linewidth=2, edgecolor='#27AE60', linestyle='--')
-        ax.add_patch(coverage)
+    # Dibujar trayectorias de gateways móviles (estela por gateway)
+    avanzar_estela(frame_idx)
+    estela.dibujar(ax)
     
-    # Dibujar trayectorias de gateways móviles (últimos 5 puntos)
-    if frame_idx >= 5:
-        for gw_id in gateways.index:
-            past_times = times[max(0, frame_idx-5):frame_idx+1]
-            past_data = df_mobile[
-                (df_mobile['time'].isin(past_times)) & 
-                (df_mobile['type'] == 'gateway')
-            ]
-            if len(past_data) > 1:
-                ax.plot(past_data['x'], past_data['y'], 
-                       color='#27AE60', linewidth=1.5, alpha=0.3, 
-                       linestyle=':', zorder=3)
-    
-    # Dibujar enlaces de comunicación directa
+    # Enlace directo si está en rango; si no (hasta 20 km), relay P2P por una embarcación
     connected_boats = 0
     p2p_links = 0
-    
-    for _, boat in boats.iterrows():
-        # Encontrar gateway más cercano
-        min_dist = float('inf')
-        closest_gw = None
-        
-        for _, gw in gateways.iterrows():
-            dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_gw = gw
-        
-        # Enlace directo si está en rango
-        if closest_gw is not None and min_dist <= 15000:  # Dentro del rango LoRa
-            ax.plot([boat['x'], closest_gw['x']], 
-                   [boat['y'], closest_gw['y']], 
+    for k, boat in enumerate(boats):
+        if red.en_rango[k]:
+            gw = gateways[red.cercano[k]]
+            ax.plot([boat[0], gw[0]], 
+                   [boat[1], gw[1]], 
                    color='#52BE80', linewidth=0.8, alpha=0.5)
             connected_boats += 1
-        # Simular enlace P2P si está fuera de rango directo
-        elif closest_gw is not None and 15000 < min_dist <= 20000:
-            # Buscar embarcación intermedia para relay P2P
-            for _, relay_boat in boats.iterrows():
-                dist_to_relay = np.sqrt((boat['x'] - relay_boat['x'])**2 + (boat['y'] - relay_boat['y'])**2)
-                dist_relay_to_gw = np.sqrt((relay_boat['x'] - closest_gw['x'])**2 + (relay_boat['y'] - closest_gw['y'])**2)
-                
-                # Si la embarcación relay está en rango de ambos
-                if dist_to_relay < 5000 and dist_relay_to_gw <= 15000:
-                    # Enlace P2P embarcación -> relay (línea punteada morada)
-                    ax.plot([boat['x'], relay_boat['x']], 
-                           [boat['y'], relay_boat['y']], 
-                           color='#9B59B6', linewidth=1.2, alpha=0.6, 
-                           linestyle='--', zorder=4)
-                    # Enlace relay -> gateway
-                    ax.plot([relay_boat['x'], closest_gw['x']], 
-                           [relay_boat['y'], closest_gw['y']], 
-                           color='#52BE80', linewidth=0.8, alpha=0.5)
-                    p2p_links += 1
-                    connected_boats += 1
-                    break
+        elif relays[k] >= 0:
+            relay_boat = boats[relays[k]]
+            gw = gateways[red.cercano[k]]
+            # Enlace P2P embarcación -> relay (línea punteada morada)
+            ax.plot([boat[0], relay_boat[0]], 
+                   [boat[1], relay_boat[1]], 
+                   color='#9B59B6', linewidth=1.2, alpha=0.6, 
+                   linestyle='--', zorder=4)
+            # Enlace relay -> gateway
+            ax.plot([relay_boat[0], gw[0]], 
+                   [relay_boat[1], gw[1]], 
+                   color='#52BE80', linewidth=0.8, alpha=0.5)
+            p2p_links += 1
+            connected_boats += 1
     
     # Dibujar enlaces de gateways a servidor (backhaul)
     if len(server) > 0:
-        srv = server.iloc[0]
-        for _, gw in gateways.iterrows():
-            ax.plot([gw['x'], srv['x']], 
-                   [gw['y'], srv['y']], 
+        srv = server[0]
+        for gw in gateways:
+            ax.plot([gw[0], srv[0]], 
+                   [gw[1], srv[1]], 
                    color='#F39C12', linewidth=1.5, alpha=0.6, linestyle=':')
     
     # Dibujar nodos
-    ax.scatter(boats['x'], boats['y'], 
+    ax.scatter(boats[:, 0], boats[:, 1], 
               c='#3498DB', s=100, marker='o', 
               label=f'Embarcaciones ({len(boats)})', 
               alpha=0.8, edgecolors='#2874A6', linewidths=1.5, zorder=5)
     
-    ax.scatter(gateways['x'], gateways['y'], 
+    ax.scatter(gateways[:, 0], gateways[:, 1], 
               c='#27AE60', s=400, marker='^', 
               label=f'Gateways Móviles ({len(gateways)})', 
               alpha=0.9, edgecolors='#1E8449', linewidths=2.5, zorder=6)
     
     if len(server) > 0:
-        ax.scatter(server['x'], server['y'], 
+        ax.scatter(server[:, 0], server[:, 1], 
                   c='#F39C12', s=500, marker='D', 
                   label='Network Server', 
                   alpha=0.95, edgecolors='#D68910', linewidths=2.5, zorder=7)
     
     # Configuración del gráfico
-    ax.set_xlim(0, 25000)
-    ax.set_ylim(0, 15000)
-    ax.set_xlabel('Distancia Este (metros)', fontweight='bold', fontsize=12)
-    ax.set_ylabel('Distancia Norte (metros)', fontweight='bold', fontsize=12)
     ax.set_title(f'🚢 Arquitectura Propuesta - LoRaWAN\nTiempo: {current_time:.0f}s', 
                 fontweight='bold', fontsize=14, pad=15, color='#27AE60')
-    ax.grid(True, alpha=0.3, linestyle='--')
     ax.legend(loc='upper right', fontsize=10, framealpha=0.9, 
              edgecolor='#27AE60', fancybox=True)
     
@@ -183,27 +222,18 @@ def animate(frame_idx):
                     edgecolor='#27AE60', linewidth=2.5),
            color='#27AE60')
     
-    # Información adicional
-    info_text = f'Cantón Salinas | Área: 375 km² | SF: 7-12 | UPSE'
-    ax.text(0.5, 0.02, info_text, transform=ax.transAxes,
-           fontsize=9, verticalalignment='bottom', ha='center',
-           bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
-           style='italic', color='#7F8C8D')
-    
     return []
 
 print("\nCreando animación de arquitectura propuesta...")
 print("(Esto puede tardar 1-3 minutos)")
 
-anim = animation.FuncAnimation(fig, animate, init_func=init,
-                              frames=len(times), interval=200, 
-                              blit=True, repeat=True)
-
-# Guardar como GIF
-output_gif = 'Animacion_Arquitectura_Movil.gif'
-print(f"\nGuardando animación como GIF ({len(times)} frames a 5 fps)...")
-anim.save(output_gif, writer='pillow', fps=5, dpi=100)
-print(f"✓ Animación guardada: {output_gif}")
+# Cálculo, render y codificación (ffmpeg) por etapas solapadas: memoria constante
+output_anim = f'Animacion_Arquitectura_Movil.{args.formato}'
+print(f"\nGuardando animación como {args.formato.upper()} ({len(times)} frames a {args.fps:g} fps)...")
+init()
+animar_por_etapas(fig, animate, len(times), output_anim, fps=args.fps, dpi=100,
+                  calcular=calcular, procesos=args.procesos, capturar=fondo.capturar)
+print(f"✓ Animación guardada: {output_anim}")
 
 plt.close()
 
@@ -213,100 +243,88 @@ print("\nGenerando capturas de momentos clave...")
 key_frames = [0, len(times)//4, len(times)//2, 3*len(times)//4, -1]
 frame_names = ['inicio', 'cuarto', 'mitad', 'tres_cuartos', 'final']
 
+# Una sola figura para todas las capturas: el fondo a 300 dpi se dibuja una vez
+fig_static, ax_static = plt.subplots(figsize=(14, 9))
+fondo_static = FondoEstatico(fig_static, clave=Path(__file__).read_bytes())
+discos_static = DiscosCobertura(ax_static, **COBERTURA['movil'], alpha=0.10)
+ax_static.set_facecolor('#E8F5E9')
+ax_static.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7)
+ax_static.set_xlim(0, 25000)
+ax_static.set_ylim(0, 15000)
+ax_static.set_xlabel('Distancia Este (metros)', fontweight='bold', fontsize=12)
+ax_static.set_ylabel('Distancia Norte (metros)', fontweight='bold', fontsize=12)
+ax_static.grid(True, alpha=0.3, linestyle='--')
+
+# Info
+info_text = f'cantón Salinas, Ecuador | Área: 25×15 km'
+banner = ax_static.text(0.5, 0.02, info_text, transform=ax_static.transAxes,
+                        fontsize=9, verticalalignment='bottom', ha='center',
+                        bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
+                        style='italic', color='#7F8C8D')
+fondo_static.fijar(persistentes=[banner, discos_static.coleccion])
+
 for idx, (frame_idx, name) in enumerate(zip(key_frames, frame_names)):
-    fig_static, ax_static = plt.subplots(figsize=(14, 9))
+    fondo_static.limpiar()
     
     current_time = times[frame_idx]
-    current_data = df_mobile[df_mobile['time'] == current_time]
-    
-    # Fondo
-    ax_static.set_facecolor('#E8F5E9')
-    ax_static.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7)
-    
-    boats = current_data[current_data['type'] == 'boat']
-    gateways = current_data[current_data['type'] == 'gateway']
-    server = current_data[current_data['type'] == 'server']
+    red = red_frame(frame_idx)
+    boats, gateways, server = red.boats, red.gateways, red.servidor
     
     # Círculos de cobertura dinámica
-    for _, gw in gateways.iterrows():
-        coverage = Circle((gw['x'], gw['y']), 15000, 
-                         color='#27AE60', fill=True, alpha=0.10,
-                         linewidth=2, edgecolor='#27AE60', linestyle='--')
-        ax_static.add_patch(coverage)
+    discos_static.actualizar(gateways)
     
     # Trayectorias de gateways
-    if frame_idx >= 5:
-        past_times = times[max(0, frame_idx-5):frame_idx+1]
-        past_data = df_mobile[
-            (df_mobile['time'].isin(past_times)) & 
-            (df_mobile['type'] == 'gateway')
-        ]
-        if len(past_data) > 1:
-            ax_static.plot(past_data['x'], past_data['y'], 
-                          color='#27AE60', linewidth=1.5, alpha=0.3, 
-                          linestyle=':', zorder=3)
+    avanzar_estela(frame_idx)
+    estela.dibujar(ax_static)
     
-    # Enlaces
+    # Enlace directo si está en rango; si no (hasta 20 km), relay P2P por una embarcación
     connected_boats = 0
     p2p_links = 0
-    
-    for _, boat in boats.iterrows():
-        min_dist = float('inf')
-        closest_gw = None
-        for _, gw in gateways.iterrows():
-            dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_gw = gw
-        
-        if closest_gw is not None and min_dist <= 15000:
-            ax_static.plot([boat['x'], closest_gw['x']], 
-                          [boat['y'], closest_gw['y']], 
+    relays = red.relays()
+    for k, boat in enumerate(boats):
+        if red.en_rango[k]:
+            gw = gateways[red.cercano[k]]
+            ax_static.plot([boat[0], gw[0]], 
+                          [boat[1], gw[1]], 
+                          color='#52BE80', linewidth=0.8, alpha=0.5)
+            connected_boats += 1
+        elif relays[k] >= 0:
+            relay_boat = boats[relays[k]]
+            gw = gateways[red.cercano[k]]
+            # Enlace P2P embarcación -> relay (línea punteada morada)
+            ax_static.plot([boat[0], relay_boat[0]], 
+                          [boat[1], relay_boat[1]], 
+                          color='#9B59B6', linewidth=1.2, alpha=0.6, 
+                          linestyle='--', zorder=4)
+            # Enlace relay -> gateway
+            ax_static.plot([relay_boat[0], gw[0]], 
+                          [relay_boat[1], gw[1]], 
                           color='#52BE80', linewidth=0.8, alpha=0.5)
+            p2p_links += 1
             connected_boats += 1
-        elif closest_gw is not None and 15000 < min_dist <= 20000:
-            for _, relay_boat in boats.iterrows():
-                dist_to_relay = np.sqrt((boat['x'] - relay_boat['x'])**2 + (boat['y'] - relay_boat['y'])**2)
-                dist_relay_to_gw = np.sqrt((relay_boat['x'] - closest_gw['x'])**2 + (relay_boat['y'] - closest_gw['y'])**2)
-                if dist_to_relay < 5000 and dist_relay_to_gw <= 15000:
-                    ax_static.plot([boat['x'], relay_boat['x']], 
-                                  [boat['y'], relay_boat['y']], 
-                                  color='#9B59B6', linewidth=1.2, alpha=0.6, 
-                                  linestyle='--', zorder=4)
-                    ax_static.plot([relay_boat['x'], closest_gw['x']], 
-                                  [relay_boat['y'], closest_gw['y']], 
-                                  color='#52BE80', linewidth=0.8, alpha=0.5)
-                    p2p_links += 1
-                    connected_boats += 1
-                    break
     
     # Backhaul
     if len(server) > 0:
-        srv = server.iloc[0]
-        for _, gw in gateways.iterrows():
-            ax_static.plot([gw['x'], srv['x']], 
-                          [gw['y'], srv['y']], 
+        srv = server[0]
+        for gw in gateways:
+            ax_static.plot([gw[0], srv[0]], 
+                          [gw[1], srv[1]], 
                           color='#F39C12', linewidth=1.5, alpha=0.6, linestyle=':')
     
     # Nodos
-    ax_static.scatter(boats['x'], boats['y'], c='#3498DB', s=100, marker='o', 
+    ax_static.scatter(boats[:, 0], boats[:, 1], c='#3498DB', s=100, marker='o', 
                      label=f'Embarcaciones ({len(boats)})', alpha=0.8, 
                      edgecolors='#2874A6', linewidths=1.5, zorder=5)
-    ax_static.scatter(gateways['x'], gateways['y'], c='#27AE60', s=400, marker='^', 
+    ax_static.scatter(gateways[:, 0], gateways[:, 1], c='#27AE60', s=400, marker='^', 
                      label=f'Gateways Móviles ({len(gateways)})', alpha=0.9, 
                      edgecolors='#1E8449', linewidths=2.5, zorder=6)
     if len(server) > 0:
-        ax_static.scatter(server['x'], server['y'], c='#F39C12', s=500, marker='D', 
+        ax_static.scatter(server[:, 0], server[:, 1], c='#F39C12', s=500, marker='D', 
                          label='Network Server', alpha=0.95, 
                          edgecolors='#D68910', linewidths=2.5, zorder=7)
     
-    ax_static.set_xlim(0, 25000)
-    ax_static.set_ylim(0, 15000)
-    ax_static.set_xlabel('Distancia Este (metros)', fontweight='bold', fontsize=12)
-    ax_static.set_ylabel('Distancia Norte (metros)', fontweight='bold', fontsize=12)
     ax_static.set_title(f'🚢 Arquitectura Propuesta - LoRaWAN\nTiempo: {current_time:.0f}s', 
                        fontweight='bold', fontsize=14, pad=15, color='#27AE60')
-    ax_static.grid(True, alpha=0.3, linestyle='--')
     ax_static.legend(loc='upper right', fontsize=10, framealpha=0.9,
                     edgecolor='#27AE60', fancybox=True)
     
@@ -322,24 +340,19 @@ for idx, (frame_idx, name) in enumerate(zip(key_frames, frame_names)):
                            edgecolor='#27AE60', linewidth=2.5),
                   color='#27AE60')
     
-    # Info
-    info_text = f'cantón Salinas, Ecuador | Área: 25×15 km'
-    ax_static.text(0.5, 0.02, info_text, transform=ax_static.transAxes,
-                  fontsize=9, verticalalignment='bottom', ha='center',
-                  bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
-                  style='italic', color='#7F8C8D')
-    
-    plt.tight_layout()
+    if idx == 0:
+        plt.tight_layout()
     
     output_img = f'Movil_Captura_{idx+1}_{name}.png'
-    plt.savefig(output_img, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    fondo_static.guardar(output_img, dpi=300)
     print(f"✓ Captura {idx+1} guardada: {output_img}")
 
+plt.close(fig_static)
+
 print("\n" + "=" * 80)
 print("ARCHIVOS GENERADOS - ARQUITECTURA PROPUESTA:")
 print("=" * 80)
-print(f"  1. {output_gif} (animación)")
+print(f"  1. {output_anim} (animación)")
 print("  2. Movil_Captura_1_inicio.png")
 print("  3. Movil_Captura_2_cuarto.png")
 print("  4. Movil_Captura_3_mitad.png")
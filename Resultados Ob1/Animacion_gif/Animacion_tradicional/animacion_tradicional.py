@@ -5,11 +5,27 @@ Animación de Arquitectura LoRaWAN Tradicional
 Gateways Fijos Costeros + Topología Estrella
 """
 
-import pandas as pd
+import argparse
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Circle
-import numpy as np
+
+# Módulos compartidos (Herramientas/ en la raíz del repositorio)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'Herramientas'))
+import sesion_visual as sesion
+from etapas_render import animar_por_etapas
+from fondo_mapa import FondoEstatico
+from discos_cobertura import COBERTURA, DiscosCobertura
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument('--frames', type=int, default=60,
+                    help='Número de frames a animar (0 = traza completa)')
+parser.add_argument('--formato', choices=['gif', 'mp4', 'webm'], default='gif',
+                    help='Formato de salida de la animación')
+parser.add_argument('--procesos', type=int, default=1,
+                    help='Procesos de render en paralelo (fork)')
+args = parser.parse_args()
 
 # Configuración
 plt.rcParams['font.family'] = 'DejaVu Sans'
@@ -22,115 +38,104 @@ print("=" * 80)
 # Leer datos
 print("\nCargando datos de posiciones...")
 try:
-    df_fixed = pd.read_csv('positions_fixed.csv')
+    df_fixed = sesion.posiciones('positions_fixed.csv')
     print(f"✓ Datos cargados: {len(df_fixed)} registros")
 except FileNotFoundError:
     print("❌ ERROR: No se encontró positions_fixed.csv")
     print("Asegúrate de ejecutar este script en ~/ns-3-dev/")
     exit(1)
 
+# Gateway más cercano de cada embarcación en todos los frames (una sola vez)
+topologia = sesion.topologia('positions_fixed.csv', alcance=15000)
+
 # Obtener tiempos únicos
-times = sorted(df_fixed['time'].unique())
+times = list(topologia.tiempos)
 print(f"✓ Total de frames disponibles: {len(times)}")
 
-# Usar solo los primeros 60 frames (para animación más rápida)
-max_frames = min(60, len(times))
+# Usar solo los primeros N frames (--frames 0 anima la traza completa)
+max_frames = min(args.frames, len(times)) if args.frames > 0 else len(times)
 times = times[:max_frames]
 print(f"✓ Usando {max_frames} frames para animación")
 print(f"  Rango de tiempo: {times[0]:.0f}s - {times[-1]:.0f}s")
 
 # Configurar figura
 fig, ax = plt.subplots(figsize=(14, 9))
+fondo = FondoEstatico(fig, clave=Path(__file__).read_bytes())
+discos = DiscosCobertura(ax, **COBERTURA['tradicional'], alpha=0.08)
 
 def init():
-    ax.clear()
+    # Fondo fijo: se rasteriza una vez y cada frame dibuja solo lo dinámico
     ax.set_facecolor('#E3F2FD')
-    ax.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7)
+    ax.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7, label='Costa')
     ax.set_xlim(0, 25000)
     ax.set_ylim(0, 15000)
-    ax.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=12)
-    ax.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=12)
+    ax.set_xlabel('Distancia Este (metros)', fontweight='bold', fontsize=12)
+    ax.set_ylabel('Distancia Norte (metros)', fontweight='bold', fontsize=12)
     ax.set_title('⚓ Red LoRaWAN Marítima - Arquitectura Tradicional\nGateways Fijos Costeros', 
                 fontweight='bold', fontsize=14, pad=15, color='#E74C3C')
     ax.grid(True, alpha=0.3, linestyle='--')
+    
+    # Información adicional
+    info_text = f'Cantón Salinas | Área: 375 km² | SF: 7-12 | UPSE'
+    banner = ax.text(0.5, 0.02, info_text, transform=ax.transAxes,
+                     fontsize=9, verticalalignment='bottom', ha='center',
+                     bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
+                     style='italic', color='#7F8C8D')
+    fondo.fijar(persistentes=[banner, discos.coleccion])
     return []
 
-def animate(frame_idx):
-    ax.clear()
-    
-    # Fondo
-    ax.set_facecolor('#E3F2FD')
-    ax.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7, label='Costa')
+def calcular(frame_idx):
+    """Nodos del frame con su gateway más cercano (etapa de cálculo)"""
+    return topologia.frame(frame_idx)
+
+def animate(frame_idx, red=None):
+    fondo.limpiar()
     
     current_time = times[frame_idx]
     
-    # Filtrar datos del tiempo actual
-    current_data = df_fixed[df_fixed['time'] == current_time]
-    
-    # Separar por tipo
-    boats = current_data[current_data['type'] == 'boat']
-    gateways = current_data[current_data['type'] == 'gateway']
-    server = current_data[current_data['type'] == 'server']
+    # Nodos del tiempo actual con su gateway más cercano
+    if red is None:
+        red = calcular(frame_idx)
+    boats, gateways, server = red.boats, red.gateways, red.servidor
     
-    # Dibujar círculos de cobertura de gateways fijos (15 km de radio)
-    for _, gw in gateways.iterrows():
-        coverage = Circle((gw['x'], gw['y']), 15000, 
-                         color='#E74C3C', fill=True, alpha=0.08,
-                         linewidth=2, edgecolor='#E74C3C', linestyle='--')
-        ax.add_patch(coverage)
+    # Círculos de cobertura de gateways fijos (15 km de radio)
+    discos.actualizar(gateways)
     
-    # Dibujar enlaces de comunicación
-    connected_boats = 0
-    for _, boat in boats.iterrows():
-        # Encontrar gateway más cercano
-        min_dist = float('inf')
-        closest_gw = None
-        
-        for _, gw in gateways.iterrows():
-            dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_gw = gw
-        
-        if closest_gw is not None and min_dist <= 15000:  # Dentro del rango LoRa
-            ax.plot([boat['x'], closest_gw['x']], 
-                   [boat['y'], closest_gw['y']], 
-                   color='#95A5A6', linewidth=0.8, alpha=0.4)
-            connected_boats += 1
+    # Dibujar enlaces de comunicación (embarcación -> gateway más cercano en rango)
+    for boat, gw in zip(*red.enlaces()):
+        ax.plot([boat[0], gw[0]], 
+               [boat[1], gw[1]], 
+               color='#95A5A6', linewidth=0.8, alpha=0.4)
+    connected_boats = red.conectadas
     
     # Dibujar enlaces de gateways a servidor (backhaul)
     if len(server) > 0:
-        srv = server.iloc[0]
-        for _, gw in gateways.iterrows():
-            ax.plot([gw['x'], srv['x']], 
-                   [gw['y'], srv['y']], 
+        srv = server[0]
+        for gw in gateways:
+            ax.plot([gw[0], srv[0]], 
+                   [gw[1], srv[1]], 
                    color='#F39C12', linewidth=1.5, alpha=0.6, linestyle=':')
     
     # Dibujar nodos
-    ax.scatter(boats['x'], boats['y'], 
+    ax.scatter(boats[:, 0], boats[:, 1], 
               c='#3498DB', s=100, marker='o', 
               label=f'Embarcaciones ({len(boats)})', 
               alpha=0.8, edgecolors='#2874A6', linewidths=1.5, zorder=5)
     
-    ax.scatter(gateways['x'], gateways['y'], 
+    ax.scatter(gateways[:, 0], gateways[:, 1], 
               c='#E74C3C', s=400, marker='s', 
               label=f'Gateways Fijos Costeros ({len(gateways)})', 
               alpha=0.9, edgecolors='#C0392B', linewidths=2.5, zorder=6)
     
     if len(server) > 0:
-        ax.scatter(server['x'], server['y'], 
+        ax.scatter(server[:, 0], server[:, 1], 
                   c='#F39C12', s=500, marker='D', 
                   label='Network Server', 
                   alpha=0.95, edgecolors='#D68910', linewidths=2.5, zorder=7)
     
     # Configuración del gráfico
-    ax.set_xlim(0, 25000)
-    ax.set_ylim(0, 15000)
-    ax.set_xlabel('Distancia Este (metros)', fontweight='bold', fontsize=12)
-    ax.set_ylabel('Distancia Norte (metros)', fontweight='bold', fontsize=12)
     ax.set_title(f'⚓ Arquitectura Tradicional - LoRaWAN\nTiempo: {current_time:.0f}s', 
                 fontweight='bold', fontsize=14, pad=15, color='#E74C3C')
-    ax.grid(True, alpha=0.3, linestyle='--')
     ax.legend(loc='upper right', fontsize=10, framealpha=0.9, 
              edgecolor='#E74C3C', fancybox=True)
     
@@ -146,27 +151,18 @@ def animate(frame_idx):
                     edgecolor='#E74C3C', linewidth=2.5),
            color='#E74C3C')
     
-    # Información adicional
-    info_text = f'Cantón Salinas | Área: 375 km² | SF: 7-12 | UPSE'
-    ax.text(0.5, 0.02, info_text, transform=ax.transAxes,
-           fontsize=9, verticalalignment='bottom', ha='center',
-           bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
-           style='italic', color='#7F8C8D')
-    
     return []
 
 print("\nCreando animación de arquitectura tradicional...")
 print("(Esto puede tardar 1-3 minutos)")
 
-anim = animation.FuncAnimation(fig, animate, init_func=init,
-                              frames=len(times), interval=200, 
-                              blit=True, repeat=True)
-
-# Guardar como GIF
-output_gif = 'Animacion_Arquitectura_Tradicional.gif'
-print(f"\nGuardando animación como GIF ({len(times)} frames a 5 fps)...")
-anim.save(output_gif, writer='pillow', fps=5, dpi=100)
-print(f"✓ Animación guardada: {output_gif}")
+# Cálculo, render y codificación (ffmpeg) por etapas solapadas: memoria constante
+output_anim = f'Animacion_Arquitectura_Tradicional.{args.formato}'
+print(f"\nGuardando animación como {args.formato.upper()} ({len(times)} frames a 5 fps)...")
+init()
+animar_por_etapas(fig, animate, len(times), output_anim, fps=5, dpi=100, calcular=calcular,
+                  procesos=args.procesos, capturar=fondo.capturar)
+print(f"✓ Animación guardada: {output_anim}")
 
 plt.close()
 
@@ -176,70 +172,65 @@ print("\nGenerando capturas de momentos clave...")
 key_frames = [0, len(times)//4, len(times)//2, 3*len(times)//4, -1]
 frame_names = ['inicio', 'cuarto', 'mitad', 'tres_cuartos', 'final']
 
+# Una sola figura para todas las capturas: el fondo a 300 dpi se dibuja una vez
+fig_static, ax_static = plt.subplots(figsize=(14, 9))
+fondo_static = FondoEstatico(fig_static, clave=Path(__file__).read_bytes())
+discos_static = DiscosCobertura(ax_static, **COBERTURA['tradicional'], alpha=0.08)
+ax_static.set_facecolor('#E3F2FD')
+ax_static.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7)
+ax_static.set_xlim(0, 25000)
+ax_static.set_ylim(0, 15000)
+ax_static.set_xlabel('Distancia Este (metros)', fontweight='bold', fontsize=12)
+ax_static.set_ylabel('Distancia Norte (metros)', fontweight='bold', fontsize=12)
+ax_static.grid(True, alpha=0.3, linestyle='--')
+
+# Info
+info_text = f'cantón Salinas, Ecuador | Área: 25×15 km'
+banner = ax_static.text(0.5, 0.02, info_text, transform=ax_static.transAxes,
+                        fontsize=9, verticalalignment='bottom', ha='center',
+                        bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
+                        style='italic', color='#7F8C8D')
+fondo_static.fijar(persistentes=[banner, discos_static.coleccion])
+
 for idx, (frame_idx, name) in enumerate(zip(key_frames, frame_names)):
-    fig_static, ax_static = plt.subplots(figsize=(14, 9))
+    fondo_static.limpiar()
     
     current_time = times[frame_idx]
-    current_data = df_fixed[df_fixed['time'] == current_time]
-    
-    # Fondo
-    ax_static.set_facecolor('#E3F2FD')
-    ax_static.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7)
-    
-    boats = current_data[current_data['type'] == 'boat']
-    gateways = current_data[current_data['type'] == 'gateway']
-    server = current_data[current_data['type'] == 'server']
+    red = topologia.frame(topologia.indice(current_time))
+    boats, gateways, server = red.boats, red.gateways, red.servidor
     
     # Círculos de cobertura
-    for _, gw in gateways.iterrows():
-        coverage = Circle((gw['x'], gw['y']), 15000, 
-                         color='#E74C3C', fill=True, alpha=0.08,
-                         linewidth=2, edgecolor='#E74C3C', linestyle='--')
-        ax_static.add_patch(coverage)
+    discos_static.actualizar(gateways)
     
     # Enlaces
-    connected_boats = 0
-    for _, boat in boats.iterrows():
-        min_dist = float('inf')
-        closest_gw = None
-        for _, gw in gateways.iterrows():
-            dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_gw = gw
-        if closest_gw is not None and min_dist <= 15000:
-            ax_static.plot([boat['x'], closest_gw['x']], 
-                          [boat['y'], closest_gw['y']], 
-                          color='#95A5A6', linewidth=0.8, alpha=0.4)
-            connected_boats += 1
+    for boat, gw in zip(*red.enlaces()):
+        ax_static.plot([boat[0], gw[0]], 
+                      [boat[1], gw[1]], 
+                      color='#95A5A6', linewidth=0.8, alpha=0.4)
+    connected_boats = red.conectadas
     
     # Backhaul
     if len(server) > 0:
-        srv = server.iloc[0]
-        for _, gw in gateways.iterrows():
-            ax_static.plot([gw['x'], srv['x']], 
-                          [gw['y'], srv['y']], 
+        srv = server[0]
+        for gw in gateways:
+            ax_static.plot([gw[0], srv[0]], 
+                          [gw[1], srv[1]], 
                           color='#F39C12', linewidth=1.5, alpha=0.6, linestyle=':')
     
     # Nodos
-    ax_static.scatter(boats['x'], boats['y'], c='#3498DB', s=100, marker='o', 
+    ax_static.scatter(boats[:, 0], boats[:, 1], c='#3498DB', s=100, marker='o', 
                      label=f'Embarcaciones ({len(boats)})', alpha=0.8, 
                      edgecolors='#2874A6', linewidths=1.5, zorder=5)
-    ax_static.scatter(gateways['x'], gateways['y'], c='#E74C3C', s=400, marker='s', 
+    ax_static.scatter(gateways[:, 0], gateways[:, 1], c='#E74C3C', s=400, marker='s', 
                      label=f'Gateways Fijos ({len(gateways)})', alpha=0.9, 
                      edgecolors='#C0392B', linewidths=2.5, zorder=6)
     if len(server) > 0:
-        ax_static.scatter(server['x'], server['y'], c='#F39C12', s=500, marker='D', 
+        ax_static.scatter(server[:, 0], server[:, 1], c='#F39C12', s=500, marker='D', 
                          label='Network Server', alpha=0.95, 
                          edgecolors='#D68910', linewidths=2.5, zorder=7)
     
-    ax_static.set_xlim(0, 25000)
-    ax_static.set_ylim(0, 15000)
-    ax_static.set_xlabel('Distancia Este (metros)', fontweight='bold', fontsize=12)
-    ax_static.set_ylabel('Distancia Norte (metros)', fontweight='bold', fontsize=12)
     ax_static.set_title(f'⚓ Arquitectura Tradicional - LoRaWAN\nTiempo: {current_time:.0f}s', 
                        fontweight='bold', fontsize=14, pad=15, color='#E74C3C')
-    ax_static.grid(True, alpha=0.3, linestyle='--')
     ax_static.legend(loc='upper right', fontsize=10, framealpha=0.9,
                     edgecolor='#E74C3C', fancybox=True)
     
@@ -254,24 +245,19 @@ for idx, (frame_idx, name) in enumerate(zip(key_frames, frame_names)):
                            edgecolor='#E74C3C', linewidth=2.5),
                   color='#E74C3C')
     
-    # Info
-    info_text = f'cantón Salinas, Ecuador | Área: 25×15 km'
-    ax_static.text(0.5, 0.02, info_text, transform=ax_static.transAxes,
-                  fontsize=9, verticalalignment='bottom', ha='center',
-                  bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
-                  style='italic', color='#7F8C8D')
-    
-    plt.tight_layout()
+    if idx == 0:
+        plt.tight_layout()
     
     output_img = f'Tradicional_Captura_{idx+1}_{name}.png'
-    plt.savefig(output_img, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    fondo_static.guardar(output_img, dpi=300)
     print(f"✓ Captura {idx+1} guardada: {output_img}")
 
+plt.close(fig_static)
+
 print("\n" + "=" * 80)
 print("ARCHIVOS GENERADOS - ARQUITECTURA TRADICIONAL:")
 print("=" * 80)
-print(f"  1. {output_gif} (animación)")
+print(f"  1. {output_anim} (animación)")
 print("  2. Tradicional_Captura_1_inicio.png")
 print("  3. Tradicional_Captura_2_cuarto.png")
 print("  4. Tradicional_Captura_3_mitad.png")
@@ -5,11 +5,32 @@ Animación Comparativa de Arquitecturas LoRaWAN
 Tradicional (Fijos) vs Propuesta (Móviles + P2P)
 """
 
-import pandas as pd
+import argparse
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Circle
-import numpy as np
+
+# Módulos compartidos (Herramientas/ en la raíz del repositorio)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'Herramientas'))
+import sesion_visual as sesion
+from etapas_render import animar_por_etapas
+from trazas import grilla_comun
+from fondo_mapa import FondoEstatico
+from discos_cobertura import COBERTURA, DiscosCobertura
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument('--frames', type=int, default=60,
+                    help='Número de frames a animar (0 = traza completa)')
+parser.add_argument('--formato', choices=['gif', 'mp4', 'webm'], default='gif',
+                    help='Formato de salida de la animación')
+parser.add_argument('--procesos', type=int, default=1,
+                    help='Procesos de render en paralelo (fork)')
+parser.add_argument('--interpolacion', choices=['lineal', 'cercano'], default='lineal',
+                    help='Cómo llevar ambas trazas a la grilla de tiempos común')
+parser.add_argument('--paso', type=float,
+                    help='Paso de la grilla común en s (por defecto el más fino de las trazas)')
+args = parser.parse_args()
 
 # Configuración
 plt.rcParams['font.family'] = 'DejaVu Sans'
@@ -22,21 +43,28 @@ print("=" * 80)
 # Leer datos
 print("\nCargando datos de posiciones...")
 try:
-    df_fixed = pd.read_csv('positions_fixed.csv')
-    df_mobile = pd.read_csv('positions_mobile.csv')
+    df_fixed = sesion.posiciones('positions_fixed.csv')
+    df_mobile = sesion.posiciones('positions_mobile.csv')
     print(f"✓ Datos tradicionales: {len(df_fixed)} registros")
     print(f"✓ Datos móviles: {len(df_mobile)} registros")
 except FileNotFoundError as e:
     print(f"❌ ERROR: No se encontró {e.filename}")
     exit(1)
 
-# Obtener tiempos comunes
-times_fixed = sorted(df_fixed['time'].unique())
-times_mobile = sorted(df_mobile['time'].unique())
+# Grilla de tiempos común: ambas trazas se remuestrean sobre ella, así
+# distintos intervalos de registro o tiempos con decimales no pierden frames.
+# La topología (gateway más cercano por embarcación) se calcula una vez por traza
+grilla = grilla_comun([sesion.trazas('positions_fixed.csv'),
+                       sesion.trazas('positions_mobile.csv')], paso=args.paso)
+topologia_f = sesion.topologia('positions_fixed.csv', alcance=15000, grilla=grilla,
+                               metodo=args.interpolacion)
+topologia_m = sesion.topologia('positions_mobile.csv', alcance=15000, grilla=grilla,
+                               metodo=args.interpolacion)
 
-# Usar los primeros N tiempos comunes (para animación más rápida)
-max_frames = 60  # 60 frames = ~12 segundos a 5 fps
-times = sorted(set(times_fixed) & set(times_mobile))[:max_frames]
+# Usar los primeros N tiempos (60 frames = ~12 segundos a 5 fps, 0 = todos)
+times = list(grilla)
+if args.frames > 0:
+    times = times[:args.frames]
 
 print(f"\n✓ Tiempos para animación: {len(times)} frames")
 print(f"  Rango: {times[0]:.0f}s - {times[-1]:.0f}s")
@@ -45,81 +73,67 @@ print(f"  Rango: {times[0]:.0f}s - {times[-1]:.0f}s")
 print("\nCreando animación comparativa lado a lado...")
 
 fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 8))
+fondo = FondoEstatico(fig, clave=Path(__file__).read_bytes())
+discos_f = DiscosCobertura(ax1, **COBERTURA['tradicional'], alpha=0.08)
+discos_m = DiscosCobertura(ax2, **COBERTURA['movil'], alpha=0.08)
 
 def init():
+    # Fondo fijo de ambos paneles: se rasteriza una vez por figura
     for ax in [ax1, ax2]:
-        ax.clear()
         ax.set_facecolor('#E3F2FD')
         ax.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7)
         ax.set_xlim(0, 25000)
         ax.set_ylim(0, 15000)
+        ax.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=11)
+        ax.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=11)
         ax.grid(True, alpha=0.3, linestyle='--')
+    fondo.fijar(persistentes=[discos_f.coleccion, discos_m.coleccion])
     return []
 
-def animate(frame_idx):
-    for ax in [ax1, ax2]:
-        ax.clear()
-        ax.set_facecolor('#E3F2FD')
-        ax.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7)
+def calcular(frame_idx):
+    """Topología de ambas arquitecturas en el frame (etapa de cálculo)"""
+    return topologia_f.frame(frame_idx), topologia_m.frame(frame_idx)
+
+def animate(frame_idx, redes=None):
+    fondo.limpiar()
     
     current_time = times[frame_idx]
+    red_f, red_m = redes if redes is not None else calcular(frame_idx)
     
     # ===== PANEL IZQUIERDO: TRADICIONAL =====
-    current_fixed = df_fixed[df_fixed['time'] == current_time]
-    
-    boats_f = current_fixed[current_fixed['type'] == 'boat']
-    gateways_f = current_fixed[current_fixed['type'] == 'gateway']
-    server_f = current_fixed[current_fixed['type'] == 'server']
+    boats_f, gateways_f, server_f = red_f.boats, red_f.gateways, red_f.servidor
     
     # Cobertura fija
-    for _, gw in gateways_f.iterrows():
-        coverage = Circle((gw['x'], gw['y']), 15000, 
-                         color='#E74C3C', fill=True, alpha=0.08, 
-                         linewidth=2, edgecolor='#E74C3C', linestyle='--')
-        ax1.add_patch(coverage)
+    discos_f.actualizar(gateways_f)
     
     # Enlaces
-    connected_f = 0
-    for _, boat in boats_f.iterrows():
-        min_dist = float('inf')
-        closest_gw = None
-        for _, gw in gateways_f.iterrows():
-            dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_gw = gw
-        if closest_gw is not None and min_dist <= 15000:
-            ax1.plot([boat['x'], closest_gw['x']], 
-                   [boat['y'], closest_gw['y']], 
-                   color='#95A5A6', linewidth=0.8, alpha=0.4)
-            connected_f += 1
+    for boat, gw in zip(*red_f.enlaces()):
+        ax1.plot([boat[0], gw[0]], 
+               [boat[1], gw[1]], 
+               color='#95A5A6', linewidth=0.8, alpha=0.4)
+    connected_f = red_f.conectadas
     
     # Backhaul
     if len(server_f) > 0:
-        srv = server_f.iloc[0]
-        for _, gw in gateways_f.iterrows():
-            ax1.plot([gw['x'], srv['x']], [gw['y'], srv['y']], 
+        srv = server_f[0]
+        for gw in gateways_f:
+            ax1.plot([gw[0], srv[0]], [gw[1], srv[1]], 
                    color='#F39C12', linewidth=1.5, alpha=0.6, linestyle=':')
     
     # Nodos
-    ax1.scatter(boats_f['x'], boats_f['y'], c='#3498DB', s=100, marker='o', 
+    ax1.scatter(boats_f[:, 0], boats_f[:, 1], c='#3498DB', s=100, marker='o', 
                label=f'Embarcaciones ({len(boats_f)})', alpha=0.8, 
                edgecolors='#2874A6', linewidths=1.5, zorder=5)
-    ax1.scatter(gateways_f['x'], gateways_f['y'], c='#E74C3C', s=400, marker='s', 
+    ax1.scatter(gateways_f[:, 0], gateways_f[:, 1], c='#E74C3C', s=400, marker='s', 
                label=f'GW Fijos ({len(gateways_f)})', alpha=0.9, 
                edgecolors='#C0392B', linewidths=2.5, zorder=6)
     if len(server_f) > 0:
-        ax1.scatter(server_f['x'], server_f['y'], c='#F39C12', s=500, marker='D', 
+        ax1.scatter(server_f[:, 0], server_f[:, 1], c='#F39C12', s=500, marker='D', 
                    label='Network Server', alpha=0.9, 
                    edgecolors='#D68910', linewidths=2.5, zorder=7)
     
-    ax1.set_xlim(0, 25000)
-    ax1.set_ylim(0, 15000)
-    ax1.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=11)
-    ax1.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=11)
     ax1.set_title(f'⚓ ARQUITECTURA TRADICIONAL\nTiempo: {current_time:.0f}s', 
                  fontweight='bold', fontsize=12, color='#E74C3C')
-    ax1.grid(True, alpha=0.3, linestyle='--')
     ax1.legend(loc='upper right', fontsize=9, framealpha=0.9)
     
     # Stats tradicional
@@ -132,61 +146,39 @@ def animate(frame_idx):
             color='#E74C3C')
     
     # ===== PANEL DERECHO: MÓVIL + P2P =====
-    current_mobile = df_mobile[df_mobile['time'] == current_time]
-    
-    boats_m = current_mobile[current_mobile['type'] == 'boat']
-    gateways_m = current_mobile[current_mobile['type'] == 'gateway']
-    server_m = current_mobile[current_mobile['type'] == 'server']
+    boats_m, gateways_m, server_m = red_m.boats, red_m.gateways, red_m.servidor
     
     # Cobertura móvil
-    for _, gw in gateways_m.iterrows():
-        coverage = Circle((gw['x'], gw['y']), 15000, 
-                         color='#27AE60', fill=True, alpha=0.08, 
-                         linewidth=2, edgecolor='#27AE60', linestyle='--')
-        ax2.add_patch(coverage)
+    discos_m.actualizar(gateways_m)
     
     # Enlaces
-    connected_m = 0
-    for _, boat in boats_m.iterrows():
-        min_dist = float('inf')
-        closest_gw = None
-        for _, gw in gateways_m.iterrows():
-            dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_gw = gw
-        if closest_gw is not None and min_dist <= 15000:
-            ax2.plot([boat['x'], closest_gw['x']], 
-                   [boat['y'], closest_gw['y']], 
-                   color='#52BE80', linewidth=0.8, alpha=0.5)
-            connected_m += 1
+    for boat, gw in zip(*red_m.enlaces()):
+        ax2.plot([boat[0], gw[0]], 
+               [boat[1], gw[1]], 
+               color='#52BE80', linewidth=0.8, alpha=0.5)
+    connected_m = red_m.conectadas
     
     # Backhaul
     if len(server_m) > 0:
-        srv = server_m.iloc[0]
-        for _, gw in gateways_m.iterrows():
-            ax2.plot([gw['x'], srv['x']], [gw['y'], srv['y']], 
+        srv = server_m[0]
+        for gw in gateways_m:
+            ax2.plot([gw[0], srv[0]], [gw[1], srv[1]], 
                    color='#F39C12', linewidth=1.5, alpha=0.6, linestyle=':')
     
     # Nodos
-    ax2.scatter(boats_m['x'], boats_m['y'], c='#3498DB', s=100, marker='o', 
+    ax2.scatter(boats_m[:, 0], boats_m[:, 1], c='#3498DB', s=100, marker='o', 
                label=f'Embarcaciones ({len(boats_m)})', alpha=0.8, 
                edgecolors='#2874A6', linewidths=1.5, zorder=5)
-    ax2.scatter(gateways_m['x'], gateways_m['y'], c='#27AE60', s=400, marker='^', 
+    ax2.scatter(gateways_m[:, 0], gateways_m[:, 1], c='#27AE60', s=400, marker='^', 
                label=f'GW Móviles ({len(gateways_m)})', alpha=0.9, 
                edgecolors='#1E8449', linewidths=2.5, zorder=6)
     if len(server_m) > 0:
-        ax2.scatter(server_m['x'], server_m['y'], c='#F39C12', s=500, marker='D', 
+        ax2.scatter(server_m[:, 0], server_m[:, 1], c='#F39C12', s=500, marker='D', 
                    label='Network Server', alpha=0.9, 
                    edgecolors='#D68910', linewidths=2.5, zorder=7)
     
-    ax2.set_xlim(0, 25000)
-    ax2.set_ylim(0, 15000)
-    ax2.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=11)
-    ax2.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=11)
     ax2.set_title(f'🚢 ARQUITECTURA PROPUESTA\nTiempo: {current_time:.0f}s', 
                  fontweight='bold', fontsize=12, color='#27AE60')
-    ax2.grid(True, alpha=0.3, linestyle='--')
     ax2.legend(loc='upper right', fontsize=9, framealpha=0.9)
     
     # Stats móvil
@@ -202,15 +194,12 @@ def animate(frame_idx):
 
 # Crear animación
 print("Generando animación (esto puede tardar varios minutos)...")
-anim = animation.FuncAnimation(fig, animate, init_func=init,
-                              frames=len(times), interval=200, 
-                              blit=True, repeat=True)
-
-# Guardar como GIF
-output_gif = 'Animacion_Comparacion_Arquitecturas.gif'
-print(f"Guardando animación como GIF ({len(times)} frames a 5 fps)...")
-anim.save(output_gif, writer='pillow', fps=5, dpi=100)
-print(f"✓ Animación guardada: {output_gif}")
+output_anim = f'Animacion_Comparacion_Arquitecturas.{args.formato}'
+print(f"Guardando animación como {args.formato.upper()} ({len(times)} frames a 5 fps)...")
+init()
+animar_por_etapas(fig, animate, len(times), output_anim, fps=5, dpi=100, calcular=calcular,
+                  procesos=args.procesos, capturar=fondo.capturar)
+print(f"✓ Animación guardada: {output_anim}")
 
 plt.close()
 
@@ -220,136 +209,107 @@ print("\nGenerando capturas de momentos clave...")
 key_frames = [0, len(times)//4, len(times)//2, 3*len(times)//4, -1]
 frame_names = ['inicio', 'cuarto', 'mitad', 'tres_cuartos', 'final']
 
+# Una sola figura para todas las capturas: el fondo a 300 dpi se dibuja una vez
+fig_static, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 8))
+fondo_static = FondoEstatico(fig_static, clave=Path(__file__).read_bytes())
+discos_f = DiscosCobertura(ax1, **COBERTURA['tradicional'], alpha=0.08)
+discos_m = DiscosCobertura(ax2, **COBERTURA['movil'], alpha=0.08)
+for ax, color_fondo in [(ax1, '#E3F2FD'), (ax2, '#E8F5E9')]:
+    ax.set_facecolor(color_fondo)
+    ax.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7)
+    ax.set_xlim(0, 25000)
+    ax.set_ylim(0, 15000)
+    ax.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=11)
+    ax.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=11)
+    ax.grid(True, alpha=0.3, linestyle='--')
+
+# Título general
+fig_static.suptitle(f'Comparación de Arquitecturas LoRaWAN - cantón Salinas\n',
+                   fontsize=14, fontweight='bold', y=0.98)
+fondo_static.fijar(persistentes=[discos_f.coleccion, discos_m.coleccion])
+
 for idx, (frame_idx, name) in enumerate(zip(key_frames, frame_names)):
-    fig_static, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 8))
+    fondo_static.limpiar()
     
     current_time = times[frame_idx]
     
     # Panel izquierdo - Tradicional
-    ax1.set_facecolor('#E3F2FD')
-    ax1.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7)
+    red_f = topologia_f.frame(topologia_f.indice(current_time))
+    boats_f, gateways_f, server_f = red_f.boats, red_f.gateways, red_f.servidor
     
-    current_fixed = df_fixed[df_fixed['time'] == current_time]
-    boats_f = current_fixed[current_fixed['type'] == 'boat']
-    gateways_f = current_fixed[current_fixed['type'] == 'gateway']
-    server_f = current_fixed[current_fixed['type'] == 'server']
+    discos_f.actualizar(gateways_f)
     
-    for _, gw in gateways_f.iterrows():
-        coverage = Circle((gw['x'], gw['y']), 15000, 
-                         color='#E74C3C', fill=True, alpha=0.08, 
-                         linewidth=2, edgecolor='#E74C3C', linestyle='--')
-        ax1.add_patch(coverage)
-    
-    connected_f = 0
-    for _, boat in boats_f.iterrows():
-        min_dist = float('inf')
-        closest_gw = None
-        for _, gw in gateways_f.iterrows():
-            dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_gw = gw
-        if closest_gw is not None and min_dist <= 15000:
-            ax1.plot([boat['x'], closest_gw['x']], 
-                   [boat['y'], closest_gw['y']], 
-                   color='#95A5A6', linewidth=0.8, alpha=0.4)
-            connected_f += 1
+    for boat, gw in zip(*red_f.enlaces()):
+        ax1.plot([boat[0], gw[0]], 
+               [boat[1], gw[1]], 
+               color='#95A5A6', linewidth=0.8, alpha=0.4)
+    connected_f = red_f.conectadas
     
     if len(server_f) > 0:
-        srv = server_f.iloc[0]
-        for _, gw in gateways_f.iterrows():
-            ax1.plot([gw['x'], srv['x']], [gw['y'], srv['y']], 
+        srv = server_f[0]
+        for gw in gateways_f:
+            ax1.plot([gw[0], srv[0]], [gw[1], srv[1]], 
                    color='#F39C12', linewidth=1.5, alpha=0.6, linestyle=':')
     
-    ax1.scatter(boats_f['x'], boats_f['y'], c='#3498DB', s=100, marker='o', 
+    ax1.scatter(boats_f[:, 0], boats_f[:, 1], c='#3498DB', s=100, marker='o', 
                label=f'Embarcaciones ({len(boats_f)})', alpha=0.8, 
                edgecolors='#2874A6', linewidths=1.5, zorder=5)
-    ax1.scatter(gateways_f['x'], gateways_f['y'], c='#E74C3C', s=400, marker='s', 
+    ax1.scatter(gateways_f[:, 0], gateways_f[:, 1], c='#E74C3C', s=400, marker='s', 
                label=f'GW Fijos ({len(gateways_f)})', alpha=0.9, 
                edgecolors='#C0392B', linewidths=2.5, zorder=6)
     if len(server_f) > 0:
-        ax1.scatter(server_f['x'], server_f['y'], c='#F39C12', s=500, marker='D', 
+        ax1.scatter(server_f[:, 0], server_f[:, 1], c='#F39C12', s=500, marker='D', 
                    label='Network Server', alpha=0.9, zorder=7)
     
-    ax1.set_xlim(0, 25000)
-    ax1.set_ylim(0, 15000)
-    ax1.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=11)
-    ax1.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=11)
     ax1.set_title(f'⚓ ARQUITECTURA TRADICIONAL\nTiempo: {current_time:.0f}s', 
                  fontweight='bold', fontsize=12, color='#E74C3C')
-    ax1.grid(True, alpha=0.3, linestyle='--')
     ax1.legend(loc='upper right', fontsize=9, framealpha=0.9)
     
     # Panel derecho - Móvil
-    ax2.set_facecolor('#E8F5E9')
-    ax2.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.7)
-    
-    current_mobile = df_mobile[df_mobile['time'] == current_time]
-    boats_m = current_mobile[current_mobile['type'] == 'boat']
-    gateways_m = current_mobile[current_mobile['type'] == 'gateway']
-    server_m = current_mobile[current_mobile['type'] == 'server']
+    red_m = topologia_m.frame(topologia_m.indice(current_time))
+    boats_m, gateways_m, server_m = red_m.boats, red_m.gateways, red_m.servidor
     
-    for _, gw in gateways_m.iterrows():
-        coverage = Circle((gw['x'], gw['y']), 15000, 
-                         color='#27AE60', fill=True, alpha=0.08, 
-                         linewidth=2, edgecolor='#27AE60', linestyle='--')
-        ax2.add_patch(coverage)
+    discos_m.actualizar(gateways_m)
     
-    connected_m = 0
-    for _, boat in boats_m.iterrows():
-        min_dist = float('inf')
-        closest_gw = None
-        for _, gw in gateways_m.iterrows():
-            dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_gw = gw
-        if closest_gw is not None and min_dist <= 15000:
-            ax2.plot([boat['x'], closest_gw['x']], 
-                   [boat['y'], closest_gw['y']], 
-                   color='#52BE80', linewidth=0.8, alpha=0.5)
-            connected_m += 1
+    for boat, gw in zip(*red_m.enlaces()):
+        ax2.plot([boat[0], gw[0]], 
+               [boat[1], gw[1]], 
+               color='#52BE80', linewidth=0.8, alpha=0.5)
+    connected_m = red_m.conectadas
     
     if len(server_m) > 0:
-        srv = server_m.iloc[0]
-        for _, gw in gateways_m.iterrows():
-            ax2.plot([gw['x'], srv['x']], [gw['y'], srv['y']], 
+        srv = server_m[0]
+        for gw in gateways_m:
+            ax2.plot([gw[0], srv[0]], [gw[1], srv[1]], 
                    color='#F39C12', linewidth=1.5, alpha=0.6, linestyle=':')
     
-    ax2.scatter(boats_m['x'], boats_m['y'], c='#3498DB', s=100, marker='o', 
+    ax2.scatter(boats_m[:, 0], boats_m[:, 1], c='#3498DB', s=100, marker='o', 
                label=f'Embarcaciones ({len(boats_m)})', alpha=0.8, 
                edgecolors='#2874A6', linewidths=1.5, zorder=5)
-    ax2.scatter(gateways_m['x'], gateways_m['y'], c='#27AE60', s=400, marker='^', 
+    ax2.scatter(gateways_m[:, 0], gateways_m[:, 1], c='#27AE60', s=400, marker='^', 
                label=f'GW Móviles ({len(gateways_m)})', alpha=0.9, 
                edgecolors='#1E8449', linewidths=2.5, zorder=6)
     if len(server_m) > 0:
-        ax2.scatter(server_m['x'], server_m['y'], c='#F39C12', s=500, marker='D', 
+        ax2.scatter(server_m[:, 0], server_m[:, 1], c='#F39C12', s=500, marker='D', 
                    label='Network Server', alpha=0.9, zorder=7)
     
-    ax2.set_xlim(0, 25000)
-    ax2.set_ylim(0, 15000)
-    ax2.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=11)
-    ax2.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=11)
     ax2.set_title(f'🚢 ARQUITECTURA PROPUESTA\nTiempo: {current_time:.0f}s', 
                  fontweight='bold', fontsize=12, color='#27AE60')
-    ax2.grid(True, alpha=0.3, linestyle='--')
     ax2.legend(loc='upper right', fontsize=9, framealpha=0.9)
     
-    # Título general
-    fig_static.suptitle(f'Comparación de Arquitecturas LoRaWAN - cantón Salinas\n',
-                       fontsize=14, fontweight='bold', y=0.98)
-    
-    plt.tight_layout(rect=[0, 0.02, 1, 0.96])
+    if idx == 0:
+        plt.tight_layout(rect=[0, 0.02, 1, 0.96])
     
     output_img = f'Captura_{idx+1}_{name}.png'
-    plt.savefig(output_img, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    fondo_static.guardar(output_img, dpi=300)
     print(f"✓ Captura {idx+1} guardada: {output_img}")
 
+plt.close(fig_static)
+
 print("\n" + "=" * 80)
 print("ARCHIVOS GENERADOS:")
 print("=" * 80)
-print(f"  1. {output_gif} (animación completa)")
+print(f"  1. {output_anim} (animación completa)")
 print("  2. Captura_1_inicio.png")
 print("  3. Captura_2_cuarto.png")
 print("  4. Captura_3_mitad.png")
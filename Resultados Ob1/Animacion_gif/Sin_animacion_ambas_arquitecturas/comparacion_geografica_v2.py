@@ -4,12 +4,25 @@
 Universidad Estatal Península de Santa Elena (UPSE)
 Comparación Visual Geográfica de Arquitecturas LoRaWAN
 Arquitectura Tradicional (Fijos) vs Arquitectura Propuesta (Móviles + P2P)
+Capturas en varios instantes a la vez: Herramientas/capturas.py
 """
 
-import pandas as pd
+import argparse
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 from matplotlib.patches import Circle
-import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'Herramientas'))
+import sesion_visual as sesion
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument('--tiempo', type=float, default=300.0,
+                    help='Instante a comparar en s')
+parser.add_argument('--interpolacion', choices=['lineal', 'cercano'], default='lineal',
+                    help='Cómo llevar ambas trazas al instante pedido')
+args = parser.parse_args()
 
 # Configuración
 plt.rcParams['font.family'] = 'DejaVu Sans'
@@ -22,8 +35,8 @@ print("=" * 80)
 # Leer datos
 print("\nCargando datos de posiciones...")
 try:
-    df_fixed = pd.read_csv('positions_fixed.csv')
-    df_mobile = pd.read_csv('positions_mobile.csv')
+    df_fixed = sesion.posiciones('positions_fixed.csv')
+    df_mobile = sesion.posiciones('positions_mobile.csv')
     print(f"✓ Datos tradicionales: {len(df_fixed)} registros")
     print(f"✓ Datos móviles: {len(df_mobile)} registros")
 except FileNotFoundError as e:
@@ -33,46 +46,31 @@ except FileNotFoundError as e:
 
 # Ver tiempos disponibles
 print(f"\n📊 Tiempos disponibles:")
-print(f"  - Tradicional: {sorted(df_fixed['time'].unique())[:10]}...")
-print(f"  - Móvil: {sorted(df_mobile['time'].unique())[:10]}...")
-
-# Buscar tiempo cercano a 300s (o el más cercano disponible)
-target_time = 300.0
-available_times_fixed = df_fixed['time'].unique()
-available_times_mobile = df_mobile['time'].unique()
-
-# Encontrar tiempo más cercano
-closest_time_fixed = min(available_times_fixed, key=lambda x: abs(x - target_time))
-closest_time_mobile = min(available_times_mobile, key=lambda x: abs(x - target_time))
+trazas_fixed = sesion.trazas('positions_fixed.csv')
+trazas_mobile = sesion.trazas('positions_mobile.csv')
+print(f"  - Tradicional: {list(trazas_fixed.tiempos[:10])}...")
+print(f"  - Móvil: {list(trazas_mobile.tiempos[:10])}...")
+
+# Ambas trazas se llevan al mismo instante (el más cercano registrado a lo
+# pedido): interpolación por nodo, sin depender de que los tiempos coincidan
+target_time = args.tiempo
+time_to_use = trazas_mobile.tiempos[trazas_mobile.indices_cercanos(target_time)]
+red_f = sesion.topologia('positions_fixed.csv', alcance=15000, grilla=[time_to_use],
+                         metodo=args.interpolacion).frame(0)
+red_m = sesion.topologia('positions_mobile.csv', alcance=15000, grilla=[time_to_use],
+                         metodo=args.interpolacion).frame(0)
 
 print(f"\n✓ Tiempo objetivo: {target_time}s")
-print(f"✓ Tiempo real tradicional: {closest_time_fixed}s")
-print(f"✓ Tiempo real móvil: {closest_time_mobile}s")
-
-# Usar el tiempo más cercano para ambos
-time_to_use = max(closest_time_fixed, closest_time_mobile)
-print(f"✓ Usando tiempo: {time_to_use}s")
-
-# Filtrar datos
-fixed_data = df_fixed[df_fixed['time'] == time_to_use]
-mobile_data = df_mobile[df_mobile['time'] == time_to_use]
-
-# Si aún está vacío, usar el primer tiempo disponible
-if len(fixed_data) == 0:
-    time_to_use = sorted(df_fixed['time'].unique())[10] if len(df_fixed['time'].unique()) > 10 else df_fixed['time'].unique()[0]
-    fixed_data = df_fixed[df_fixed['time'] == time_to_use]
-    print(f"⚠️  Ajustando a tiempo tradicional: {time_to_use}s")
+print(f"✓ Usando tiempo: {time_to_use}s ({args.interpolacion})")
 
-if len(mobile_data) == 0:
-    time_to_use = sorted(df_mobile['time'].unique())[10] if len(df_mobile['time'].unique()) > 10 else df_mobile['time'].unique()[0]
-    mobile_data = df_mobile[df_mobile['time'] == time_to_use]
-    print(f"⚠️  Ajustando a tiempo móvil: {time_to_use}s")
+nodos_fixed = len(red_f.boats) + len(red_f.gateways) + len(red_f.servidor)
+nodos_mobile = len(red_m.boats) + len(red_m.gateways) + len(red_m.servidor)
 
 print(f"\n✓ Nodos encontrados:")
-print(f"  - Tradicionales: {len(fixed_data)}")
-print(f"  - Móviles: {len(mobile_data)}")
+print(f"  - Tradicionales: {nodos_fixed}")
+print(f"  - Móviles: {nodos_mobile}")
 
-if len(fixed_data) == 0 or len(mobile_data) == 0:
+if nodos_fixed == 0 or nodos_mobile == 0:
     print("\n❌ ERROR: No hay datos suficientes en los CSV")
     print("Verifica que los archivos positions_fixed.csv y positions_mobile.csv tengan datos")
     exit(1)
@@ -86,53 +84,42 @@ ax1.set_facecolor('#E3F2FD')  # Azul claro para el mar
 ax1.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.8)
 
 # Separar nodos por tipo
-boats_f = fixed_data[fixed_data['type'] == 'boat']
-gateways_f = fixed_data[fixed_data['type'] == 'gateway']
-server_f = fixed_data[fixed_data['type'] == 'server']
+boats_f, gateways_f, server_f = red_f.boats, red_f.gateways, red_f.servidor
 
 print(f"  - Embarcaciones: {len(boats_f)}")
 print(f"  - Gateways: {len(gateways_f)}")
 print(f"  - Servidor: {len(server_f)}")
 
 # Cobertura estática de gateways fijos
-for idx, gw in gateways_f.iterrows():
-    coverage = Circle((gw['x'], gw['y']), 15000,  # 15 km alcance LoRa
+for gw in gateways_f:
+    coverage = Circle((gw[0], gw[1]), 15000,  # 15 km alcance LoRa
                      color='#E74C3C', fill=True, 
                      alpha=0.10, linewidth=2, edgecolor='#E74C3C', linestyle='--')
     ax1.add_patch(coverage)
 
 # Enlaces entre embarcaciones y gateways
-connected_boats = 0
-for _, boat in boats_f.iterrows():
-    min_dist = float('inf')
-    closest_gw = None
-    for _, gw in gateways_f.iterrows():
-        dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-        if dist < min_dist:
-            min_dist = dist
-            closest_gw = gw
-    if closest_gw is not None and min_dist <= 15000:  # Dentro de rango LoRa
-        ax1.plot([boat['x'], closest_gw['x']], 
-               [boat['y'], closest_gw['y']], 
-               color='#95A5A6', linewidth=0.8, alpha=0.4)
-        connected_boats += 1
+for boat, gw in zip(*red_f.enlaces()):  # Gateway más cercano dentro de rango LoRa
+    ax1.plot([boat[0], gw[0]], 
+           [boat[1], gw[1]], 
+           color='#95A5A6', linewidth=0.8, alpha=0.4)
+connected_boats = red_f.conectadas
 
 # Enlaces gateway-servidor
 if len(server_f) > 0:
-    srv = server_f.iloc[0]
-    for idx, gw in gateways_f.iterrows():
-        ax1.plot([gw['x'], srv['x']], [gw['y'], srv['y']], 
+    srv = server_f[0]
+    for gw in gateways_f:
+        ax1.plot([gw[0], srv[0]], [gw[1], srv[1]], 
                color='#F39C12', linewidth=2, alpha=0.7, linestyle=':')
 
 # Dibujar nodos
-ax1.scatter(boats_f['x'], boats_f['y'], c='#3498DB', s=120, marker='o', 
+ax1.scatter(boats_f[:, 0], boats_f[:, 1], c='#3498DB', s=120, marker='o', 
            label=f'Embarcaciones ({len(boats_f)})', alpha=0.8, 
            edgecolors='#2874A6', linewidths=2, zorder=5)
-ax1.scatter(gateways_f['x'], gateways_f['y'], c='#E74C3C', s=500, marker='s', 
+ax1.scatter(gateways_f[:, 0], gateways_f[:, 1], c='#E74C3C', s=500, marker='s', 
            label=f'GW Fijos Costeros ({len(gateways_f)})', alpha=0.9, 
            edgecolors='#C0392B', linewidths=3, zorder=6)
 if len(server_f) > 0:
-    ax1.scatter(server_f['x'], server_f['y'], c='#F39C12', s=600, marker='D', 
+    ax1.scatter(server_f[:, 0], server_f[:, 1], c='#F39C12', s=600, marker='D', 
                label='Network Server', alpha=0.95, 
                edgecolors='#D68910', linewidths=3, zorder=7)
 
@@ -163,57 +150,42 @@ ax2.set_facecolor('#E8F5E9')  # Verde claro para el mar
 ax2.fill_between([0, 25000], -1000, 0, color='#D7CCC8', alpha=0.8)
 
 # Separar nodos por tipo
-boats_m = mobile_data[mobile_data['type'] == 'boat']
-gateways_m = mobile_data[mobile_data['type'] == 'gateway']
-server_m = mobile_data[mobile_data['type'] == 'server']
+boats_m, gateways_m, server_m = red_m.boats, red_m.gateways, red_m.servidor
 
 print(f"  - Embarcaciones: {len(boats_m)}")
 print(f"  - Gateways: {len(gateways_m)}")
 print(f"  - Servidor: {len(server_m)}")
 
 # Cobertura dinámica de gateways móviles
-for idx, gw in gateways_m.iterrows():
-    coverage = Circle((gw['x'], gw['y']), 15000,  # 15 km alcance LoRa
+for gw in gateways_m:
+    coverage = Circle((gw[0], gw[1]), 15000,  # 15 km alcance LoRa
                      color='#27AE60', fill=True, 
                      alpha=0.10, linewidth=2, edgecolor='#27AE60', linestyle='--')
     ax2.add_patch(coverage)
 
 # Enlaces entre embarcaciones y gateways
-connected_boats_m = 0
-p2p_links = 0
-
-for _, boat in boats_m.iterrows():
-    min_dist = float('inf')
-    closest_gw = None
-    for _, gw in gateways_m.iterrows():
-        dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-        if dist < min_dist:
-            min_dist = dist
-            closest_gw = gw
-    
-    # Enlace directo si está en rango
-    if closest_gw is not None and min_dist <= 15000:
-        ax2.plot([boat['x'], closest_gw['x']], 
-               [boat['y'], closest_gw['y']], 
-               color='#52BE80', linewidth=0.8, alpha=0.5)
-        connected_boats_m += 1
+for boat, gw in zip(*red_m.enlaces()):  # Enlace directo si está en rango
+    ax2.plot([boat[0], gw[0]], 
+           [boat[1], gw[1]], 
+           color='#52BE80', linewidth=0.8, alpha=0.5)
+connected_boats_m = red_m.conectadas
 
 # Enlaces gateway-servidor
 if len(server_m) > 0:
-    srv = server_m.iloc[0]
-    for idx, gw in gateways_m.iterrows():
-        ax2.plot([gw['x'], srv['x']], [gw['y'], srv['y']], 
+    srv = server_m[0]
+    for gw in gateways_m:
+        ax2.plot([gw[0], srv[0]], [gw[1], srv[1]], 
                color='#F39C12', linewidth=2, alpha=0.7, linestyle=':')
 
 # Dibujar nodos
-ax2.scatter(boats_m['x'], boats_m['y'], c='#3498DB', s=120, marker='o', 
+ax2.scatter(boats_m[:, 0], boats_m[:, 1], c='#3498DB', s=120, marker='o', 
            label=f'Embarcaciones ({len(boats_m)})', alpha=0.8, 
            edgecolors='#2874A6', linewidths=2, zorder=5)
-ax2.scatter(gateways_m['x'], gateways_m['y'], c='#27AE60', s=500, marker='^', 
+ax2.scatter(gateways_m[:, 0], gateways_m[:, 1], c='#27AE60', s=500, marker='^', 
            label=f'GW Móviles ({len(gateways_m)})', alpha=0.9, 
            edgecolors='#1E8449', linewidths=3, zorder=6)
 if len(server_m) > 0:
-    ax2.scatter(server_m['x'], server_m['y'], c='#F39C12', s=600, marker='D', 
+    ax2.scatter(server_m[:, 0], server_m[:, 1], c='#F39C12', s=600, marker='D', 
                label='Network Server', alpha=0.95, 
                edgecolors='#D68910', linewidths=3, zorder=7)
 
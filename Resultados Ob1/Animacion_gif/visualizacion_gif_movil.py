@@ -3,11 +3,27 @@
 """
 """
 
-import pandas as pd
+import argparse
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Circle
-import numpy as np
+
+# Módulos compartidos (Herramientas/ en la raíz del repositorio)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'Herramientas'))
+import sesion_visual as sesion
+from etapas_render import animar_por_etapas
+from fondo_mapa import FondoEstatico
+from discos_cobertura import DiscosCobertura
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--frames', type=int, default=0,
+                    help='Número de frames a animar (0 = traza completa)')
+parser.add_argument('--formato', choices=['gif', 'mp4', 'webm'], default='gif',
+                    help='Formato de salida de la animación')
+parser.add_argument('--procesos', type=int, default=1,
+                    help='Procesos de render en paralelo (fork)')
+args = parser.parse_args()
 
 # Configuración de estilo
 plt.rcParams['font.family'] = 'serif'
@@ -15,196 +31,167 @@ plt.rcParams['font.size'] = 10
 
 # Leer datos
 print("Cargando datos de posiciones...")
-df_pos = pd.read_csv('positions_mobile.csv')
+# Gateway más cercano de cada embarcación en todos los frames (enlace < 5 km)
+topologia = sesion.topologia('positions_mobile.csv', alcance=5000, estricto=True)
 
 # Obtener tiempos únicos
-times = sorted(df_pos['time'].unique())
+times = list(topologia.tiempos)
+if args.frames > 0:
+    times = times[:args.frames]
 print(f"✓ Datos cargados: {len(times)} frames de tiempo")
 
 # Configurar figura
 fig, ax = plt.subplots(figsize=(14, 9))
+fondo = FondoEstatico(fig, clave=Path(__file__).read_bytes())
+discos = DiscosCobertura(ax, alcance=5000, color='red', alpha=0.3, relleno=False, linewidth=1.5)
 
 def init():
-    ax.clear()
-    # Fondo océano
+    # Fondo océano (fijo: se rasteriza una vez y cada frame dibuja solo lo dinámico)
     ax.set_facecolor('#87CEEB')
     
     # Costa
-    ax.fill_between([0, 25000], -1000, 0, color='#D2B48C', alpha=0.7, label='Costa')
+    ax.fill_between([0, 25000], -1000, 0, color='#D2B48C', alpha=0.7)
     
     # Configuración de ejes
     ax.set_xlim(0, 25000)
     ax.set_ylim(0, 15000)
-    ax.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=12)
-    ax.set_ylabel('Distancia Norte (m)', fontsize=12, fontweight='bold')
+    ax.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=11)
+    ax.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=11)
     ax.set_title('Red LoRaWAN Marítima - Cantón Salinas\nGateways Móviles', 
                 fontweight='bold', fontsize=14, pad=15)
     ax.grid(True, alpha=0.3, linestyle='--')
     
+    # Información adicional
+    info_text = f'Área: 375 km² | Cobertura dinámica | SF: 7-12'
+    banner = ax.text(0.02, 0.02, info_text, transform=ax.transAxes,
+                     fontsize=9, verticalalignment='bottom',
+                     bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+    fondo.fijar(persistentes=[banner, discos.coleccion])
     return []
 
-def animate(frame_idx):
-    ax.clear()
-    
-    # Fondo
-    ax.set_facecolor('#87CEEB')
-    ax.fill_between([0, 25000], -1000, 0, color='#D2B48C', alpha=0.7)
+def calcular(frame_idx):
+    """Nodos del frame con su gateway más cercano (etapa de cálculo)"""
+    return topologia.frame(frame_idx)
+
+def animate(frame_idx, red=None):
+    fondo.limpiar()
     
     current_time = times[frame_idx]
     
-    # Filtrar datos del tiempo actual
-    current_data = df_pos[df_pos['time'] == current_time]
-    
-    # Separar por tipo
-    boats = current_data[current_data['type'] == 'boat']
-    gateways = current_data[current_data['type'] == 'gateway']
-    server = current_data[current_data['type'] == 'server']
+    # Nodos del tiempo actual con su gateway más cercano
+    if red is None:
+        red = calcular(frame_idx)
+    boats, gateways, server = red.boats, red.gateways, red.servidor
     
-    # Dibujar círculos de cobertura de gateways (5 km de radio)
-    for _, gw in gateways.iterrows():
-        coverage = Circle((gw['x'], gw['y']), 5000, 
-                         color='red', fill=False, 
-                         linestyle='--', alpha=0.3, linewidth=1.5)
-        ax.add_patch(coverage)
+    # Círculos de cobertura de gateways (5 km de radio)
+    discos.actualizar(gateways)
     
     # Dibujar enlaces de comunicación (líneas de embarcaciones a gateways más cercanos)
-    for _, boat in boats.iterrows():
-        # Encontrar gateway más cercano
-        min_dist = float('inf')
-        closest_gw = None
-        
-        for _, gw in gateways.iterrows():
-            dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_gw = gw
-        
-        if closest_gw is not None and min_dist < 5000:  # Dentro del rango
-            ax.plot([boat['x'], closest_gw['x']], 
-                   [boat['y'], closest_gw['y']], 
-                   color='white', linewidth=0.8, alpha=0.4)
+    for boat, gw in zip(*red.enlaces()):
+        ax.plot([boat[0], gw[0]], 
+               [boat[1], gw[1]], 
+               color='white', linewidth=0.8, alpha=0.4)
     
     # Dibujar enlaces de gateways a servidor
     if len(server) > 0:
-        srv = server.iloc[0]
-        for _, gw in gateways.iterrows():
-            ax.plot([gw['x'], srv['x']], 
-                   [gw['y'], srv['y']], 
+        srv = server[0]
+        for gw in gateways:
+            ax.plot([gw[0], srv[0]], 
+                   [gw[1], srv[1]], 
                    color='yellow', linewidth=1.2, alpha=0.5, linestyle=':')
     
     # Dibujar nodos
-    ax.scatter(boats['x'], boats['y'], 
+    ax.scatter(boats[:, 0], boats[:, 1], 
               c='#3498db', s=80, marker='o', 
               label=f'Embarcaciones ({len(boats)})', 
               alpha=0.8, edgecolors='darkblue', linewidths=1.5, zorder=5)
     
-    ax.scatter(gateways['x'], gateways['y'], 
+    ax.scatter(gateways[:, 0], gateways[:, 1], 
               c='#e74c3c', s=250, marker='^', 
               label=f'Gateways Móviles ({len(gateways)})', 
               alpha=0.9, edgecolors='darkred', linewidths=2, zorder=6)
     
     if len(server) > 0:
-        ax.scatter(server['x'], server['y'], 
+        ax.scatter(server[:, 0], server[:, 1], 
                   c='#2ecc71', s=400, marker='s', 
                   label='Servidor de Red', 
                   alpha=0.9, edgecolors='darkgreen', linewidths=2, zorder=7)
     
     # Configuración
-    ax.set_xlim(0, 25000)
-    ax.set_ylim(0, 15000)
-    ax.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=11)
-    ax.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=11)
     ax.set_title(f'Red LoRaWAN Marítima - Gateways Móviles\nTiempo: {current_time:.1f}s', 
                 fontweight='bold', fontsize=13, pad=15)
-    ax.grid(True, alpha=0.3, linestyle='--')
     ax.legend(loc='upper right', fontsize=10, framealpha=0.9)
     
-    # Información adicional
-    info_text = f'Área: 375 km² | Cobertura dinámica | SF: 7-12'
-    ax.text(0.02, 0.02, info_text, transform=ax.transAxes,
-           fontsize=9, verticalalignment='bottom',
-           bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-    
     return []
 
 print("Creando animación...")
-anim = animation.FuncAnimation(fig, animate, init_func=init,
-                              frames=len(times), interval=200, 
-                              blit=True, repeat=True)
-
-print("Guardando animación como GIF...")
-anim.save('lorawan_mobile_network.gif', writer='pillow', fps=5, dpi=100)
-print("✓ Animación guardada: lorawan_mobile_network.gif")
+output_anim = f'lorawan_mobile_network.{args.formato}'
+print(f"Guardando animación como {args.formato.upper()}...")
+init()
+animar_por_etapas(fig, animate, len(times), output_anim, fps=5, dpi=100, calcular=calcular,
+                  procesos=args.procesos, capturar=fondo.capturar)
+print(f"✓ Animación guardada: {output_anim}")
 
 print("Guardando frames clave como imágenes estáticas...")
 # Guardar algunos frames importantes
 key_frames = [0, len(times)//4, len(times)//2, 3*len(times)//4]
+fig_static, ax_static = plt.subplots(figsize=(14, 9))
+fondo_static = FondoEstatico(fig_static, clave=Path(__file__).read_bytes())
+discos_static = DiscosCobertura(ax_static, alcance=5000, color='red', alpha=0.3, relleno=False,
+                                linewidth=1.5)
+ax_static.set_facecolor('#87CEEB')
+ax_static.fill_between([0, 25000], -1000, 0, color='#D2B48C', alpha=0.7)
+ax_static.set_xlim(0, 25000)
+ax_static.set_ylim(0, 15000)
+ax_static.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=11)
+ax_static.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=11)
+ax_static.grid(True, alpha=0.3, linestyle='--')
+fondo_static.fijar(persistentes=[discos_static.coleccion])
+
 for i, frame_idx in enumerate(key_frames):
-    fig_static, ax_static = plt.subplots(figsize=(14, 9))
+    fondo_static.limpiar()
     
     current_time = times[frame_idx]
-    current_data = df_pos[df_pos['time'] == current_time]
-    
-    ax_static.set_facecolor('#87CEEB')
-    ax_static.fill_between([0, 25000], -1000, 0, color='#D2B48C', alpha=0.7)
-    
-    boats = current_data[current_data['type'] == 'boat']
-    gateways = current_data[current_data['type'] == 'gateway']
-    server = current_data[current_data['type'] == 'server']
+    red = topologia.frame(frame_idx)
+    boats, gateways, server = red.boats, red.gateways, red.servidor
     
     # Círculos de cobertura
-    for _, gw in gateways.iterrows():
-        coverage = Circle((gw['x'], gw['y']), 5000, 
-                         color='red', fill=False, 
-                         linestyle='--', alpha=0.3, linewidth=1.5)
-        ax_static.add_patch(coverage)
+    discos_static.actualizar(gateways)
     
     # Enlaces
-    for _, boat in boats.iterrows():
-        min_dist = float('inf')
-        closest_gw = None
-        for _, gw in gateways.iterrows():
-            dist = np.sqrt((boat['x'] - gw['x'])**2 + (boat['y'] - gw['y'])**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_gw = gw
-        if closest_gw is not None and min_dist < 5000:
-            ax_static.plot([boat['x'], closest_gw['x']], 
-                          [boat['y'], closest_gw['y']], 
-                          color='white', linewidth=0.8, alpha=0.4)
+    for boat, gw in zip(*red.enlaces()):
+        ax_static.plot([boat[0], gw[0]], 
+                      [boat[1], gw[1]], 
+                      color='white', linewidth=0.8, alpha=0.4)
     
     if len(server) > 0:
-        srv = server.iloc[0]
-        for _, gw in gateways.iterrows():
-            ax_static.plot([gw['x'], srv['x']], 
-                          [gw['y'], srv['y']], 
+        srv = server[0]
+        for gw in gateways:
+            ax_static.plot([gw[0], srv[0]], 
+                          [gw[1], srv[1]], 
                           color='yellow', linewidth=1.2, alpha=0.5, linestyle=':')
     
     # Nodos
-    ax_static.scatter(boats['x'], boats['y'], c='#3498db', s=80, marker='o', 
+    ax_static.scatter(boats[:, 0], boats[:, 1], c='#3498db', s=80, marker='o', 
                      label=f'Embarcaciones ({len(boats)})', alpha=0.8, 
                      edgecolors='darkblue', linewidths=1.5, zorder=5)
-    ax_static.scatter(gateways['x'], gateways['y'], c='#e74c3c', s=250, marker='^', 
+    ax_static.scatter(gateways[:, 0], gateways[:, 1], c='#e74c3c', s=250, marker='^', 
                      label=f'Gateways Móviles ({len(gateways)})', alpha=0.9, 
                      edgecolors='darkred', linewidths=2, zorder=6)
     if len(server) > 0:
-        ax_static.scatter(server['x'], server['y'], c='#2ecc71', s=400, marker='s', 
+        ax_static.scatter(server[:, 0], server[:, 1], c='#2ecc71', s=400, marker='s', 
                          label='Servidor de Red', alpha=0.9, 
                          edgecolors='darkgreen', linewidths=2, zorder=7)
     
-    ax_static.set_xlim(0, 25000)
-    ax_static.set_ylim(0, 15000)
-    ax_static.set_xlabel('Distancia Este (m)', fontweight='bold', fontsize=11)
-    ax_static.set_ylabel('Distancia Norte (m)', fontweight='bold', fontsize=11)
     ax_static.set_title(f'Red LoRaWAN Marítima - Gateways Móviles\nTiempo: {current_time:.1f}s', 
                        fontweight='bold', fontsize=13, pad=15)
-    ax_static.grid(True, alpha=0.3, linestyle='--')
     ax_static.legend(loc='upper right', fontsize=10, framealpha=0.9)
     
-    plt.savefig(f'network_snapshot_{i+1}.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fondo_static.guardar(f'network_snapshot_{i+1}.png', dpi=300)
     print(f"✓ Frame {i+1} guardado: network_snapshot_{i+1}.png")
 
+plt.close(fig_static)
+
 print("\n✓ ¡Visualizaciones completadas!")
-print("  - lorawan_mobile_network.gif (animación)")
+print(f"  - {output_anim} (animación)")
 print("  - network_snapshot_1.png hasta network_snapshot_4.png (capturas)")
@@ -4,21 +4,32 @@ Generador de Gráficas - Objetivo 1
 Comparación de Arquitecturas LoRaWAN
 """
 
+import argparse
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'Herramientas'))
+from trabajos_graficas import TrabajoGrafica, ejecutar_trabajos
+
 # Configuración de estilo profesional
-plt.style.use('seaborn-v0_8-darkgrid')
+ESTILO = {
+    'base': 'seaborn-v0_8-darkgrid',
+    'font.family': 'DejaVu Sans',
+    'font.size': 11,
+    'axes.labelsize': 12,
+    'axes.titlesize': 14,
+    'xtick.labelsize': 10,
+    'ytick.labelsize': 10,
+    'legend.fontsize': 10,
+    'figure.titlesize': 16,
+}
+plt.style.use(ESTILO['base'])
 sns.set_palette("husl")
-plt.rcParams['font.family'] = 'DejaVu Sans'
-plt.rcParams['font.size'] = 11
-plt.rcParams['axes.labelsize'] = 12
-plt.rcParams['axes.titlesize'] = 14
-plt.rcParams['xtick.labelsize'] = 10
-plt.rcParams['ytick.labelsize'] = 10
-plt.rcParams['legend.fontsize'] = 10
-plt.rcParams['figure.titlesize'] = 16
+plt.rcParams.update({k: v for k, v in ESTILO.items() if k != 'base'})
 
 # Colores profesionales
 COLORS = {
@@ -316,19 +327,44 @@ def crear_grafica_comparativa_general():
     print("✅ Gráfica guardada: grafica_radar_objetivo1.png")
     plt.close()
 
+def datos_figura(*campos):
+    """Subconjunto de `datos` que usa una gráfica (para su huella)"""
+    return {arq: {c: valores[c] for c in campos + ('color',)} for arq, valores in datos.items()}
+
 def main():
+    parser = argparse.ArgumentParser(description="Gráficas del Objetivo 1")
+    parser.add_argument('--procesos', type=int, help='Procesos en paralelo (por defecto: CPUs)')
+    parser.add_argument('--forzar', action='store_true', help='Regenerar aunque no haya cambios')
+    args = parser.parse_args()
+
     print("\n╔════════════════════════════════════════════════════════╗")
     print("║    GENERADOR DE GRÁFICAS - OBJETIVO 1                ║")
     print("╚════════════════════════════════════════════════════════╝\n")
     
     print("📊 Generando gráficas profesionales...\n")
     
-    crear_grafica_pdr()
-    crear_grafica_cobertura()
-    crear_grafica_distancia()
-    crear_grafica_embarcaciones_cubiertas()
-    crear_grafica_p2p_relay()
-    crear_grafica_comparativa_general()
+    # Cada gráfica es independiente: solo se regenera si cambian sus datos o su código
+    trabajos = [
+        TrabajoGrafica('pdr', crear_grafica_pdr, ['grafica_pdr_objetivo1.png'],
+                       datos=datos_figura('pdr'), estilo=ESTILO),
+        TrabajoGrafica('cobertura', crear_grafica_cobertura, ['grafica_cobertura_objetivo1.png'],
+                       datos=datos_figura('cobertura'), estilo=ESTILO),
+        TrabajoGrafica('distancia', crear_grafica_distancia, ['grafica_distancia_objetivo1.png'],
+                       datos=datos_figura('distancia'), estilo=ESTILO),
+        TrabajoGrafica('embarcaciones', crear_grafica_embarcaciones_cubiertas,
+                       ['grafica_embarcaciones_objetivo1.png'],
+                       datos=datos_figura('embarcaciones_cubiertas'), estilo=ESTILO),
+        TrabajoGrafica('relay_p2p', crear_grafica_p2p_relay, ['grafica_relay_p2p_objetivo1.png'],
+                       datos=datos_figura('p2p_exitosos', 'p2p_total'), estilo=ESTILO),
+        TrabajoGrafica('radar', crear_grafica_comparativa_general, ['grafica_radar_objetivo1.png'],
+                       datos=datos_figura('pdr', 'cobertura', 'embarcaciones_cubiertas'),
+                       estilo=ESTILO),
+    ]
+    try:
+        ejecutar_trabajos(trabajos, procesos=args.procesos, forzar=args.forzar)
+    except RuntimeError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
     
     print("\n" + "="*60)
     print("✅ GRÁFICAS GENERADAS EXITOSAMENTE")